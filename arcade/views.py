@@ -2,7 +2,6 @@ from django.shortcuts import render, redirect
 from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView, DetailView
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
 from django.urls import reverse_lazy, reverse
 from django.contrib import messages
 from django.http import JsonResponse
@@ -13,7 +12,8 @@ from core.mixins import BreadcrumbMixin
 
 from projects.game_models import GameTask
 from projects.task_models import ArcadeTask
-from django.contrib.auth.models import User
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
+from core.dashboard_stats import assignable_users, get_task_stats, task_stats_context
 
 
 class ArcadeDashboardView(LoginRequiredMixin, TemplateView):
@@ -122,6 +122,13 @@ class ArcadeTasksView(BreadcrumbMixin, LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['active_department'] = 'arcade'
         
+        # Task statistics for the status cards (percentages rounded to nearest 10 for CSS classes)
+        stats = get_task_stats(ArcadeTask)
+        context['task_stats'] = task_stats_context(stats, percent_step=10)
+        
+        # Get active users for assignment filter
+        context['users'] = assignable_users()
+        
         # Add today's date for due date comparisons
         context['today'] = date.today()
         
@@ -240,39 +247,21 @@ class ArcadeTaskBatchUpdateView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
-            task_ids = data.get('task_ids', [])
-            
-            if not task_ids:
-                return JsonResponse({'status': 'error', 'message': 'No tasks selected'}, status=400)
-            
-            # Fields to update
-            fields_to_update = {}
-            if data.get('status'):
-                fields_to_update['status'] = data['status']
-            if data.get('priority'):
-                fields_to_update['priority'] = data['priority']
-            if data.get('location'):
-                fields_to_update['location'] = data['location']
-            if data.get('assigned_to'):
-                fields_to_update['assigned_to_id'] = data['assigned_to']
-            if data.get('due_date'):
-                fields_to_update['due_date'] = data['due_date']
-            
-            if not fields_to_update:
-                return JsonResponse({'status': 'error', 'message': 'No fields selected for update'}, status=400)
-            
-            # Update tasks
-            updated_count = ArcadeTask.objects.filter(id__in=task_ids).update(**fields_to_update)
-            
-            return JsonResponse({
-                'status': 'success',
-                'message': f'Successfully updated {updated_count} tasks',
-                'updated_count': updated_count
-            })
         except json.JSONDecodeError:
             return JsonResponse({'status': 'error', 'message': 'Invalid JSON data'}, status=400)
-        except Exception as e:
-            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+        
+        try:
+            result = bulk_edit_from_request(
+                request, ArcadeTask, data.get('task_ids', []), data, extra_fields=('location',)
+            )
+        except BulkEditError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Successfully updated {result.updated_count} tasks',
+            'updated_count': result.updated_count
+        })
 
 
 class ArcadeTaskCreateView(BreadcrumbMixin, LoginRequiredMixin, CreateView):
@@ -298,6 +287,6 @@ class ArcadeTaskCreateView(BreadcrumbMixin, LoginRequiredMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['active_department'] = 'arcade'
-        context['users'] = User.objects.all()
+        context['users'] = assignable_users()
         context['is_create'] = True
         return context
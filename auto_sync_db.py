@@ -3,50 +3,103 @@
 Auto-sync database to GitHub when changes are detected
 Usage: python auto_sync_db.py
 
-This script watches the database file and automatically pushes changes to GitHub
+This script watches the database and automatically pushes changesets of
+the changed rows to GitHub. Writes are noticed with SQLite's
+PRAGMA data_version (falling back to the size and mtime of the database
+and its WAL file), so checking costs one tiny query and the file is never
+read. A burst of writes is synced once, after it has been quiet for
+DEBOUNCE seconds. Changesets left uncommitted or unpushed by a failed or
+interrupted sync are retried every RETRY_INTERVAL seconds.
 Press Ctrl+C to stop
 """
-import time
 import os
-import hashlib
+import sqlite3
 import subprocess
+import sys
+import time
 from datetime import datetime
 
 DB_FILE = 'db.sqlite3'
-CHECK_INTERVAL = 5  # Check every 5 seconds
+POLL_INTERVAL = 0.5  # Seconds between change checks
+DEBOUNCE = 2  # Sync once writes have stopped for this long...
+MAX_DELAY = 30  # ...or this long after the first write of a burst
+RETRY_INTERVAL = 60  # Seconds between retries of a sync that did not go through
+CHANGESET_DIR = os.path.join('sync', 'changesets')
 
-def get_file_hash(filepath):
-    """Get MD5 hash of file to detect changes"""
-    if not os.path.exists(filepath):
-        return None
-    
-    hash_md5 = hashlib.md5()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+
+class ChangeDetector:
+    """Tells whether the database was written since the last check"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        try:
+            # Read-only, and never inside a transaction, so writers are not blocked
+            self.connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, timeout=1, isolation_level=None)
+            self.connection.execute('PRAGMA data_version').fetchone()
+        except sqlite3.Error:
+            self.close()
+        self.last_version = self.version()
+
+    def version(self):
+        # data_version changes whenever another connection commits
+        if self.connection is not None:
+            try:
+                return self.connection.execute('PRAGMA data_version').fetchone()[0]
+            except sqlite3.Error:
+                pass
+        stats = []
+        for path in (self.path, f'{self.path}-wal'):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stats.append(None)
+        return tuple(stats)
+
+    def changed(self):
+        version = self.version()
+        changed = version != self.last_version
+        self.last_version = version
+        return changed
+
+    def has_pending_changes(self):
+        """Whether the change log has rows not exported yet; True when it cannot tell"""
+        if self.connection is None:
+            return True
+        try:
+            return bool(self.connection.execute(
+                'SELECT EXISTS(SELECT 1 FROM core_changelogentry WHERE exported = 0)'
+            ).fetchone()[0])
+        except sqlite3.Error:
+            return True
+
+    def has_unpushed_changesets(self):
+        """Whether changeset files are uncommitted or committed but not pushed"""
+        files = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=all', '--', CHANGESET_DIR],
+                               capture_output=True, text=True)
+        if files.returncode == 0 and files.stdout.strip():
+            return True
+        unpushed = subprocess.run(['git', 'rev-list', '--count', '@{u}..HEAD'], capture_output=True, text=True)
+        return unpushed.returncode == 0 and unpushed.stdout.strip() not in ('', '0')
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
 
 def sync_to_github():
-    """Sync database to GitHub"""
+    """Sync database changes to GitHub as a changeset (see core/change_log.py)"""
     try:
-        # Add the database file
-        subprocess.run(['git', 'add', 'db.sqlite3'], check=True, capture_output=True)
-        
-        # Create commit with timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         commit_message = f"🔄 Auto-sync database: {timestamp}"
         
-        result = subprocess.run(['git', 'commit', '-m', commit_message], 
-                              capture_output=True, text=True)
+        result = subprocess.run([sys.executable, 'manage.py', 'sync_changes', 'push', '-m', commit_message],
+                              check=True, capture_output=True, text=True)
         
-        if result.returncode == 0:
-            # Push to remote
-            subprocess.run(['git', 'push'], check=True, capture_output=True)
+        if 'No changes' not in result.stdout:
             print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Database synced to GitHub")
-            return True
-        else:
-            # No changes to commit
-            return False
+        return True
             
     except subprocess.CalledProcessError as e:
         print(f"❌ Error syncing: {e}")
@@ -55,24 +108,38 @@ def sync_to_github():
 def auto_sync():
     """Watch database and auto-sync on changes"""
     print(f"👀 Watching {DB_FILE} for changes...")
-    print(f"🔄 Will sync to GitHub every {CHECK_INTERVAL} seconds if changes detected")
+    print(f"🔄 Will sync to GitHub {DEBOUNCE} seconds after changes stop")
     print("⏸️  Press Ctrl+C to stop\n")
     
-    last_hash = get_file_hash(DB_FILE)
+    detector = ChangeDetector(DB_FILE)
+    first_change = last_change = None
+    # Pick up a sync interrupted before this script started
+    retry_at = time.monotonic() if detector.has_unpushed_changesets() else None
     
     try:
         while True:
-            time.sleep(CHECK_INTERVAL)
+            time.sleep(POLL_INTERVAL)
+            now = time.monotonic()
             
-            current_hash = get_file_hash(DB_FILE)
+            if detector.changed():
+                if first_change is None:
+                    print(f"📝 [{datetime.now().strftime('%H:%M:%S')}] Database changes detected...")
+                    first_change = now
+                last_change = now
             
-            if current_hash and current_hash != last_hash:
-                print(f"📝 [{datetime.now().strftime('%H:%M:%S')}] Database changes detected...")
-                if sync_to_github():
-                    last_hash = current_hash
+            burst_over = first_change is not None and (now - last_change >= DEBOUNCE or now - first_change >= MAX_DELAY)
+            if burst_over or (retry_at is not None and now >= retry_at):
+                first_change = last_change = None
+                retry_at = None
+                # Sessions and other unsynced tables also write; only push real changes
+                if detector.has_pending_changes() or detector.has_unpushed_changesets():
+                    if not sync_to_github():
+                        retry_at = now + RETRY_INTERVAL
             
     except KeyboardInterrupt:
         print("\n\n⏹️  Auto-sync stopped")
+    finally:
+        detector.close()
 
 if __name__ == "__main__":
     auto_sync()
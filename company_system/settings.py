@@ -3,6 +3,7 @@ Django settings for company_system project.
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -53,8 +54,6 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    # Custom middleware to clear cache on every request
-    'core.middleware.ClearCacheMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -98,13 +97,72 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests instead of reconnecting each time
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 # Production database configuration
 if os.environ.get('DATABASE_URL'):
     import dj_database_url
-    DATABASES['default'] = dj_database_url.config(conn_max_age=600)
+    DATABASES['default'] = dj_database_url.config(conn_max_age=600, conn_health_checks=True)
+
+# SQLite (see core.sqlite_tuning): write transactions take the write lock
+# with BEGIN IMMEDIATE, and new connections get the PRAGMAs of SQLITE_PROFILE
+# ('production': WAL, synchronous=NORMAL, mmap, a 64 MiB cache, 5s busy
+# timeout; 'default': SQLite's own) plus any SQLITE_PRAGMAS overrides.
+# Writes still locked out are retried SQLITE_WRITE_RETRIES times, backing
+# off from SQLITE_RETRY_DELAY seconds.
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).setdefault('transaction_mode', 'IMMEDIATE')
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+SQLITE_PRAGMAS = {}
+SQLITE_WRITE_RETRIES = int(os.environ.get('SQLITE_WRITE_RETRIES', '5'))
+SQLITE_RETRY_DELAY = float(os.environ.get('SQLITE_RETRY_DELAY', '0.05'))
+
+# Cache
+# Shared between gunicorn workers so tag invalidations (core.cache_tags)
+# made by one worker are seen by all of them
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    }
+}
+# Tests get their own in-memory cache, so clearing it between tests leaves
+# the project cache directory (and a running server's entries) alone
+if 'test' in sys.argv[1:2]:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tests',
+        }
+    }
+
+# Knowledge Base view counts are buffered in memory and written in batches
+# (see education.knowledge.view_counts)
+VIEW_COUNT_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNT_FLUSH_INTERVAL', '30'))
+VIEW_COUNT_MAX_PENDING = int(os.environ.get('VIEW_COUNT_MAX_PENDING', '500'))
+
+# Background jobs (see core.job_queue). Production runs `manage.py run_workers`;
+# with JOBS_RUN_INLINE jobs run in the web process once their request commits
+JOBS_RUN_INLINE = os.environ.get('JOBS_RUN_INLINE', str(DEBUG)) == 'True'
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_RETRY_DELAY = int(os.environ.get('JOB_RETRY_DELAY', '30'))
+JOB_STALE_AFTER = int(os.environ.get('JOB_STALE_AFTER', '600'))
+# Seconds a job waits before checking again for a lock held by another job
+JOB_LOCK_WAIT = int(os.environ.get('JOB_LOCK_WAIT', '1'))
+
+# Database sync (see core.change_log): changed rows are exported as changeset
+# files to SYNC_CHANGESET_DIR, named after this machine's SYNC_NODE_ID
+SYNC_NODE_ID = os.environ.get('SYNC_NODE_ID', '')
+SYNC_CHANGESET_DIR = BASE_DIR / 'sync' / 'changesets'
+# The sync status check fetches from the remote in a background job once
+# the last fetch is older than this many seconds
+SYNC_FETCH_INTERVAL = int(os.environ.get('SYNC_FETCH_INTERVAL', '300'))
+# Primary keys per bucket in the table checksums of `manage.py db_digest` (core.db_digest)
+DB_DIGEST_BUCKET_SIZE = 1000
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
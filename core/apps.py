@@ -1,6 +1,27 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from .sqlite_tuning import connect_sqlite_tuning
+        from .signals import (
+            connect_task_signals, connect_milestone_signals, connect_cache_tag_signals,
+            connect_search_signals, connect_related_article_signals, connect_epic_stats_signals,
+            connect_course_pdf_signals, connect_change_log_signals,
+        )
+        connect_task_signals()
+        connect_milestone_signals()
+        connect_cache_tag_signals()
+        connect_search_signals()
+        connect_related_article_signals()
+        connect_epic_stats_signals()
+        connect_course_pdf_signals()
+        connect_change_log_signals()
+        connect_sqlite_tuning()
+
+        # Register the background job handlers in each app's jobs.py
+        autodiscover_modules('jobs')
@@ -0,0 +1,172 @@
+"""
+Bulk editing of tasks for the department batch-update views.
+
+The requested changes are validated once against the model's fields,
+related objects (such as the assignee) are resolved with one query per
+field, and the tasks are written with a single QuerySet.update(). Updates
+skip model signals, so the task index, epic roll-ups, linked GDD features,
+the milestone banner and the sync change log are refreshed here, and one
+TaskBulkEdit row records the whole edit.
+"""
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+from .change_log import record_changes
+from .milestone_snapshot import bump_snapshot_version
+from .models import TaskBulkEdit
+from .model_utils import get_section_for_model
+from .sqlite_tuning import retry_on_locked
+from .task_index import reindex_tasks
+
+# Fields every department can bulk edit; views add their own extras
+BULK_EDIT_FIELDS = ('status', 'priority', 'assigned_to', 'due_date')
+
+# Values that clear a nullable field ('unassigned' assignee, 'no_date' due date)
+CLEAR_VALUES = frozenset({'unassigned', 'no_date', 'no_team', 'none'})
+
+BulkEditResult = namedtuple('BulkEditResult', ['updated_count', 'changes', 'record'])
+
+
+class BulkEditError(ValueError):
+    """The requested bulk edit is invalid; the message is safe to show to users"""
+
+
+def clean_bulk_changes(model, changes, allowed_fields=BULK_EDIT_FIELDS):
+    """
+    Validate requested field changes for a task model.
+
+    Empty values are ignored, CLEAR_VALUES set nullable fields to None and
+    foreign keys are given by id. Returns a dict of attname -> value ready
+    for QuerySet.update().
+    """
+    cleaned = {}
+    related_ids = {}
+    for name, value in changes.items():
+        if value in (None, ''):
+            continue
+        if name not in allowed_fields:
+            raise BulkEditError(f'Field cannot be bulk edited: {name}')
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise BulkEditError(f'Unknown field: {name}')
+
+        if isinstance(value, str) and value in CLEAR_VALUES:
+            if not field.null:
+                raise BulkEditError(f'{field.verbose_name.capitalize()} cannot be cleared')
+            cleaned[field.attname] = None
+        elif isinstance(field, models.ForeignKey):
+            try:
+                related_ids[field] = field.target_field.to_python(value)
+            except ValidationError:
+                raise BulkEditError(f'Invalid {field.verbose_name}: {value}')
+        else:
+            try:
+                cleaned[field.attname] = field.clean(value, None)
+            except ValidationError as e:
+                raise BulkEditError(f'Invalid {field.verbose_name}: {"; ".join(e.messages)}')
+
+    # One query per related field, e.g. a single lookup for the assignee
+    for field, pk in related_ids.items():
+        if not field.related_model._default_manager.filter(pk=pk).exists():
+            raise BulkEditError(f'{field.related_model._meta.verbose_name.capitalize()} not found: {pk}')
+        cleaned[field.attname] = pk
+
+    if not cleaned:
+        raise BulkEditError('No fields to update')
+    return cleaned
+
+
+@retry_on_locked
+def bulk_edit_tasks(model, task_ids, changes, allowed_fields=BULK_EDIT_FIELDS, queryset=None,
+                    user=None, user_name=''):
+    """
+    Apply the same changes to many tasks of one model in one transaction.
+
+    Args:
+        model: The task model
+        task_ids: Ids of the tasks to edit
+        changes: Requested field changes (see clean_bulk_changes)
+        allowed_fields: Fields this view lets users edit
+        queryset: Optional queryset restricting which tasks may be edited
+        user, user_name: Who made the edit, for the audit record
+
+    Returns:
+        BulkEditResult with the number of tasks updated, the applied changes
+        and the TaskBulkEdit record
+
+    Raises:
+        BulkEditError if the ids or changes are invalid
+    """
+    try:
+        task_ids = sorted({int(task_id) for task_id in task_ids})
+    except (TypeError, ValueError):
+        raise BulkEditError('Invalid task ids')
+    if not task_ids:
+        raise BulkEditError('No tasks selected')
+    cleaned = clean_bulk_changes(model, changes, allowed_fields)
+
+    from projects.epic_stats import get_epic_task_models, refresh_epic_stats
+    from projects.game_models import GameTask, GDDFeature
+
+    queryset = (queryset if queryset is not None else model.objects.all()).filter(pk__in=task_ids)
+    tracks_epics = model in get_epic_task_models()
+
+    with transaction.atomic():
+        if tracks_epics:
+            rows = list(queryset.values_list('pk', 'epic_id'))
+            task_ids = [pk for pk, _ in rows]
+            epic_ids = {epic_id for _, epic_id in rows}
+        else:
+            task_ids = list(queryset.values_list('pk', flat=True))
+            epic_ids = set()
+
+        updated_count = 0
+        if task_ids:
+            values = dict(cleaned)
+            if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+                values['updated_at'] = timezone.now()
+            updated_count = model.objects.filter(pk__in=task_ids).update(**values)
+
+            if model is GameTask and 'status' in cleaned:
+                GDDFeature.objects.filter(task_id__in=task_ids).update(status=cleaned['status'])
+                record_changes(GDDFeature.objects.filter(task_id__in=task_ids))
+            record_changes(model.objects.filter(pk__in=task_ids))
+            reindex_tasks(model, task_ids)
+            if 'epic_id' in cleaned:
+                epic_ids.add(cleaned['epic_id'])
+            if epic_ids - {None}:
+                refresh_epic_stats(epic_ids)
+            if model is GameTask:
+                bump_snapshot_version()
+
+        record = TaskBulkEdit.objects.create(
+            section=get_section_for_model(model) or model._meta.label_lower,
+            task_ids=task_ids,
+            changes=cleaned,
+            updated_count=updated_count,
+            edited_by=user if user is not None and user.is_authenticated else None,
+            edited_by_name=user_name or '',
+        )
+
+    return BulkEditResult(updated_count, cleaned, record)
+
+
+def bulk_edit_from_request(request, model, task_ids, changes, extra_fields=(), queryset=None):
+    """
+    bulk_edit_tasks for a batch-update view: edits the common fields plus
+    the department's extra_fields, as the request's user. Other keys in
+    changes are ignored.
+    """
+    allowed_fields = BULK_EDIT_FIELDS + tuple(extra_fields)
+    return bulk_edit_tasks(
+        model, task_ids,
+        {name: value for name, value in changes.items() if name in allowed_fields},
+        allowed_fields=allowed_fields,
+        queryset=queryset,
+        user=request.user,
+        user_name=request.session.get('current_user_name', ''),
+    )
@@ -0,0 +1,97 @@
+"""
+Tag-based cache invalidation.
+
+Cache entries are stored together with the versions of the tags they
+depend on (e.g. 'tasks:arcade', 'milestones', 'kb:article:12'). Bumping
+a tag's version makes every entry carrying that tag stale, without
+touching the rest of the cache. Tag versions live in the same cache
+backend, so all gunicorn workers see the same invalidations as long as
+that backend is shared (see CACHES in company_system.settings).
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+TAG_VERSION_KEY = 'cachetag:{tag}'
+TAGGED_ENTRY_KEY = 'tagged:{key}'
+
+DEFAULT_TIMEOUT = 300
+
+
+def _new_version():
+    # Seed from the clock so a cleared cache never reuses an old version
+    return int(time.time() * 1000)
+
+
+def tag_version(tag):
+    """Return the current version of a tag, initialising it if needed"""
+    return get_tag_versions([tag])[tag]
+
+
+def get_tag_versions(tags):
+    """Return a dict of tag -> current version for the given tags"""
+    keys = {TAG_VERSION_KEY.format(tag=tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, tag in keys.items():
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _new_version(), None)
+            version = cache.get(key)
+        versions[tag] = version
+    return versions
+
+
+def _bump_tags(tags):
+    for tag in tags:
+        key = TAG_VERSION_KEY.format(tag=tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+
+
+def invalidate_tags(*tags):
+    """
+    Make every cache entry carrying any of the given tags stale.
+    Inside a transaction the tags are bumped again on commit, so another
+    worker cannot re-cache data read before the transaction committed.
+    """
+    _bump_tags(tags)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_tags(tags))
+
+
+def get(key, default=None):
+    """Return the cached value for key, or default if missing or stale"""
+    entry = cache.get(TAGGED_ENTRY_KEY.format(key=key))
+    if entry is None:
+        return default
+    tag_versions, value = entry
+    if get_tag_versions(tag_versions) != tag_versions:
+        return default
+    return value
+
+
+def set(key, value, tags, timeout=DEFAULT_TIMEOUT):
+    """Store value under key, tagged with the current versions of tags"""
+    cache.set(TAGGED_ENTRY_KEY.format(key=key), (get_tag_versions(tags), value), timeout)
+
+
+def get_or_set(key, default, tags, timeout=DEFAULT_TIMEOUT):
+    """
+    Return the cached value for key, computing and storing it on a miss.
+    default is a callable that builds the value.
+    """
+    sentinel = object()
+    value = get(key, sentinel)
+    if value is sentinel:
+        value = default()
+        set(key, value, tags, timeout)
+    return value
+
+
+def task_tags(section):
+    """Tags carried by anything derived from a section's tasks"""
+    return ['tasks', f'tasks:{section}']
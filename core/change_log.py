@@ -0,0 +1,372 @@
+"""
+Row-level change capture for syncing the database between machines.
+
+Instead of committing the whole db.sqlite3 file, every insert, update and
+delete of a synced model is recorded as a ChangeLogEntry holding the row's
+serialized fields (signal handlers in core.signals; bulk writes call
+record_changes). export_changeset writes the entries not yet shared to a
+gzip-compressed NDJSON file, one change per line:
+
+    {"id": "...", "origin": "laptop", "model": "projects.gametask", "pk": "12",
+     "action": "save", "changed_at": "2026-10-18T09:30:00Z", "fields": {...}}
+
+apply_changeset replays another machine's file. Every change keeps its id,
+so applying a file twice does nothing, and conflicting edits of the same
+row are settled last-writer-wins on changed_at (the row's updated_at), the
+origin name breaking ties, so every machine ends up with the same row.
+
+Saves are replayed raw, like loaddata, so auto_now fields keep the remote
+values; post_save is then sent as for an ordinary save so task indexes,
+epic roll-ups, search entries and caches update.
+
+Rows are matched by primary key, so rows inserted on two machines between
+syncs with the same id are treated as edits of one row.
+
+A changeset that cannot be committed is taken back with discard_export.
+"""
+import datetime
+import gzip
+import json
+import os
+import socket
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ChangeLogEntry, SyncedChangeset
+
+CHANGESET_SUFFIX = '.ndjson.gz'
+
+# Bookkeeping, sessions and tables derived from other rows (rebuilt by signals)
+DEFAULT_EXCLUDED_MODELS = {
+    'admin.logentry', 'auth.permission', 'contenttypes.contenttype', 'sessions.session',
+    'socialaccount.socialtoken',
+    'core.changelogentry', 'core.syncedchangeset', 'core.job', 'core.taskindex',
+    'projects.epicstats', 'education.relatedarticle',
+}
+
+ApplyResult = namedtuple('ApplyResult', ['entries', 'applied', 'skipped'])
+
+# Values per IN (...) lookup; SQLite limits the parameters of one query
+QUERY_BATCH_SIZE = 500
+
+
+class ChangeEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder without rounding times to milliseconds, which would lose last-writer-wins ties"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+_local = threading.local()
+
+
+def node_id():
+    """This machine's name in changesets"""
+    return getattr(settings, 'SYNC_NODE_ID', None) or socket.gethostname()
+
+
+def changeset_dir():
+    return str(getattr(settings, 'SYNC_CHANGESET_DIR', os.path.join(settings.BASE_DIR, 'sync', 'changesets')))
+
+
+def synced_models():
+    """Models whose changes are captured and replayed"""
+    excluded = DEFAULT_EXCLUDED_MODELS | set(getattr(settings, 'SYNC_EXCLUDE_MODELS', ()))
+    return [
+        model for model in apps.get_models()
+        if model._meta.label_lower not in excluded
+        and not model._meta.proxy and model._meta.managed
+    ]
+
+
+@contextmanager
+def applying_changes():
+    """Don't capture the writes made while replaying remote changes"""
+    previous = getattr(_local, 'applying', False)
+    _local.applying = True
+    try:
+        yield
+    finally:
+        _local.applying = previous
+
+
+def is_applying():
+    return getattr(_local, 'applying', False)
+
+
+def _changed_at(instance):
+    updated_at = getattr(instance, 'updated_at', None)
+    return updated_at if hasattr(updated_at, 'tzinfo') else timezone.now()
+
+
+def _row_data(instance):
+    fields = serializers.serialize('python', [instance])[0]['fields']
+    return json.loads(json.dumps(fields, cls=ChangeEncoder))
+
+
+def _entry(instance, action):
+    data = _row_data(instance) if action == ChangeLogEntry.ACTION_SAVE else None
+    return ChangeLogEntry(
+        origin=node_id(),
+        model=instance._meta.label_lower,
+        object_pk=str(instance.pk),
+        action=action,
+        changed_at=_changed_at(instance) if action == ChangeLogEntry.ACTION_SAVE else timezone.now(),
+        data=data,
+    )
+
+
+def record_instance_change(instance, action=ChangeLogEntry.ACTION_SAVE):
+    """Record a save or delete of one row"""
+    if is_applying():
+        return None
+    entry = _entry(instance, action)
+    entry.save()
+    return entry
+
+
+def record_changes(rows):
+    """
+    Record the current state of rows, a queryset or saved model instances,
+    with one insert. Use this after QuerySet.update(), bulk_create() or
+    bulk_update(), which skip signals.
+    """
+    if is_applying():
+        return 0
+    entries = [_entry(instance, ChangeLogEntry.ACTION_SAVE) for instance in rows]
+    ChangeLogEntry.objects.bulk_create(entries)
+    return len(entries)
+
+
+def pending_changes():
+    """Local changes that have not been exported yet"""
+    return ChangeLogEntry.objects.filter(origin=node_id(), exported=False)
+
+
+def change_record(entry):
+    """A ChangeLogEntry as the dict written to changesets and read by apply_changes"""
+    return {
+        'id': entry.change_id,
+        'origin': entry.origin,
+        'model': entry.model,
+        'pk': entry.object_pk,
+        'action': entry.action,
+        'changed_at': entry.changed_at,
+        'fields': entry.data,
+    }
+
+
+def row_change_records(rows, change_id):
+    """
+    Change records for the current state of rows, as if just saved here.
+    change_id(instance) gives each record's id.
+    """
+    records = []
+    for instance in rows:
+        entry = _entry(instance, ChangeLogEntry.ACTION_SAVE)
+        entry.change_id = change_id(instance)
+        records.append(json.loads(json.dumps(change_record(entry), cls=ChangeEncoder)))
+    return records
+
+
+def _entry_line(entry):
+    return json.dumps(change_record(entry), cls=ChangeEncoder, separators=(',', ':'))
+
+
+def export_changeset(directory=None):
+    """
+    Write the local changes not exported yet to a new changeset file in
+    directory (SYNC_CHANGESET_DIR by default) and mark them exported.
+    Several changes of one row are written as its latest change only.
+    Returns the file's path, or None if there was nothing to export.
+    """
+    directory = directory or changeset_dir()
+    with transaction.atomic():
+        entries = list(pending_changes().select_for_update().order_by('pk'))
+        if not entries:
+            return None
+
+        latest = {}
+        for entry in entries:
+            latest.pop((entry.model, entry.object_pk), None)
+            latest[(entry.model, entry.object_pk)] = entry
+
+        os.makedirs(directory, exist_ok=True)
+        name = f"{timezone.now():%Y%m%dT%H%M%S}-{node_id()}-{entries[-1].pk}{CHANGESET_SUFFIX}"
+        path = os.path.join(directory, name)
+        with gzip.open(path, 'wt', encoding='utf-8') as changeset:
+            for entry in latest.values():
+                changeset.write(_entry_line(entry) + '\n')
+
+        pending_changes().filter(pk__lte=entries[-1].pk).update(exported=True)
+        SyncedChangeset.objects.create(
+            name=name, direction=SyncedChangeset.DIRECTION_EXPORTED,
+            entries=len(latest), applied=len(latest),
+        )
+    return path
+
+
+def _batches(values):
+    for start in range(0, len(values), QUERY_BATCH_SIZE):
+        yield values[start:start + QUERY_BATCH_SIZE]
+
+
+def discard_export(path):
+    """
+    Undo export_changeset for a file that could not be committed: delete
+    it and make its changes pending again, so the next export includes them.
+    """
+    ids = [change['id'] for change in read_changeset(path)]
+    with transaction.atomic():
+        for batch in _batches(ids):
+            ChangeLogEntry.objects.filter(origin=node_id(), change_id__in=batch).update(exported=False)
+        SyncedChangeset.objects.filter(
+            name=os.path.basename(path), direction=SyncedChangeset.DIRECTION_EXPORTED
+        ).delete()
+        os.remove(path)
+
+
+def read_changeset(path):
+    """The changes in a changeset file, in order"""
+    with gzip.open(path, 'rt', encoding='utf-8') as changeset:
+        for line in changeset:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _local_clock(model, pk):
+    """(changed_at, origin) of the newest change this machine knows for a row"""
+    latest = ChangeLogEntry.objects.filter(
+        model=model._meta.label_lower, object_pk=pk
+    ).order_by('-changed_at', '-origin').values_list('changed_at', 'origin').first()
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        updated_at = model._default_manager.filter(pk=pk).values_list('updated_at', flat=True).first()
+        if updated_at is not None and (latest is None or updated_at > latest[0]):
+            latest = (updated_at, node_id())
+    return latest
+
+
+def _apply_save(model, change):
+    existing = model._default_manager.filter(pk=change['pk']).first()
+    if existing is not None and _row_data(existing) == change['fields']:
+        # Already identical here
+        return False
+    try:
+        deserialized = next(serializers.deserialize(
+            'python',
+            [{'model': change['model'], 'pk': change['pk'], 'fields': change['fields']}],
+            ignorenonexistent=True,
+        ))
+    except DeserializationError:
+        return False
+    instance = deserialized.object
+    if existing is not None:
+        # Carry over what post_init handlers remembered about the stored row
+        # (e.g. the epic a task counted towards) so post_save sees the change
+        instance.__dict__.update({
+            name: value for name, value in existing.__dict__.items()
+            if name.startswith('_') and name.endswith('_state') and name != '_state'
+        })
+    deserialized.save()
+    post_save.send(
+        sender=model, instance=instance, created=existing is None,
+        update_fields=None, raw=False, using=DEFAULT_DB_ALIAS,
+    )
+    return True
+
+
+def _apply_delete(model, change):
+    instance = model._default_manager.filter(pk=change['pk']).first()
+    if instance is not None:
+        instance.delete()
+    return True
+
+
+def apply_changes(changes):
+    """
+    Replay changes from another machine in one transaction.
+    Changes already recorded here are skipped, as are changes older than
+    this machine's latest change of the same row and saves of a row that
+    is already identical.
+    """
+    changes = list(changes)
+    known = set()
+    for batch in _batches([change['id'] for change in changes]):
+        known.update(ChangeLogEntry.objects.filter(change_id__in=batch).values_list('change_id', flat=True))
+
+    applied = skipped = 0
+    with transaction.atomic(), applying_changes():
+        for change in changes:
+            if change['id'] in known:
+                skipped += 1
+                continue
+            known.add(change['id'])
+            changed_at = parse_datetime(change['changed_at'])
+            try:
+                model = apps.get_model(change['model'])
+            except LookupError:
+                model = None
+            local = _local_clock(model, change['pk']) if model is not None else None
+            # Recorded even when it loses, so the row's clock stays the newest change seen
+            ChangeLogEntry.objects.create(
+                change_id=change['id'], origin=change['origin'], model=change['model'],
+                object_pk=change['pk'], action=change['action'], changed_at=changed_at,
+                data=change['fields'], exported=True,
+            )
+            # An equal clock is the version this machine already has
+            if model is None or (local is not None and local >= (changed_at, change['origin'])):
+                skipped += 1
+                continue
+
+            if change['action'] == ChangeLogEntry.ACTION_DELETE:
+                done = _apply_delete(model, change)
+            else:
+                done = _apply_save(model, change)
+            if done:
+                applied += 1
+            else:
+                skipped += 1
+    return ApplyResult(len(changes), applied, skipped)
+
+
+def apply_changeset(path):
+    """Replay a changeset file; a file applied before is skipped"""
+    name = os.path.basename(path)
+    if SyncedChangeset.objects.filter(name=name).exists():
+        return ApplyResult(0, 0, 0)
+    result = apply_changes(read_changeset(path))
+    SyncedChangeset.objects.create(
+        name=name, direction=SyncedChangeset.DIRECTION_APPLIED,
+        entries=result.entries, applied=result.applied,
+    )
+    return result
+
+
+def apply_pending_changesets(directory=None):
+    """Apply the changeset files in directory that were neither exported nor applied here"""
+    directory = directory or changeset_dir()
+    if not os.path.isdir(directory):
+        return ApplyResult(0, 0, 0)
+    names = sorted(name for name in os.listdir(directory) if name.endswith(CHANGESET_SUFFIX))
+    done = set()
+    for batch in _batches(names):
+        done.update(SyncedChangeset.objects.filter(name__in=batch).values_list('name', flat=True))
+
+    totals = ApplyResult(0, 0, 0)
+    for name in names:
+        if name not in done:
+            result = apply_changeset(os.path.join(directory, name))
+            totals = ApplyResult(*(total + count for total, count in zip(totals, result)))
+    return totals
@@ -2,10 +2,10 @@
 Context processors for the R1D3 system.
 These functions add variables to the template context for all templates.
 """
-from django.utils import timezone
-from projects.game_models import GameMilestone
 from types import SimpleNamespace
 
+from .milestone_snapshot import get_milestone_snapshot
+
 def get_phase_for_milestone(milestone_title):
     """
     Determine the appropriate company phase based on milestone title.
@@ -128,218 +128,50 @@ def breadcrumbs_processor(request):
 def milestone_info(request):
     """
     Add milestone info to the context.
-    This includes the current in-progress milestone and company phase.
+    This includes the current in-progress milestone and company phase,
+    read from the cached milestone snapshot (see core.milestone_snapshot).
     """
-    print("\n==== MILESTONE INFO CONTEXT PROCESSOR CALLED ====\n")
-    print(f"Request path: {request.path}")
-    
     # Create timestamp for cache busting
     import time
     import uuid
     timestamp = time.time()
     random_id = uuid.uuid4().hex[:8]
     
-    # Default milestone and phase data (fallback values)
-    milestone_title = 'Release First Indie Game'
-    game_title = 'PeacefulFarm'
-    phase_name = 'Indie Game Development'
-    phase_type = 'indie_dev'
-    phase_order = 1
-    
-    try:
-        # Try to get the actual in-progress milestone from the database
-        from projects.game_models import GameTask, GameMilestone
-        
-        # First check if there's an in-progress milestone in the strategy app
-        print("Searching for in-progress strategy milestones...")
-        try:
-            from strategy.models import StrategyMilestone, StrategyPhase
-            strategy_milestones = StrategyMilestone.objects.filter(status='in_progress')
-            
-            if strategy_milestones.exists():
-                # Get the first in-progress strategy milestone
-                strategy_milestone = strategy_milestones.first()
-                milestone_title = strategy_milestone.title
-                game_title = "Strategy"
-                print(f"Found in-progress strategy milestone: {milestone_title} (ID: {strategy_milestone.id})")
-                
-                # Get the phase directly from the database
-                try:
-                    phase = strategy_milestone.phase
-                    phase_name = phase.name
-                    phase_type = phase.phase_type
-                    phase_order = phase.order
-                    print(f"Phase retrieved from database: {phase_name} (ID: {phase.id}, Type: {phase_type}, Order: {phase_order})")
-                    
-                    # Set the background style based on the phase type
-                    background_style = "background: linear-gradient(135deg, #4e73df 0%, #224abe 100%);"  # Default blue
-                    if phase_type == 'arcade':
-                        background_style = "background: linear-gradient(135deg, #1cc88a 0%, #13855c 100%);"
-                    elif phase_type == 'theme_park':
-                        background_style = "background: linear-gradient(135deg, #f6c23e 0%, #dda20a 100%);"
-                    
-                    # Create a company phase object for the template
-                    class CompanyPhaseObj:
-                        def __init__(self, id, name, phase_type, order):
-                            self.id = id
-                            self.name = name
-                            self.phase_type = phase_type
-                            self.order = order
-                    
-                    company_phase_obj = CompanyPhaseObj(phase.id, phase_name, phase_type, phase_order)
-                    
-                    # Return early with the strategy milestone data
-                    return {
-                        'milestone_title': milestone_title,
-                        'game_title': game_title,
-                        'phase_name': phase_name,
-                        'phase_type': phase_type,
-                        'phase_order': phase_order,
-                        'background_style': background_style,
-                        'timestamp': timestamp,
-                        'random_id': random_id,
-                        'in_progress_milestone': strategy_milestone,
-                        'company_phase': company_phase_obj,
-                        'debug_info': {
-                            'milestone': milestone_title,
-                            'phase': phase_name,
-                            'phase_id': phase.id,
-                            'timestamp': timestamp,
-                            'random_id': random_id
-                        }
-                    }
-                except Exception as e:
-                    print(f"Error getting phase from database: {str(e)}")
-                    # Fall through to game milestones if we can't get the phase
-        except Exception as e:
-            print(f"Error checking strategy milestones: {str(e)}")
-        
-        # If no strategy milestone is in progress, check game milestones
-        print("Searching for in-progress game milestones...")
-        in_progress_milestones = GameMilestone.objects.filter(status='in_progress')
-        
-        if in_progress_milestones.exists():
-            # Get the first in-progress milestone
-            in_progress_milestone = in_progress_milestones.first()
-            milestone_title = in_progress_milestone.title
-            game_title = in_progress_milestone.game.title
-            print(f"Found in-progress milestone directly: {milestone_title}")
-            
-            # Get phase info based on milestone title
-            phase_info = get_phase_for_milestone(milestone_title)
-            phase_name = phase_info['name']
-            phase_type = phase_info['phase_type']
-            phase_order = phase_info['order']
-            print(f"Phase determined from milestone: {phase_name} (Type: {phase_type})")
-        else:
-            # If no non-completed milestones found, fall back to task-based detection
-            print("No non-completed milestones found, checking tasks...")
-            
-            # Find tasks with 'in_progress' status
-            in_progress_tasks = GameTask.objects.filter(status='in_progress')
-            
-            if in_progress_tasks.exists():
-                # Get the first in-progress task
-                in_progress_task = in_progress_tasks.first()
-                print(f"Found in-progress task: {in_progress_task.title}")
-                
-                if in_progress_task and in_progress_task.milestone:
-                    # Get milestone info from the in-progress task
-                    milestone_title = in_progress_task.milestone.title
-                    game_title = in_progress_task.game.title if in_progress_task.game else 'Unknown Game'
-                    print(f"Associated milestone: {milestone_title}")
-                    
-                    # Update the milestone to be in progress
-                    try:
-                        milestone = in_progress_task.milestone
-                        if milestone.status != 'in_progress':
-                            milestone.status = 'in_progress'
-                            milestone.save()
-                            print(f"Updated milestone {milestone.title} to in-progress state")
-                            print(f"Updated milestone status to in_progress")
-                    except Exception as e:
-                        print(f"Could not update milestone status: {str(e)}")
-                    
-                    # Get phase info based on milestone title
-                    phase_info = get_phase_for_milestone(milestone_title)
-                    phase_name = phase_info['name']
-                    phase_type = phase_info['phase_type']
-                    phase_order = phase_info['order']
-                    print(f"Phase determined from milestone: {phase_name} (Type: {phase_type})")
-                else:
-                    print("In-progress task has no milestone, checking other sources")
-                    
-                    # Check if the task has company_section set to arcade
-                    if in_progress_task and in_progress_task.company_section == 'arcade':
-                        phase_name = 'Arcade Machine Development'
-                        phase_type = 'arcade'
-                        phase_order = 2
-                        print(f"Using arcade phase based on task company section")
-            else:
-                print("No in-progress tasks found, using default values")
-    except Exception as e:
-        # If there's an error, use the default values
-        print(f"Error fetching milestone data: {str(e)}")
-        print("Using default milestone and phase data")
+    snapshot = get_milestone_snapshot(request)
     
-    # Set the background color based on the phase_type
-    if phase_type == 'indie_dev':
-        # Blue gradient for indie dev phase
-        background_style = "background: linear-gradient(135deg, #4e73df 0%, #224abe 100%);"
-    elif phase_type == 'arcade':
-        # Green gradient for arcade phase
-        background_style = "background: linear-gradient(135deg, #1cc88a 0%, #13855c 100%);"
-    elif phase_type == 'theme_park':
-        # Purple gradient for theme park phase
-        background_style = "background: linear-gradient(135deg, #6f42c1 0%, #4e2c8e 100%);"
+    if snapshot['strategy_phase']:
+        company_phase = SimpleNamespace(**snapshot['strategy_phase'])
     else:
-        # Default blue gradient
-        background_style = "background: linear-gradient(135deg, #4e73df 0%, #224abe 100%);"
-    
-    # Print debug info
-    print(f"Using milestone: {milestone_title}")
-    print(f"Using phase: {phase_name} ({phase_type})")
-    print(f"Background style: {background_style}")
-    print(f"Timestamp: {timestamp}, ID: {random_id}")
-    print("==== END OF MILESTONE INFO CONTEXT PROCESSOR ====\n")
-    
-    # Create a phase object for the template
-    class CompanyPhase:
-        def __init__(self, name, phase_type, order):
-            self.name = name
-            self.phase_type = phase_type
-            self.order = order
+        company_phase = SimpleNamespace(
+            name=snapshot['phase_name'],
+            phase_type=snapshot['phase_type'],
+            order=snapshot['phase_order'],
+        )
     
-    # Create phase object
-    phase_obj = CompanyPhase(phase_name, phase_type, phase_order)
-    
-    # Get the actual milestone object if it exists
     in_progress_milestone = None
-    try:
-        # Try to find the milestone by title and status
-        from projects.game_models import GameMilestone
-        milestone_objects = GameMilestone.objects.filter(status='in_progress')
-        if milestone_objects.exists():
-            in_progress_milestone = milestone_objects.first()
-    except Exception as e:
-        print(f"Error getting milestone object: {str(e)}")
+    if snapshot['in_progress_milestone']:
+        in_progress_milestone = SimpleNamespace(**snapshot['in_progress_milestone'])
+    
+    debug_info = {
+        'milestone': snapshot['milestone_title'],
+        'phase': snapshot['phase_name'],
+        'timestamp': timestamp,
+        'random_id': random_id
+    }
+    if snapshot['strategy_phase']:
+        debug_info['phase_id'] = snapshot['strategy_phase']['id']
     
     # Return context variables
     return {
-        'milestone_title': milestone_title,
-        'game_title': game_title,
-        'phase_name': phase_name,
-        'phase_type': phase_type,
-        'phase_order': phase_order,
-        'background_style': background_style,
+        'milestone_title': snapshot['milestone_title'],
+        'game_title': snapshot['game_title'],
+        'phase_name': snapshot['phase_name'],
+        'phase_type': snapshot['phase_type'],
+        'phase_order': snapshot['phase_order'],
+        'background_style': snapshot['background_style'],
         'timestamp': timestamp,
         'random_id': random_id,
         'in_progress_milestone': in_progress_milestone,
-        'company_phase': phase_obj,
-        'debug_info': {
-            'milestone': milestone_title,
-            'phase': phase_name,
-            'timestamp': timestamp,
-            'random_id': random_id
-        }
+        'company_phase': company_phase,
+        'debug_info': debug_info,
     }
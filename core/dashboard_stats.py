@@ -0,0 +1,119 @@
+"""
+Task statistics for the department task pages.
+
+Status, priority, overdue and completed-this-week counts for a BaseTask
+model come from one conditional aggregate, and the per-value counts of
+the department's grouping fields (zones, channels, campaigns, ...) from
+one UNION ALL of grouped queries. Results are cached per section with
+the section's task tags, which every task write bumps (see core.signals
+and core.task_index.reindex_tasks).
+"""
+import hashlib
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db.models import CharField, Count, F, Q, Value
+from django.utils import timezone
+
+from . import cache_tags
+from .model_utils import get_section_for_model
+
+DEPARTMENT_STATS_KEY = 'department_stats:{section}:{today}:{params}'
+
+
+def compute_task_stats(queryset, group_fields=(), today=None):
+    """
+    Statistics for a queryset of tasks, in at most two queries.
+
+    Returns a dict with the total, {status: count}, {priority: count}, the
+    overdue and completed_this_week counts, and for each grouping field a
+    list of (value, count) for its non-empty values.
+    """
+    model = queryset.model
+    today = today or date.today()
+    week_start = timezone.make_aware(datetime.combine(today - timedelta(days=today.weekday()), time.min))
+    statuses = [status for status, _ in model.STATUS_CHOICES]
+    priorities = [priority for priority, _ in model.PRIORITY_CHOICES]
+
+    aggregates = {
+        'total': Count('pk'),
+        'overdue': Count('pk', filter=Q(due_date__lt=today) & ~Q(status='done')),
+        'completed_this_week': Count('pk', filter=Q(status='done', updated_at__gte=week_start)),
+    }
+    aggregates.update({f'status_{status}': Count('pk', filter=Q(status=status)) for status in statuses})
+    aggregates.update({f'priority_{priority}': Count('pk', filter=Q(priority=priority)) for priority in priorities})
+    counts = queryset.aggregate(**aggregates)
+
+    groups = {field: [] for field in group_fields}
+    if group_fields:
+        branches = [
+            queryset.order_by().values(group_value=F(field)).annotate(
+                group_field=Value(field, output_field=CharField()),
+                count=Count('pk'),
+            ).values_list('group_field', 'group_value', 'count')
+            for field in group_fields
+        ]
+        rows = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+        for field, value, count in sorted(rows, key=lambda row: str(row[1])):
+            if value:
+                groups[field].append((value, count))
+
+    return {
+        'total': counts['total'],
+        'status': {status: counts[f'status_{status}'] for status in statuses},
+        'priority': {priority: counts[f'priority_{priority}'] for priority in priorities},
+        'overdue': counts['overdue'],
+        'completed_this_week': counts['completed_this_week'],
+        'groups': groups,
+    }
+
+
+def get_task_stats(model, group_fields=(), filters=None, today=None):
+    """
+    Cached compute_task_stats for a task model, optionally restricted by
+    exact-match filters (e.g. {'course_id': 'ED101'}).
+    """
+    today = today or date.today()
+    filters = {name: value for name, value in (filters or {}).items() if value}
+    section = get_section_for_model(model) or model._meta.label_lower
+    # Filter values come from the query string, so keep them out of the raw key
+    params = hashlib.md5(repr((tuple(group_fields), sorted(filters.items()))).encode()).hexdigest()
+
+    return cache_tags.get_or_set(
+        DEPARTMENT_STATS_KEY.format(section=section, today=today.isoformat(), params=params),
+        lambda: compute_task_stats(model.objects.filter(**filters), group_fields, today),
+        tags=cache_tags.task_tags(section),
+    )
+
+
+def task_stats_context(stats, percent_step=1):
+    """
+    Flatten stats into the task_stats dict the department templates use:
+    counts per status plus <status>_percent, rounded to percent_step.
+    """
+    total = stats['total']
+
+    def percentage(count):
+        if not total:
+            return 0
+        return round(count / total * 100 / percent_step) * percent_step
+
+    task_stats = {'total': total, 'overdue': stats['overdue'], 'completed_this_week': stats['completed_this_week']}
+    for status, count in stats['status'].items():
+        task_stats[status] = count
+        task_stats[f'{status}_percent'] = percentage(count)
+    task_stats['overdue_percent'] = percentage(stats['overdue'])
+    task_stats['completed_percent'] = percentage(stats['completed_this_week'])
+    return task_stats
+
+
+def group_choices(stats, field):
+    """A grouping field's values as the {'id', 'title', 'count'} dicts the filter lists use"""
+    return [{'id': value, 'title': value, 'count': count} for value, count in stats['groups'][field]]
+
+
+def assignable_users():
+    """Active users for the assignee dropdowns, loading only the displayed fields"""
+    return User.objects.filter(is_active=True).only(
+        'id', 'username', 'first_name', 'last_name'
+    ).order_by('first_name', 'last_name', 'username')
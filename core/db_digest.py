@@ -0,0 +1,180 @@
+"""
+Merkle-tree checksums of the synced tables.
+
+Each synced model's rows are grouped into buckets of DB_DIGEST_BUCKET_SIZE
+consecutive primary keys. A bucket's hash covers its rows' field values in
+primary key order, a table's hash covers its bucket hashes, and the root
+hash covers the table hashes:
+
+    {'root': '...', 'bucket_size': 1000, 'tables': {
+        'projects.gametask': {'hash': '...', 'rows': 2400, 'buckets': {'0': '...', '1': '...', '2': '...'}},
+        ...}}
+
+Two installs with the same root hold the same data. Otherwise they compare
+table hashes, then the bucket hashes of the tables that differ, and
+exchange only the rows of differing buckets (bucket_changes), which are
+replayed with core.change_log.apply_changes, last writer wins. The work is
+proportional to the size of the difference, not of the database.
+
+Rows are compared, not the history of how they got there, so a row
+deleted on one side comes back from the other; deletes travel in
+changesets.
+"""
+import hashlib
+import json
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import IntegerField, Max, Q
+
+from . import cache_tags
+from .change_log import ChangeEncoder, node_id, row_change_records, synced_models
+from .models import ChangeLogEntry
+
+DEFAULT_BUCKET_SIZE = 1000
+
+DB_DIGEST_KEY = 'db_digest:{bucket_size}:{watermark}'
+DB_DIGEST_TIMEOUT = 600
+
+
+def bucket_size_setting():
+    return getattr(settings, 'DB_DIGEST_BUCKET_SIZE', DEFAULT_BUCKET_SIZE)
+
+
+def _integer_pk(model):
+    pk = model._meta.pk
+    return isinstance(pk.target_field if pk.is_relation else pk, IntegerField)
+
+
+def _bucket(model, pk, bucket_size):
+    if _integer_pk(model):
+        return pk // bucket_size
+    # Text keys are spread over 64 buckets by hash
+    return int(hashlib.md5(str(pk).encode()).hexdigest()[:8], 16) % 64
+
+
+def _hash(parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def table_digest(model, bucket_size=None):
+    """{'hash', 'rows', 'buckets': {bucket: hash}} for one model, in one query"""
+    bucket_size = bucket_size or bucket_size_setting()
+    fields = [field.attname for field in model._meta.concrete_fields]
+    pk_index = fields.index(model._meta.pk.attname)
+
+    rows_by_bucket = {}
+    count = 0
+    for row in model._default_manager.order_by('pk').values_list(*fields).iterator(chunk_size=2000):
+        rows_by_bucket.setdefault(_bucket(model, row[pk_index], bucket_size), []).append(
+            json.dumps(row, cls=ChangeEncoder)
+        )
+        count += 1
+
+    buckets = {str(bucket): _hash(rows) for bucket, rows in sorted(rows_by_bucket.items())}
+    return {
+        'hash': _hash(f'{bucket}:{bucket_hash}' for bucket, bucket_hash in buckets.items()),
+        'rows': count,
+        'buckets': buckets,
+    }
+
+
+def database_digest(bucket_size=None):
+    """The checksum tree of every synced table"""
+    bucket_size = bucket_size or bucket_size_setting()
+    tables = {
+        model._meta.label_lower: table_digest(model, bucket_size)
+        for model in sorted(synced_models(), key=lambda model: model._meta.label_lower)
+    }
+    return {
+        'root': _hash(f"{label}:{table['hash']}" for label, table in tables.items()),
+        'bucket_size': bucket_size,
+        'tables': tables,
+    }
+
+
+def get_database_digest(bucket_size=None):
+    """
+    database_digest, cached until the next recorded change; writes the
+    change log does not see (such as buffered view counts) show up once
+    the entry expires.
+    """
+    bucket_size = bucket_size or bucket_size_setting()
+    watermark = ChangeLogEntry.objects.aggregate(latest=Max('pk'))['latest'] or 0
+    return cache_tags.get_or_set(
+        DB_DIGEST_KEY.format(bucket_size=bucket_size, watermark=watermark),
+        lambda: database_digest(bucket_size),
+        tags=['db_digest'],
+        timeout=DB_DIGEST_TIMEOUT,
+    )
+
+
+def digest_summary(digest, tables=()):
+    """The digest without bucket hashes, except for the given tables"""
+    return {
+        'root': digest['root'],
+        'bucket_size': digest['bucket_size'],
+        'tables': {
+            label: table if label in tables else {'hash': table['hash'], 'rows': table['rows']}
+            for label, table in digest['tables'].items()
+        },
+    }
+
+
+def diff_digests(local, remote):
+    """
+    {table: [buckets]} whose hashes differ between two digests (with
+    buckets), including buckets and tables only one side has.
+    """
+    if local['bucket_size'] != remote['bucket_size']:
+        raise ValueError('Digests use different bucket sizes')
+    if local['root'] == remote['root']:
+        return {}
+
+    differences = {}
+    empty = {'hash': None, 'buckets': {}}
+    for label in sorted(set(local['tables']) | set(remote['tables'])):
+        ours = local['tables'].get(label, empty)
+        theirs = remote['tables'].get(label, empty)
+        if ours['hash'] == theirs['hash']:
+            continue
+        buckets = set(ours['buckets']) | set(theirs['buckets'])
+        differences[label] = sorted(
+            (bucket for bucket in buckets if ours['buckets'].get(bucket) != theirs['buckets'].get(bucket)),
+            key=int,
+        )
+    return differences
+
+
+def bucket_changes(label, buckets, bucket_size=None):
+    """
+    The rows of some buckets of a table as change records for
+    core.change_log.apply_changes. Record ids derive from the row's
+    content, so sending the same rows twice is harmless.
+    """
+    bucket_size = bucket_size or bucket_size_setting()
+    model = apps.get_model(label)
+    if model not in synced_models():
+        raise LookupError(f'{label} is not synced')
+    buckets = {int(bucket) for bucket in buckets}
+    fields = [field.attname for field in model._meta.concrete_fields]
+
+    rows = model._default_manager.order_by('pk')
+    if _integer_pk(model):
+        ranges = Q()
+        for bucket in buckets:
+            ranges |= Q(pk__gte=bucket * bucket_size, pk__lt=(bucket + 1) * bucket_size)
+        rows = rows.filter(ranges) if buckets else rows.none()
+    rows = [row for row in rows if _bucket(model, row.pk, bucket_size) in buckets]
+
+    origin = node_id()
+
+    def change_id(instance):
+        values = json.dumps([getattr(instance, field) for field in fields], cls=ChangeEncoder)
+        return _hash([origin, label, values])[:32]
+
+    return row_change_records(rows, change_id)
@@ -1,33 +1,67 @@
 """
 Git and Database Sync utilities for R1D3 project
+
+Database changes travel as changeset files (see core.change_log) committed
+under SYNC_CHANGESET_DIR, not as the db.sqlite3 file itself. Changes count
+as unsynced until they are pushed: rows not exported yet, changeset files
+not committed yet and commits not pushed yet, so an interrupted sync is
+picked up by the next one.
 """
+import signal
 import subprocess
 import os
+from datetime import datetime, timezone
+
 from django.conf import settings
 
+from .change_log import apply_pending_changesets, changeset_dir, discard_export, export_changeset, pending_changes
+
+# Seconds between cancellation checks while git runs
+CANCEL_CHECK_INTERVAL = 0.5
+
+
+def _report(progress, percent, message):
+    if progress is not None:
+        progress(percent, message)
+
+
+def _terminate(process):
+    # git runs helpers (ssh, remote-https) that would keep running on their own
+    if os.name == 'posix':
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    else:
+        process.terminate()
+
 
 class GitSyncManager:
-    """Manages Git operations for database synchronization"""
+    """
+    Manages Git operations for database synchronization.
+
+    The long-running methods take optional callbacks: progress(percent,
+    message) is told about each step, and should_cancel() is checked
+    between steps and while git transfers data; a cancelled operation
+    returns a result with 'cancelled' set.
+    """
     
     def __init__(self):
         self.base_dir = settings.BASE_DIR
+        self.changeset_dir = os.path.relpath(changeset_dir(), self.base_dir)
         
-    def run_git_command(self, command):
-        """Run a git command and return the result"""
+    def run_git_command(self, *args, should_cancel=None):
+        """Run git with the given arguments and return the result"""
         try:
-            result = subprocess.run(
-                command,
+            process = subprocess.Popen(
+                ['git', *args],
                 cwd=self.base_dir,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                shell=True
+                # Its own process group, so cancelling stops git's helpers too
+                start_new_session=os.name == 'posix',
             )
-            return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr,
-                'returncode': result.returncode
-            }
         except Exception as e:
             return {
                 'success': False,
@@ -35,35 +69,94 @@ class GitSyncManager:
                 'error': str(e),
                 'returncode': -1
             }
+        
+        while True:
+            try:
+                output, error = process.communicate(timeout=CANCEL_CHECK_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                if should_cancel is not None and should_cancel():
+                    _terminate(process)
+                    try:
+                        process.communicate(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                        process.communicate()
+                    return {
+                        'success': False,
+                        'output': '',
+                        'error': 'Cancelled',
+                        'returncode': process.returncode,
+                        'cancelled': True
+                    }
+        return {
+            'success': process.returncode == 0,
+            'output': output,
+            'error': error,
+            'returncode': process.returncode
+        }
     
     def check_database_changes(self):
-        """Check if there are uncommitted database changes"""
-        result = self.run_git_command('git status --porcelain db.sqlite3')
+        """
+        Check for database changes not pushed yet: rows not exported to a
+        changeset, changeset files not committed and commits not pushed
+        """
+        pending = []
+        count = pending_changes().count()
+        if count:
+            pending.append(f'{count} unsynced changes')
+        files = self.run_git_command('status', '--porcelain', '--untracked-files=all', '--', self.changeset_dir)
+        if files['success'] and files['output'].strip():
+            pending.append(f"{len(files['output'].strip().splitlines())} changeset files not committed")
+        # Fails without an upstream branch, in which case nothing can be pushed
+        unpushed = self.run_git_command('rev-list', '--count', '@{u}..HEAD')
+        if unpushed['success'] and unpushed['output'].strip() not in ('', '0'):
+            pending.append(f"{unpushed['output'].strip()} commits not pushed")
         return {
-            'has_changes': bool(result['output'].strip()),
-            'status': result['output'].strip()
+            'has_changes': bool(pending),
+            'status': ', '.join(pending)
         }
     
-    def pull_latest(self):
-        """Pull latest changes from remote"""
-        return self.run_git_command('git pull')
+    def pull_latest(self, progress=None, should_cancel=None):
+        """Pull latest changes from remote and apply the new changesets"""
+        _report(progress, 60, 'Pulling latest changes...')
+        result = self.run_git_command('pull', should_cancel=should_cancel)
+        result['applied_changes'] = 0
+        if result['success']:
+            _report(progress, 85, 'Applying changes from other machines...')
+            result['applied_changes'] = apply_pending_changesets().applied
+        return result
     
-    def commit_database(self, message):
-        """Commit database changes"""
-        # Add database file
-        add_result = self.run_git_command('git add db.sqlite3')
-        if not add_result['success']:
-            return add_result
+    def commit_database(self, message, progress=None):
+        """
+        Export database changes to a changeset and commit it, along with
+        changeset files an interrupted sync left uncommitted. If the commit
+        fails, the new changeset is discarded and its changes stay pending.
+        """
+        _report(progress, 10, 'Exporting database changes...')
+        path = export_changeset()
+        _report(progress, 20, 'Committing database changes...')
+        add_result = self.run_git_command('add', self.changeset_dir)
+        if add_result['success']:
+            staged = self.run_git_command('diff', '--cached', '--quiet', '--', self.changeset_dir)
+            if staged['returncode'] == 0:
+                # Only unpushed commits were left to sync
+                return {'success': True, 'output': 'Nothing to commit', 'error': '', 'returncode': 0}
+            result = self.run_git_command('commit', '-m', f'Database: {message}')
+        else:
+            result = add_result
         
-        # Commit
-        commit_result = self.run_git_command(f'git commit -m "Database: {message}"')
-        return commit_result
+        if not result['success'] and path is not None:
+            self.run_git_command('reset', '-q', '--', os.path.relpath(path, self.base_dir))
+            discard_export(path)
+        return result
     
-    def push_changes(self):
+    def push_changes(self, progress=None, should_cancel=None):
         """Push changes to remote"""
-        return self.run_git_command('git push')
+        _report(progress, 30, 'Pushing to remote...')
+        return self.run_git_command('push', should_cancel=should_cancel)
     
-    def sync_database(self, commit_message=None):
+    def sync_database(self, commit_message=None, progress=None, should_cancel=None):
         """
         Full database sync workflow:
         1. Check for local changes
@@ -79,6 +172,14 @@ class GitSyncManager:
             'needs_restart': False
         }
         
+        def cancelled(result=None):
+            if (result or {}).get('cancelled') or (should_cancel is not None and should_cancel()):
+                status['cancelled'] = True
+                status['message'] = 'Sync cancelled.'
+                status['details'].append('✗ Cancelled')
+                return True
+            return False
+        
         # Check for local changes
         changes = self.check_database_changes()
         
@@ -86,17 +187,21 @@ class GitSyncManager:
             if commit_message:
                 # Commit local changes
                 status['details'].append('Committing local database changes...')
-                commit_result = self.commit_database(commit_message)
+                commit_result = self.commit_database(commit_message, progress)
                 
                 if not commit_result['success']:
                     status['message'] = f"Failed to commit: {commit_result['error']}"
                     return status
                 
                 status['details'].append('✓ Database changes committed')
+                if cancelled():
+                    return status
                 
                 # Push changes
                 status['details'].append('Pushing to remote...')
-                push_result = self.push_changes()
+                push_result = self.push_changes(progress, should_cancel)
+                if cancelled(push_result):
+                    return status
                 
                 if not push_result['success']:
                     status['message'] = "Failed to push. Try pulling first."
@@ -109,9 +214,14 @@ class GitSyncManager:
                 status['has_uncommitted_changes'] = True
                 return status
         
+        if cancelled():
+            return status
+        
         # Pull latest changes
         status['details'].append('Pulling latest changes...')
-        pull_result = self.pull_latest()
+        pull_result = self.pull_latest(progress, should_cancel)
+        if cancelled(pull_result):
+            return status
         
         if not pull_result['success']:
             status['message'] = f"Failed to pull: {pull_result['error']}"
@@ -121,44 +231,62 @@ class GitSyncManager:
         status['details'].append('✓ Pull completed')
         
         # Check if database was updated
-        if 'db.sqlite3' in pull_result['output']:
+        if pull_result['applied_changes']:
             status['database_updated'] = True
-            status['needs_restart'] = True
-            status['details'].append('⚠ Database was updated! Restart server to use new data.')
+            status['details'].append(f"✓ Applied {pull_result['applied_changes']} changes from other machines")
         
         # Success!
         status['success'] = True
         if changes['has_changes'] and commit_message:
             status['message'] = 'Database synced! Your changes were pushed.'
         elif status['database_updated']:
-            status['message'] = 'Database synced! New data received. Please restart server.'
+            status['message'] = 'Database synced! New data received.'
         else:
             status['message'] = 'Database already up to date.'
         
         return status
     
+    def fetch(self, progress=None, should_cancel=None):
+        """Fetch the remote's branches without changing the working copy"""
+        _report(progress, 30, 'Checking the remote for new changes...')
+        return self.run_git_command('fetch', should_cancel=should_cancel)
+    
+    def last_fetched_at(self):
+        """When the remote was last fetched (by a fetch, pull or sync), or None"""
+        path = self.run_git_command('rev-parse', '--git-path', 'FETCH_HEAD')
+        if not path['success']:
+            return None
+        try:
+            mtime = os.path.getmtime(os.path.join(self.base_dir, path['output'].strip()))
+        except OSError:
+            return None
+        return datetime.fromtimestamp(mtime, tz=timezone.utc)
+    
     def get_sync_status(self):
-        """Get current sync status information"""
+        """
+        Get current sync status information. Only local git commands run:
+        commits_behind is as of the last fetch (see fetched_at), which the
+        sync jobs do in the background.
+        """
         try:
             # Check for uncommitted changes
             db_changes = self.check_database_changes()
             
             # Get last commit info
-            last_commit = self.run_git_command('git log -1 --pretty=format:"%h - %s (%cr)" db.sqlite3')
+            last_commit = self.run_git_command('log', '-1', '--pretty=format:%h - %s (%cr)', '--', self.changeset_dir)
             
-            # Check if we're behind remote (skip fetch if it fails)
-            fetch_result = self.run_git_command('git fetch')
+            # Behind the remote-tracking branch as last fetched
             commits_behind = 0
-            
-            if fetch_result['success']:
-                behind = self.run_git_command('git rev-list HEAD..origin/master --count')
-                if behind['success'] and behind['output'].strip().isdigit():
-                    commits_behind = int(behind['output'].strip())
+            behind = self.run_git_command('rev-list', '--count', 'HEAD..@{u}')
+            if behind['success'] and behind['output'].strip().isdigit():
+                commits_behind = int(behind['output'].strip())
+            fetched_at = self.last_fetched_at()
             
             return {
                 'has_uncommitted_changes': db_changes['has_changes'],
                 'last_database_commit': last_commit['output'] if last_commit['success'] else 'Unknown',
-                'commits_behind': commits_behind
+                'commits_behind': commits_behind,
+                'fetched_at': fetched_at.isoformat() if fetched_at else None,
             }
         except Exception as e:
             # Return minimal status if there's an error
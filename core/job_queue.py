@@ -0,0 +1,332 @@
+"""
+Database-backed background jobs.
+
+Views hand slow work (PDF rendering, GDD parsing, git calls) to a job
+instead of doing it on the request thread:
+
+    job = enqueue('projects.extract_gdd_features', user=request.user, gdd_id=gdd.pk)
+
+Handlers are registered with @register_job in each app's jobs.py module
+(discovered when the core app is ready) and are called as
+handler(job, **kwargs). They report progress with set_progress, may raise
+JobFailed to fail without retrying, and return a JSON-serialisable result.
+cancel_job asks a job to stop: a queued job is cancelled at once and a
+running handler stops at its next check_cancelled. Jobs registered with
+the same lock never run at the same time: enqueueing a job while one of
+the same name is pending returns the pending job, and a job whose lock
+is held by a different job waits in the queue until that one finishes.
+
+`manage.py run_workers` runs a pool of worker processes that claim queued
+jobs with a compare-and-set UPDATE, so any number of workers can share the
+queue. Failed jobs are retried with exponential backoff up to their
+max_attempts. With JOBS_RUN_INLINE (the default when DEBUG is on) jobs run
+in-process as soon as the enqueuing transaction commits, so development
+servers work without a worker; handlers registered with background=True
+then run on a thread so the request does not wait for them.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Job
+from .sqlite_tuning import retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+JobHandler = namedtuple('JobHandler', ['func', 'max_attempts', 'lock', 'background'])
+
+JOB_HANDLERS = {}
+
+
+class JobFailed(Exception):
+    """Fail the job without retrying; the message is shown to the user"""
+
+
+class JobCancelled(Exception):
+    """Raised by check_cancelled to stop a job whose cancellation was requested"""
+
+
+def register_job(name, max_attempts=3, lock=None, background=False):
+    """
+    Register the decorated function as the handler for jobs called name.
+
+    Args:
+        max_attempts: Runs before a failing job is given up
+        lock: Jobs of handlers with the same lock never run concurrently
+        background: With JOBS_RUN_INLINE, run on a thread instead of in the request
+    """
+    def decorator(func):
+        JOB_HANDLERS[name] = JobHandler(func, max_attempts, lock, background)
+        return func
+    return decorator
+
+
+def _locked_names(lock):
+    return [name for name, handler in JOB_HANDLERS.items() if handler.lock == lock]
+
+
+def enqueue(name, user=None, unique=False, **kwargs):
+    """
+    Queue a job and return it.
+
+    Args:
+        name: A registered handler name
+        user: The user the job runs for; only they (and staff) can poll it
+        unique: Return the queued or running job with the same name and
+            kwargs instead of queueing a duplicate
+        kwargs: JSON-serialisable arguments for the handler
+    """
+    handler = JOB_HANDLERS.get(name)
+    if handler is None:
+        raise LookupError(f'No job handler registered as {name!r}')
+
+    with transaction.atomic():
+        pending = Job.objects.filter(status__in=[Job.STATUS_QUEUED, Job.STATUS_RUNNING])
+        if handler.lock is not None:
+            locked = pending.select_for_update().filter(name__in=_locked_names(handler.lock)).first()
+            if locked is not None and locked.name == name:
+                return locked
+        if unique:
+            for job in pending.filter(name=name):
+                if job.kwargs == kwargs:
+                    return job
+
+        job = Job.objects.create(
+            name=name,
+            kwargs=kwargs,
+            max_attempts=handler.max_attempts,
+            created_by=user if user is not None and user.is_authenticated else None,
+        )
+    if getattr(settings, 'JOBS_RUN_INLINE', False):
+        if handler.background:
+            transaction.on_commit(lambda: threading.Thread(target=_run_inline_thread, args=(job,), daemon=True).start())
+        else:
+            transaction.on_commit(lambda: run_inline(job))
+    return job
+
+
+def run_inline(job):
+    """
+    Run a queued job in this process, retrying immediately on failure and
+    waiting for the lock while another job holding it runs
+    """
+    while claim_job(job, worker_name()):
+        if not run_job(job):
+            time.sleep(getattr(settings, 'JOB_LOCK_WAIT', 1))
+            continue
+        job.refresh_from_db()
+        if job.status != Job.STATUS_QUEUED:
+            break
+
+
+def _run_inline_thread(job):
+    try:
+        run_inline(job)
+    finally:
+        # The thread's own database connection
+        connection.close()
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+@retry_on_locked
+def claim_job(job, worker):
+    """Mark a queued job as running for worker; False if another worker got it first"""
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=job.pk, status=Job.STATUS_QUEUED).update(
+        status=Job.STATUS_RUNNING,
+        attempts=F('attempts') + 1,
+        worker=worker,
+        started_at=now,
+        updated_at=now,
+    )
+    if claimed:
+        job.refresh_from_db()
+    return bool(claimed)
+
+
+def claim_next_job(worker):
+    """Claim the oldest job that is due, or return None when there is none"""
+    while True:
+        candidate = Job.objects.filter(
+            status=Job.STATUS_QUEUED, run_after__lte=timezone.now()
+        ).order_by('run_after', 'pk').first()
+        if candidate is None:
+            return None
+        if claim_job(candidate, worker):
+            return candidate
+
+
+@retry_on_locked
+def set_progress(job, percent, message=''):
+    """Record a running job's progress (0-100) and a short status message"""
+    job.progress = max(0, min(100, int(percent)))
+    job.progress_message = message[:255]
+    Job.objects.filter(pk=job.pk).update(
+        progress=job.progress, progress_message=job.progress_message, updated_at=timezone.now(),
+    )
+
+
+def cancel_job(job):
+    """
+    Cancel a queued job, or ask a running one to stop.
+    Returns False if the job had already finished.
+    """
+    now = timezone.now()
+    if Job.objects.filter(pk=job.pk, status=Job.STATUS_QUEUED).update(
+        status=Job.STATUS_CANCELLED, cancel_requested=True, finished_at=now, updated_at=now,
+    ):
+        return True
+    return bool(Job.objects.filter(pk=job.pk, status=Job.STATUS_RUNNING).update(cancel_requested=True))
+
+
+def cancel_requested(job):
+    """Whether cancel_job was called for a running job"""
+    return Job.objects.filter(pk=job.pk, cancel_requested=True).exists()
+
+
+def check_cancelled(job):
+    """Raise JobCancelled if the job should stop; call between steps of long handlers"""
+    if cancel_requested(job):
+        raise JobCancelled()
+
+
+def _lock_held(job, handler):
+    return handler.lock is not None and Job.objects.filter(
+        name__in=_locked_names(handler.lock), status=Job.STATUS_RUNNING
+    ).exclude(pk=job.pk).exists()
+
+
+def run_job(job):
+    """
+    Run a claimed job's handler and record the outcome. Returns False,
+    without running it, if another job holding its lock is running: the
+    job goes back in the queue for JOB_LOCK_WAIT seconds.
+    """
+    handler = JOB_HANDLERS.get(job.name)
+    if handler is not None and _lock_held(job, handler):
+        now = timezone.now()
+        # Waiting for the lock does not use up an attempt
+        Job.objects.filter(pk=job.pk, status=Job.STATUS_RUNNING).update(
+            status=Job.STATUS_QUEUED, attempts=F('attempts') - 1, worker='',
+            progress_message='Waiting for another job to finish...',
+            run_after=now + timedelta(seconds=getattr(settings, 'JOB_LOCK_WAIT', 1)), updated_at=now,
+        )
+        return False
+    retry = False
+    try:
+        if handler is None:
+            raise JobFailed(f'No job handler registered as {job.name!r}')
+        check_cancelled(job)
+        result = handler.func(job, **job.kwargs)
+    except JobCancelled:
+        now = timezone.now()
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_CANCELLED, error='Cancelled', finished_at=now, updated_at=now,
+        )
+        return True
+    except JobFailed as e:
+        error = str(e)
+    except Exception:
+        logger.exception('Job %s failed (attempt %s of %s)', job, job.attempts, job.max_attempts)
+        error = traceback.format_exc()
+        retry = job.attempts < job.max_attempts
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_SUCCEEDED, progress=100, result=result, error='',
+            finished_at=timezone.now(), updated_at=timezone.now(),
+        )
+        return True
+
+    now = timezone.now()
+    if retry:
+        delay = getattr(settings, 'JOB_RETRY_DELAY', 30) * 2 ** (job.attempts - 1)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_QUEUED, error=error, run_after=now + timedelta(seconds=delay), updated_at=now,
+        )
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_FAILED, error=error, finished_at=now, updated_at=now,
+        )
+    return True
+
+
+def requeue_stale_jobs(stale_after=None):
+    """
+    Put running jobs whose worker stopped reporting back in the queue
+    (or fail them once out of attempts). Returns the number of jobs reset.
+    """
+    if stale_after is None:
+        stale_after = getattr(settings, 'JOB_STALE_AFTER', 600)
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.STATUS_RUNNING, updated_at__lt=now - timedelta(seconds=stale_after))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.STATUS_FAILED, error='Worker stopped while running the job', finished_at=now, updated_at=now,
+    )
+    requeued = stale.update(status=Job.STATUS_QUEUED, run_after=now, updated_at=now)
+    return failed + requeued
+
+
+def run_due_jobs(should_stop=None):
+    """Run the jobs that are due, one after another, until none are left; returns how many ran"""
+    worker = worker_name()
+    processed = 0
+    while not (should_stop and should_stop()):
+        job = claim_next_job(worker)
+        if job is None:
+            break
+        if run_job(job):
+            processed += 1
+    return processed
+
+
+def work(poll_interval=1.0, burst=False, should_stop=None):
+    """
+    Run jobs until should_stop() is true, sleeping poll_interval seconds
+    whenever the queue is empty. In burst mode, return once the queue is
+    empty. Returns the number of jobs run.
+    """
+    processed = 0
+    while not (should_stop and should_stop()):
+        close_old_connections()
+        processed += run_due_jobs(should_stop)
+        if burst:
+            break
+        time.sleep(poll_interval)
+    close_old_connections()
+    return processed
+
+
+def job_payload(job):
+    """The JSON the polling endpoint returns for a job"""
+    error = ''
+    if job.error and job.status in (Job.STATUS_FAILED, Job.STATUS_CANCELLED):
+        # Only the exception line of a traceback
+        error = job.error.strip().splitlines()[-1]
+    return {
+        'id': job.pk,
+        'name': job.name,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.progress_message,
+        'finished': job.is_finished,
+        'success': job.status == Job.STATUS_SUCCEEDED,
+        'result': job.result,
+        'error': error,
+        'attempts': job.attempts,
+        'cancel_requested': job.cancel_requested,
+        'cancel_url': reverse('core:job_cancel', args=[job.pk]),
+    }
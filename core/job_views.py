@@ -0,0 +1,48 @@
+"""
+Polling endpoint and view helpers for background jobs
+"""
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods
+
+from .job_queue import cancel_job, job_payload
+from .models import Job
+
+
+@login_required
+@require_http_methods(["GET"])
+def job_status(request, pk):
+    """Status, progress and result of a job started by the current user"""
+    job = get_object_or_404(Job, pk=pk)
+    if job.created_by_id != request.user.pk and not request.user.is_staff:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(job_payload(job))
+
+
+@login_required
+@require_http_methods(["POST"])
+def job_cancel(request, pk):
+    """Cancel a job started by the current user; it stops at its next step"""
+    job = get_object_or_404(Job, pk=pk)
+    if job.created_by_id != request.user.pk and not request.user.is_staff:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    if not cancel_job(job):
+        return JsonResponse({'error': 'The job has already finished'}, status=409)
+    job.refresh_from_db()
+    return JsonResponse(job_payload(job))
+
+
+def add_job_message(request, job, pending_message):
+    """
+    Tell the user how a job they just started went: its result message if
+    it already finished (jobs run inline in development), else pending_message
+    """
+    job.refresh_from_db()
+    if job.status == Job.STATUS_SUCCEEDED:
+        messages.success(request, (job.result or {}).get('message', 'Done.'))
+    elif job.status == Job.STATUS_FAILED:
+        messages.error(request, job_payload(job)['error'])
+    else:
+        messages.info(request, pending_message)
@@ -0,0 +1,50 @@
+"""
+Background job handlers for the core app (see core.job_queue)
+"""
+from .git_sync import GitSyncManager
+from .job_queue import JobCancelled, cancel_requested, register_job, set_progress
+
+SYNC_DATABASE_JOB = 'core.sync_database'
+PULL_DATABASE_JOB = 'core.pull_database'
+FETCH_REMOTE_JOB = 'core.fetch_remote'
+
+# Only one Git operation at a time in the working copy
+GIT_SYNC_LOCK = 'git_sync'
+
+
+def _git_callbacks(job):
+    return {
+        'progress': lambda percent, message: set_progress(job, percent, message),
+        'should_cancel': lambda: cancel_requested(job),
+    }
+
+
+# Git operations are not safe to repeat blindly (a push may have gone through)
+@register_job(SYNC_DATABASE_JOB, max_attempts=1, lock=GIT_SYNC_LOCK, background=True)
+def sync_database(job, commit_message=None):
+    set_progress(job, 5, 'Syncing database with Git...')
+    result = GitSyncManager().sync_database(commit_message, **_git_callbacks(job))
+    if result.get('cancelled'):
+        raise JobCancelled()
+    return result
+
+
+@register_job(PULL_DATABASE_JOB, max_attempts=1, lock=GIT_SYNC_LOCK, background=True)
+def pull_database(job):
+    result = GitSyncManager().pull_latest(**_git_callbacks(job))
+    if result.get('cancelled'):
+        raise JobCancelled()
+    return {
+        'success': result['success'],
+        'message': 'Database pulled successfully' if result['success'] else f"Pull failed: {result['error']}",
+        'output': result['output'],
+        'applied_changes': result['applied_changes'],
+    }
+
+
+@register_job(FETCH_REMOTE_JOB, max_attempts=1, lock=GIT_SYNC_LOCK, background=True)
+def fetch_remote(job):
+    result = GitSyncManager().fetch(**_git_callbacks(job))
+    if result.get('cancelled'):
+        raise JobCancelled()
+    return {'success': result['success'], 'error': result['error']}
@@ -0,0 +1,156 @@
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+from django.db import OperationalError, connections, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core.model_utils import get_task_model_map
+from core.sqlite_tuning import SQLITE_PROFILES, retry_on_locked
+from projects.task_models import Epic
+
+SCRATCH_ALIAS = 'sqlite_write_benchmark'
+STATUSES = ('to_do', 'in_progress', 'in_review', 'done', 'blocked')
+
+# (label, SQLITE_PROFILE, transaction_mode, retry locked writes)
+RUNS = [
+    ('SQLite defaults', 'default', None, False),
+    ('production profile', 'production', 'IMMEDIATE', True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark concurrent task status updates on a scratch SQLite database, '
+        'with SQLite\'s default settings and with the core.sqlite_tuning production '
+        'profile (WAL, BEGIN IMMEDIATE, busy timeout, retries)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=2000, help='Number of tasks to seed')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent writers')
+        parser.add_argument('--updates', type=int, default=200, help='Status updates per writer')
+        parser.add_argument('--section', default='arcade', help='Task section whose table is updated')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the chosen tasks')
+
+    def handle(self, *args, **options):
+        model = get_task_model_map().get(options['section'])
+        if model is None:
+            raise CommandError(f"Unknown task section '{options['section']}'")
+
+        results = []
+        for label, profile, transaction_mode, retry in RUNS:
+            self.stdout.write(f'Running {label}...')
+            # Each run gets a fresh file: the journal mode is stored in the database
+            fd, path = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(fd)
+            settings_dict = dict(connections['default'].settings_dict)
+            settings_dict.update(
+                ENGINE='django.db.backends.sqlite3', NAME=path, CONN_MAX_AGE=0,
+                OPTIONS={'transaction_mode': transaction_mode} if transaction_mode else {},
+            )
+            connections.settings[SCRATCH_ALIAS] = settings_dict
+            try:
+                with override_settings(SQLITE_PROFILE=profile, SQLITE_PRAGMAS={}):
+                    self.seed(model, options['tasks'])
+                    results.append((label, profile, self.run_writers(model, retry, options)))
+            finally:
+                connections[SCRATCH_ALIAS].close()
+                del connections[SCRATCH_ALIAS]
+                del connections.settings[SCRATCH_ALIAS]
+                for suffix in ('', '-wal', '-shm', '-journal'):
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+
+        self.report(results, options)
+
+    def seed(self, model, total):
+        scratch = connections[SCRATCH_ALIAS]
+        with scratch.schema_editor() as editor:
+            # The task table plus the tables its foreign keys point at
+            editor.create_model(User)
+            editor.create_model(Epic)
+            editor.create_model(model)
+        model.objects.using(SCRATCH_ALIAS).bulk_create(
+            [model(title=f'Task {i}', status='to_do') for i in range(1, total + 1)], batch_size=1000,
+        )
+        scratch.close()
+
+    def update_status(self, model, task_id, status):
+        """What a status change does: read the task, then write it, in one transaction"""
+        with transaction.atomic(using=SCRATCH_ALIAS):
+            tasks = model.objects.using(SCRATCH_ALIAS)
+            tasks.filter(pk=task_id).values_list('status', flat=True).first()
+            tasks.filter(pk=task_id).update(status=status, updated_at=timezone.now())
+
+    def run_writers(self, model, retry, options):
+        update = retry_on_locked(self.update_status, using=SCRATCH_ALIAS) if retry else self.update_status
+        task_ids = list(model.objects.using(SCRATCH_ALIAS).values_list('pk', flat=True))
+        connections[SCRATCH_ALIAS].close()
+        barrier = threading.Barrier(options['threads'])
+        timings, failures = [], []
+        lock = threading.Lock()
+
+        def writer(number):
+            rng = random.Random(options['seed'] + number)
+            own_timings, own_failures = [], 0
+            try:
+                barrier.wait()
+                for _ in range(options['updates']):
+                    start = time.perf_counter()
+                    try:
+                        update(model, rng.choice(task_ids), rng.choice(STATUSES))
+                    except OperationalError:
+                        own_failures += 1
+                    else:
+                        own_timings.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections[SCRATCH_ALIAS].close()
+            with lock:
+                timings.extend(own_timings)
+                failures.append(own_failures)
+
+        threads = [threading.Thread(target=writer, args=(number,)) for number in range(options['threads'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        return {
+            'elapsed': elapsed,
+            'succeeded': len(timings),
+            'failed': sum(failures),
+            'per_second': len(timings) / elapsed if elapsed else 0,
+            'median_ms': statistics.median(timings) if timings else 0,
+            'p95_ms': statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else 0,
+        }
+
+    def report(self, results, options):
+        total = options['threads'] * options['updates']
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{options['threads']} writers x {options['updates']} updates on {options['tasks']} tasks"
+        ))
+        for label, profile, result in results:
+            pragmas = ', '.join(f'{name}={value}' for name, value in SQLITE_PROFILES[profile].items()) or 'none'
+            self.stdout.write('')
+            self.stdout.write(f'  {label} (pragmas: {pragmas})')
+            self.stdout.write(
+                f"    {result['succeeded']}/{total} updates in {result['elapsed']:.2f} s "
+                f"({result['per_second']:.0f}/s), {result['failed']} failed with 'database is locked'"
+            )
+            self.stdout.write(f"    median {result['median_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms")
+        before, after = results[0][2], results[-1][2]
+        if before['per_second']:
+            self.stdout.write('')
+            self.stdout.write(f"  throughput {after['per_second'] / before['per_second']:.1f}x")
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
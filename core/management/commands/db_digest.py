@@ -0,0 +1,43 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db_digest import bucket_size_setting, database_digest, diff_digests, digest_summary
+
+
+class Command(BaseCommand):
+    help = 'Print the checksum tree of the synced tables, or compare it with another install\'s (see core.db_digest)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bucket-size', type=int, default=bucket_size_setting(), help='Primary keys per bucket')
+        parser.add_argument('--buckets', action='store_true', help='Include bucket hashes')
+        parser.add_argument('--json', action='store_true', help='Print the digest as JSON')
+        parser.add_argument('--compare', metavar='FILE', help='A digest saved with --json --buckets on another install')
+
+    def handle(self, *args, **options):
+        digest = database_digest(options['bucket_size'])
+
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    other = json.load(f)
+                differences = diff_digests(digest, other)
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f'Cannot compare with {options["compare"]}: {e}')
+            if not differences:
+                self.stdout.write(self.style.SUCCESS('Databases match'))
+            for label, buckets in differences.items():
+                self.stdout.write(f'{label}: buckets {", ".join(buckets)}')
+            return
+
+        if options['json']:
+            tables = digest['tables'] if options['buckets'] else ()
+            self.stdout.write(json.dumps(digest_summary(digest, tables), indent=2))
+            return
+
+        for label, table in digest['tables'].items():
+            self.stdout.write(f"{table['hash'][:16]}  {table['rows']:>8}  {label}")
+            if options['buckets']:
+                for bucket, bucket_hash in table['buckets'].items():
+                    self.stdout.write(f"    {bucket_hash[:16]}  bucket {bucket}")
+        self.stdout.write(self.style.SUCCESS(f"Root {digest['root']}"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.task_index import rebuild_task_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cross-section TaskIndex table and task search index from every task model'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding task index...')
+        counts = rebuild_task_index(batch_size=options['batch_size'])
+
+        for section, count in counts.items():
+            self.stdout.write(f'  {section}: {count} tasks')
+
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} tasks'))
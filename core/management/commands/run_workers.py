@@ -0,0 +1,61 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.job_queue import requeue_stale_jobs, work
+
+
+def _worker_process(poll_interval, burst, stop_event):
+    import django
+    django.setup()
+    # Ctrl+C reaches the whole process group; the parent sets stop_event instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    work(poll_interval=poll_interval, burst=burst, should_stop=stop_event.is_set)
+
+
+class Command(BaseCommand):
+    help = 'Run a pool of background job workers (see core.job_queue)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.JOB_WORKERS, help='Worker processes')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls of an empty queue')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f'Reset {requeued} jobs left running by a stopped worker')
+
+        workers = max(1, options['workers'])
+        poll_interval = options['poll_interval']
+        burst = options['burst']
+        self.stdout.write(f'Starting {workers} job workers...')
+
+        # SIGINT/SIGTERM let running jobs finish, then stop the workers
+        stop_event = multiprocessing.Event()
+
+        def stop(signum, frame):
+            stop_event.set()
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        if workers == 1:
+            processed = work(poll_interval=poll_interval, burst=burst, should_stop=stop_event.is_set)
+            self.stdout.write(self.style.SUCCESS(f'Worker stopped after {processed} jobs'))
+            return
+
+        # Children must not share the parent's database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker_process, args=(poll_interval, burst, stop_event), daemon=True)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS('Workers stopped'))
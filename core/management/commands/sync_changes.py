@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.change_log import apply_changeset, apply_pending_changesets, export_changeset
+from core.git_sync import GitSyncManager
+
+
+class Command(BaseCommand):
+    help = 'Share database changes with other machines as changeset files (see core.change_log)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action', choices=['export', 'apply', 'push', 'pull'],
+            help='export: write a changeset of local changes; apply: replay changesets; '
+                 'push: export, commit and push; pull: pull and apply new changesets',
+        )
+        parser.add_argument('files', nargs='*', help='Changeset files to apply (default: new ones in SYNC_CHANGESET_DIR)')
+        parser.add_argument('-m', '--message', help='Commit message for push')
+
+    def handle(self, *args, **options):
+        action = options['action']
+        if action == 'export':
+            path = export_changeset()
+            self.stdout.write(self.style.SUCCESS(f'Exported {path}') if path else 'No changes to export')
+        elif action == 'apply':
+            self.report(
+                [apply_changeset(path) for path in options['files']] if options['files']
+                else [apply_pending_changesets()]
+            )
+        elif action == 'push':
+            manager = GitSyncManager()
+            if not manager.check_database_changes()['has_changes']:
+                self.stdout.write('No changes to push')
+                return
+            message = options['message'] or f'Sync {datetime.now():%Y-%m-%d %H:%M:%S}'
+            for step in (lambda: manager.commit_database(message), manager.push_changes):
+                result = step()
+                if not result['success']:
+                    raise CommandError(result['error'] or result['output'])
+            self.stdout.write(self.style.SUCCESS('Changes pushed'))
+        else:
+            result = GitSyncManager().pull_latest()
+            if not result['success']:
+                raise CommandError(result['error'])
+            self.stdout.write(self.style.SUCCESS(f"Applied {result['applied_changes']} changes"))
+
+    def report(self, results):
+        applied = sum(result.applied for result in results)
+        skipped = sum(result.skipped for result in results)
+        self.stdout.write(self.style.SUCCESS(f'Applied {applied} changes ({skipped} skipped)'))
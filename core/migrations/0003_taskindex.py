@@ -0,0 +1,79 @@
+# Generated by Django 5.2.3 on 2026-10-18 15:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+SECTION_MODELS = [
+    ('r1d3', 'projects', 'R1D3Task'),
+    ('game_development', 'projects', 'GameDevelopmentTask'),
+    ('education', 'projects', 'EducationTask'),
+    ('social_media', 'projects', 'SocialMediaTask'),
+    ('arcade', 'projects', 'ArcadeTask'),
+    ('theme_park', 'projects', 'ThemeParkTask'),
+    ('indie_news', 'indie_news', 'IndieNewsTask'),
+    ('game', 'projects', 'GameTask'),
+]
+
+
+def backfill_task_index(apps, schema_editor):
+    TaskIndex = apps.get_model('core', 'TaskIndex')
+    for section, app_label, model_name in SECTION_MODELS:
+        model = apps.get_model(app_label, model_name)
+        TaskIndex.objects.bulk_create([
+            TaskIndex(
+                section=section,
+                task_id=task.pk,
+                company_section=getattr(task, 'company_section', '') or '',
+                title=(task.title or '')[:255],
+                status=task.status,
+                priority=task.priority,
+                due_date=task.due_date,
+                assigned_to_id=task.assigned_to_id,
+                assigned_to_name=task.assigned_to_name or '',
+                epic_id=getattr(task, 'epic_id', None),
+                created_at=task.created_at,
+                updated_at=task.updated_at,
+            )
+            for task in model.objects.all().iterator()
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_quicklink'),
+        ('projects', '0102_gameproject_is_archived'),
+        ('indie_news', '0005_remove_indienewstask_team_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(choices=[('r1d3', 'R1D3'), ('game_development', 'Game Development'), ('education', 'Education'), ('social_media', 'Social Media'), ('arcade', 'Arcade'), ('theme_park', 'Theme Park'), ('indie_news', 'Indie News'), ('game', 'Game (legacy)')], max_length=30)),
+                ('task_id', models.PositiveIntegerField()),
+                ('company_section', models.CharField(blank=True, default='', max_length=30)),
+                ('title', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('backlog', 'Backlog'), ('to_do', 'To Do'), ('in_progress', 'In Progress'), ('in_review', 'In Review'), ('done', 'Done'), ('blocked', 'Blocked')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('assigned_to_name', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('epic', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='projects.epic')),
+            ],
+            options={
+                'verbose_name': 'Task Index Entry',
+                'verbose_name_plural': 'Task Index',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', '-created_at'], name='core_taskidx_status_created'), models.Index(fields=['section', 'status'], name='core_taskidx_section_status'), models.Index(fields=['assigned_to', 'status'], name='core_taskidx_assignee_status'), models.Index(fields=['due_date', 'status'], name='core_taskidx_due_status'), models.Index(fields=['epic', 'status'], name='core_taskidx_epic_status')],
+                'constraints': [models.UniqueConstraint(fields=('section', 'task_id'), name='core_taskindex_unique_task')],
+            },
+        ),
+        migrations.RunPython(backfill_task_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:10
+
+from django.db import migrations
+
+from core.search import FullTextIndex
+
+
+# Snapshot of core.task_search.TASK_SEARCH_INDEX at the time of this migration
+TASK_SEARCH_INDEX = FullTextIndex('core_task_search', [
+    ('title', 10),
+    ('tags', 5),
+    ('description', 3),
+    ('output', 2),
+    ('note', 2),
+])
+
+SECTION_MODELS = [
+    ('r1d3', 'projects', 'R1D3Task'),
+    ('game_development', 'projects', 'GameDevelopmentTask'),
+    ('education', 'projects', 'EducationTask'),
+    ('social_media', 'projects', 'SocialMediaTask'),
+    ('arcade', 'projects', 'ArcadeTask'),
+    ('theme_park', 'projects', 'ThemeParkTask'),
+    ('indie_news', 'indie_news', 'IndieNewsTask'),
+    ('game', 'projects', 'GameTask'),
+]
+
+
+def create_task_search(apps, schema_editor):
+    conn = schema_editor.connection
+    TASK_SEARCH_INDEX.create(conn)
+
+    TaskIndex = apps.get_model('core', 'TaskIndex')
+    for section, app_label, model_name in SECTION_MODELS:
+        model = apps.get_model(app_label, model_name)
+        tasks = {task.pk: task for task in model.objects.all().iterator()}
+        rows = []
+        for entry_id, task_id in TaskIndex.objects.filter(section=section).values_list('pk', 'task_id'):
+            task = tasks.get(task_id)
+            if task is None:
+                continue
+            rows.append((entry_id, {
+                'title': task.title,
+                'tags': getattr(task, 'tags', ''),
+                'description': task.description,
+                'output': getattr(task, 'output', ''),
+                'note': getattr(task, 'additional_note_text', ''),
+            }))
+        TASK_SEARCH_INDEX.update_many(rows, conn=conn)
+
+
+def drop_task_search(apps, schema_editor):
+    TASK_SEARCH_INDEX.drop(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_taskindex'),
+        ('projects', '0103_task_filter_indexes'),
+        ('indie_news', '0006_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_task_search, drop_task_search),
+    ]
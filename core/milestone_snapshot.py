@@ -0,0 +1,152 @@
+"""
+Cached snapshot of the current milestone and company phase.
+
+The milestone banner is rendered on every page, so the data behind it is
+computed once and stored in the cache under a version key. Saving or
+deleting a StrategyMilestone, StrategyPhase or GameMilestone, or changing
+the status of a GameTask, bumps the version (see core.signals) and the
+next request rebuilds the snapshot.
+"""
+import time
+
+from django.core.cache import cache
+
+from .cache_tags import tag_version, invalidate_tags
+
+# The snapshot version is the version of this cache tag
+MILESTONE_SNAPSHOT_TAG = 'milestones'
+MILESTONE_SNAPSHOT_KEY = 'milestones:snapshot:{version}'
+
+# Safety net in case a change slips past the signals (e.g. raw SQL updates)
+MILESTONE_SNAPSHOT_TIMEOUT = 600
+
+DEFAULT_BACKGROUND_STYLE = "background: linear-gradient(135deg, #4e73df 0%, #224abe 100%);"
+
+# Banner colours for milestones coming from the strategy roadmap
+STRATEGY_BACKGROUND_STYLES = {
+    'arcade': "background: linear-gradient(135deg, #1cc88a 0%, #13855c 100%);",
+    'theme_park': "background: linear-gradient(135deg, #f6c23e 0%, #dda20a 100%);",
+}
+
+# Banner colours for milestones coming from game projects
+GAME_BACKGROUND_STYLES = {
+    'indie_dev': DEFAULT_BACKGROUND_STYLE,
+    'arcade': "background: linear-gradient(135deg, #1cc88a 0%, #13855c 100%);",
+    'theme_park': "background: linear-gradient(135deg, #6f42c1 0%, #4e2c8e 100%);",
+}
+
+
+def get_snapshot_version():
+    """Return the current snapshot version (the version of the 'milestones' tag)"""
+    return tag_version(MILESTONE_SNAPSHOT_TAG)
+
+
+def bump_snapshot_version():
+    """Invalidate the cached snapshot by moving to a new version"""
+    invalidate_tags(MILESTONE_SNAPSHOT_TAG)
+
+
+def _milestone_data(milestone, **extra):
+    return {'id': milestone.id, 'title': milestone.title, 'status': milestone.status, **extra}
+
+
+def _phase_data(phase_id, name, phase_type, order):
+    return {'id': phase_id, 'name': name, 'phase_type': phase_type, 'order': order}
+
+
+def compute_milestone_snapshot():
+    """
+    Work out the current milestone and company phase from the database.
+
+    Strategy milestones take precedence, then in-progress game milestones,
+    then the milestone of the first in-progress game task.
+    """
+    from strategy.models import StrategyMilestone
+    from projects.game_models import GameMilestone, GameTask
+    from .context_processors import get_phase_for_milestone
+
+    snapshot = {
+        'strategy_milestone': None,
+        'strategy_phase': None,
+        'milestone_title': 'Release First Indie Game',
+        'game_title': 'PeacefulFarm',
+        'phase_name': 'Indie Game Development',
+        'phase_type': 'indie_dev',
+        'phase_order': 1,
+        'background_style': DEFAULT_BACKGROUND_STYLE,
+        'in_progress_milestone': None,
+        'computed_at': time.time(),
+    }
+
+    strategy_milestone = (
+        StrategyMilestone.objects.filter(status='in_progress')
+        .select_related('phase')
+        .first()
+    )
+    if strategy_milestone is not None:
+        phase = strategy_milestone.phase
+        milestone_data = _milestone_data(strategy_milestone, phase_id=strategy_milestone.phase_id)
+        snapshot.update({
+            'strategy_milestone': milestone_data,
+            'strategy_phase': _phase_data(phase.id, phase.name, phase.phase_type, phase.order),
+            'milestone_title': strategy_milestone.title,
+            'game_title': 'Strategy',
+            'phase_name': phase.name,
+            'phase_type': phase.phase_type,
+            'phase_order': phase.order,
+            'background_style': STRATEGY_BACKGROUND_STYLES.get(phase.phase_type, DEFAULT_BACKGROUND_STYLE),
+            'in_progress_milestone': milestone_data,
+        })
+        return snapshot
+
+    game_milestone = (
+        GameMilestone.objects.filter(status='in_progress')
+        .select_related('game')
+        .first()
+    )
+    if game_milestone is not None:
+        snapshot['milestone_title'] = game_milestone.title
+        snapshot['game_title'] = game_milestone.game.title
+        snapshot['in_progress_milestone'] = _milestone_data(game_milestone)
+        phase_info = get_phase_for_milestone(game_milestone.title)
+    else:
+        phase_info = None
+        task = (
+            GameTask.objects.filter(status='in_progress')
+            .select_related('milestone', 'game')
+            .first()
+        )
+        if task is not None and task.milestone is not None:
+            snapshot['milestone_title'] = task.milestone.title
+            snapshot['game_title'] = task.game.title if task.game else 'Unknown Game'
+            phase_info = get_phase_for_milestone(task.milestone.title)
+        elif task is not None and task.company_section == 'arcade':
+            phase_info = {'name': 'Arcade Machine Development', 'phase_type': 'arcade', 'order': 2}
+
+    if phase_info is not None:
+        snapshot['phase_name'] = phase_info['name']
+        snapshot['phase_type'] = phase_info['phase_type']
+        snapshot['phase_order'] = phase_info['order']
+
+    snapshot['background_style'] = GAME_BACKGROUND_STYLES.get(snapshot['phase_type'], DEFAULT_BACKGROUND_STYLE)
+    return snapshot
+
+
+def get_milestone_snapshot(request=None):
+    """
+    Return the current milestone snapshot, computing it on a cache miss.
+    When a request is given the snapshot is memoised on it, so every
+    context processor in the same render shares one cache read.
+    """
+    if request is not None and hasattr(request, '_milestone_snapshot'):
+        return request._milestone_snapshot
+
+    key = MILESTONE_SNAPSHOT_KEY.format(version=get_snapshot_version())
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = compute_milestone_snapshot()
+        cache.set(key, snapshot, MILESTONE_SNAPSHOT_TIMEOUT)
+
+    if request is not None:
+        request._milestone_snapshot = snapshot
+    return snapshot
@@ -38,3 +38,38 @@ def get_task_type_for_model(model_instance):
     }
     
     return model_to_type.get(model_name, 'r1d3')  # Default to r1d3 if not found
+
+
+def get_section_task_model_map():
+    """
+    Returns a mapping of section keys to every task model shown on the
+    cross-section dashboards, including Indie News and the legacy GameTask.
+    """
+    from projects.task_models import (
+        R1D3Task, GameDevelopmentTask, EducationTask,
+        SocialMediaTask, ArcadeTask, ThemeParkTask
+    )
+    from projects.game_models import GameTask
+    from indie_news.models import IndieNewsTask
+
+    return {
+        'r1d3': R1D3Task,
+        'game_development': GameDevelopmentTask,
+        'education': EducationTask,
+        'social_media': SocialMediaTask,
+        'arcade': ArcadeTask,
+        'theme_park': ThemeParkTask,
+        'indie_news': IndieNewsTask,
+        'game': GameTask,
+    }
+
+
+def get_section_for_model(model):
+    """
+    Returns the section key for a task model class, or None if the model
+    is not one of the cross-section task models.
+    """
+    for section, section_model in get_section_task_model_map().items():
+        if section_model is model:
+            return section
+    return None
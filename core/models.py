@@ -1,6 +1,10 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import URLValidator
+from django.utils import timezone
 
 
 class TimeStampedModel(models.Model):
@@ -44,3 +48,247 @@ class Profile(TimeStampedModel):
     
     def __str__(self):
         return f"{self.user.username}'s Profile"
+
+
+class TaskIndex(models.Model):
+    """
+    Denormalized row for every task across all company sections.
+    Kept in sync by signals (see core.signals) so cross-section dashboards
+    can filter, sort, count and paginate with a single query.
+    """
+    SECTION_CHOICES = [
+        ('r1d3', 'R1D3'),
+        ('game_development', 'Game Development'),
+        ('education', 'Education'),
+        ('social_media', 'Social Media'),
+        ('arcade', 'Arcade'),
+        ('theme_park', 'Theme Park'),
+        ('indie_news', 'Indie News'),
+        ('game', 'Game (legacy)'),
+    ]
+
+    STATUS_CHOICES = [
+        ('backlog', 'Backlog'),
+        ('to_do', 'To Do'),
+        ('in_progress', 'In Progress'),
+        ('in_review', 'In Review'),
+        ('done', 'Done'),
+        ('blocked', 'Blocked'),
+    ]
+
+    PRIORITY_CHOICES = [
+        ('low', 'Low'),
+        ('medium', 'Medium'),
+        ('high', 'High'),
+        ('critical', 'Critical'),
+    ]
+
+    # Source task reference
+    section = models.CharField(max_length=30, choices=SECTION_CHOICES)
+    task_id = models.PositiveIntegerField()
+    # Only set for legacy GameTask rows, which carry their own section field
+    company_section = models.CharField(max_length=30, blank=True, default='')
+
+    # Mirrored task fields
+    title = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES)
+    due_date = models.DateField(null=True, blank=True)
+    assigned_to = models.ForeignKey(
+        User, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='+'
+    )
+    assigned_to_name = models.CharField(max_length=100, blank=True, default='')
+    epic = models.ForeignKey(
+        'projects.Epic', on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Task Index Entry'
+        verbose_name_plural = 'Task Index'
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'task_id'], name='core_taskindex_unique_task'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='core_taskidx_status_created'),
+            models.Index(fields=['section', 'status'], name='core_taskidx_section_status'),
+            models.Index(fields=['assigned_to', 'status'], name='core_taskidx_assignee_status'),
+            models.Index(fields=['due_date', 'status'], name='core_taskidx_due_status'),
+            models.Index(fields=['epic', 'status'], name='core_taskidx_epic_status'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.section} #{self.task_id})"
+
+    @property
+    def task_type(self):
+        """Task type key used by the task detail/update/delete URLs"""
+        return self.section
+
+    def is_overdue(self):
+        if self.due_date and self.status not in ['done', 'blocked']:
+            return self.due_date < timezone.now().date()
+        return False
+
+    def get_task(self):
+        """Load the source task instance this entry mirrors"""
+        from .model_utils import get_section_task_model_map
+
+        model = get_section_task_model_map().get(self.section)
+        if model is None:
+            return None
+        return model.objects.filter(pk=self.task_id).first()
+
+
+class TaskBulkEdit(models.Model):
+    """
+    Audit record of one bulk edit: the tasks of a section that were changed
+    together and the field values they were given. Written by core.bulk_edit.
+    """
+    section = models.CharField(max_length=50)
+    task_ids = models.JSONField(default=list)
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    updated_count = models.PositiveIntegerField(default=0)
+    edited_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='task_bulk_edits'
+    )
+    # Text-based for Git sync, like the task *_name fields
+    edited_by_name = models.CharField(max_length=100, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Task Bulk Edit'
+        verbose_name_plural = 'Task Bulk Edits'
+
+    def __str__(self):
+        return f"{self.updated_count} {self.section} tasks: {', '.join(self.changes)}"
+
+
+class Job(models.Model):
+    """
+    A unit of background work run by `manage.py run_workers`.
+    Created with core.jobs.enqueue; the handler registered under name is
+    called with kwargs and reports progress on this row.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_CANCELLED, 'Cancelled'),
+    ]
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_CANCELLED)
+
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)
+    progress_message = models.CharField(max_length=255, blank=True, default='')
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True, default='')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    # Not picked up before this time; pushed back between retries
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True, default='')
+    # Set by core.job_queue.cancel_job; running handlers stop at their next check
+    cancel_requested = models.BooleanField(default=False)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Heartbeat: bumped on every progress report
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='core_job_status_run_after'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
+
+
+def new_change_id():
+    return uuid.uuid4().hex
+
+
+class ChangeLogEntry(models.Model):
+    """
+    One captured insert/update or delete of a synced row (see core.change_log).
+    Local changes are recorded by signal handlers and exported in changesets;
+    changes replayed from another machine keep their change_id and origin,
+    so replaying the same changeset twice does nothing.
+    """
+    ACTION_SAVE = 'save'
+    ACTION_DELETE = 'delete'
+    ACTION_CHOICES = [
+        (ACTION_SAVE, 'Save'),
+        (ACTION_DELETE, 'Delete'),
+    ]
+
+    change_id = models.CharField(max_length=32, unique=True, default=new_change_id)
+    # SYNC_NODE_ID of the machine the change was made on
+    origin = models.CharField(max_length=100)
+    model = models.CharField(max_length=100)
+    object_pk = models.CharField(max_length=64)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # Last-writer-wins clock: the row's updated_at, or when it was deleted
+    changed_at = models.DateTimeField()
+    data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    exported = models.BooleanField(default=False)
+    recorded_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['pk']
+        indexes = [
+            models.Index(fields=['model', 'object_pk', 'changed_at'], name='core_changelog_object'),
+            models.Index(fields=['origin', 'exported'], name='core_changelog_pending'),
+        ]
+        verbose_name = 'Change Log Entry'
+        verbose_name_plural = 'Change Log Entries'
+
+    def __str__(self):
+        return f"{self.action} {self.model}#{self.object_pk} from {self.origin}"
+
+
+class SyncedChangeset(models.Model):
+    """A changeset file this machine exported or applied"""
+    DIRECTION_EXPORTED = 'exported'
+    DIRECTION_APPLIED = 'applied'
+    DIRECTION_CHOICES = [
+        (DIRECTION_EXPORTED, 'Exported'),
+        (DIRECTION_APPLIED, 'Applied'),
+    ]
+
+    name = models.CharField(max_length=255, unique=True)
+    direction = models.CharField(max_length=10, choices=DIRECTION_CHOICES)
+    entries = models.PositiveIntegerField(default=0)
+    # Entries that changed a row here; the rest were duplicates or lost to a newer local change
+    applied = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.direction})"
@@ -0,0 +1,301 @@
+"""
+Full-text search indexes backed by the database's own search engine.
+
+On SQLite a FullTextIndex is an FTS5 virtual table whose rowid is the key
+of the indexed object. On PostgreSQL it is a plain table with a weighted
+tsvector column and a GIN index. Other databases are not supported; there
+search() returns None and callers fall back to icontains filtering.
+
+Indexes are created by migrations and kept current by signal handlers
+(see core.signals), so searching never scans the source tables.
+
+search() returns the top hits on their own, for type-ahead suggestions.
+filter() applies the search to a queryset of the indexed objects, so the
+caller's other filters, the ranking and the paging all run in one SQL
+query over every match, and snippets() highlights just the shown page.
+"""
+import re
+from collections import namedtuple
+from html import unescape
+
+from django.db import connection, connections
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SearchHit = namedtuple('SearchHit', ['key', 'rank', 'snippet'])
+
+# Private-use characters mark matches inside snippets until they are escaped
+_MATCH_START = '\ue000'
+_MATCH_END = '\ue001'
+
+# PostgreSQL tsvector weight labels, highest first
+_PG_WEIGHT_LABELS = 'ABCD'
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Matches only HTML tags, for indexing rich text as plain text
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def search_terms(query):
+    """Split a user query into lowercase word terms, dropping punctuation"""
+    return _TERM_RE.findall((query or '').lower())
+
+
+def strip_html(value):
+    """Plain text of an HTML fragment, for indexing"""
+    return ' '.join(unescape(_TAG_RE.sub(' ', value or '')).split())
+
+
+def highlight(snippet):
+    """Escape a raw snippet and wrap its matched terms in <mark> tags"""
+    if not snippet:
+        return ''
+    html = escape(snippet).replace(_MATCH_START, '<mark>').replace(_MATCH_END, '</mark>')
+    return mark_safe(html)
+
+
+class FullTextIndex:
+    """
+    A full-text index over a fixed list of text columns.
+
+    columns is a sequence of (name, weight) pairs; higher weights rank
+    matches in that column higher. Keys are positive integers, normally
+    the primary key of the object each row describes.
+    """
+
+    def __init__(self, table, columns, snippet_words=12):
+        self.table = table
+        self.columns = list(columns)
+        self.snippet_words = snippet_words
+
+    @property
+    def column_names(self):
+        return [name for name, weight in self.columns]
+
+    def is_supported(self, conn=None):
+        return (conn or connection).vendor in ('sqlite', 'postgresql')
+
+    # Schema
+
+    def create(self, conn=None):
+        """Create the index table; a no-op on unsupported databases"""
+        conn = conn or connection
+        if not self.is_supported(conn):
+            return
+        qn = conn.ops.quote_name
+        with conn.cursor() as cursor:
+            if conn.vendor == 'sqlite':
+                columns = ', '.join(qn(name) for name in self.column_names)
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {qn(self.table)} USING fts5("
+                    f"{columns}, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            else:
+                columns = ', '.join(f"{qn(name)} text NOT NULL DEFAULT ''" for name in self.column_names)
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {qn(self.table)} ("
+                    f"key bigint PRIMARY KEY, {columns}, "
+                    f"document tsvector GENERATED ALWAYS AS ({self._pg_document(conn)}) STORED)"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {qn(self.table + '_document')} "
+                    f"ON {qn(self.table)} USING GIN (document)"
+                )
+
+    def drop(self, conn=None):
+        conn = conn or connection
+        if not self.is_supported(conn):
+            return
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {conn.ops.quote_name(self.table)}")
+
+    def _pg_document(self, conn):
+        # Weights are bucketed into PostgreSQL's four labels by rank order
+        ordered = sorted(self.columns, key=lambda column: -column[1])
+        labels = {name: _PG_WEIGHT_LABELS[min(i, 3)] for i, (name, weight) in enumerate(ordered)}
+        return ' || '.join(
+            f"setweight(to_tsvector('simple', coalesce({conn.ops.quote_name(name)}, '')), '{labels[name]}')"
+            for name in self.column_names
+        )
+
+    # Writes
+
+    def update(self, key, values, conn=None):
+        """Insert or replace the row for key; values maps column name to text"""
+        self.update_many([(key, values)], conn)
+
+    def update_many(self, rows, conn=None):
+        """Insert or replace many (key, values) rows in one round of statements"""
+        conn = conn or connection
+        rows = list(rows)
+        if not self.is_supported(conn) or not rows:
+            return
+        qn = conn.ops.quote_name
+        names = self.column_names
+        params = [[key] + [values.get(name) or '' for name in names] for key, values in rows]
+        placeholders = ', '.join(['%s'] * (len(names) + 1))
+        with conn.cursor() as cursor:
+            if conn.vendor == 'sqlite':
+                self.delete_many([key for key, values in rows], conn)
+                cursor.executemany(
+                    f"INSERT INTO {qn(self.table)} (rowid, {', '.join(qn(n) for n in names)}) "
+                    f"VALUES ({placeholders})",
+                    params,
+                )
+            else:
+                updates = ', '.join(f"{qn(n)} = EXCLUDED.{qn(n)}" for n in names)
+                cursor.executemany(
+                    f"INSERT INTO {qn(self.table)} (key, {', '.join(qn(n) for n in names)}) "
+                    f"VALUES ({placeholders}) ON CONFLICT (key) DO UPDATE SET {updates}",
+                    params,
+                )
+
+    def delete(self, key, conn=None):
+        self.delete_many([key], conn)
+
+    def delete_many(self, keys, conn=None):
+        conn = conn or connection
+        keys = list(keys)
+        if not self.is_supported(conn) or not keys:
+            return
+        key_column = 'rowid' if conn.vendor == 'sqlite' else 'key'
+        placeholders = ', '.join(['%s'] * len(keys))
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {conn.ops.quote_name(self.table)} WHERE {key_column} IN ({placeholders})",
+                keys,
+            )
+
+    def clear(self, conn=None):
+        conn = conn or connection
+        if not self.is_supported(conn):
+            return
+        with conn.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {conn.ops.quote_name(self.table)}")
+
+    # Queries
+
+    def search(self, query, limit=50, prefix=True, conn=None):
+        """
+        Return up to limit SearchHits for query, best match first, or None
+        when the database has no full-text support.
+
+        Every term must match. With prefix=True the last term also matches
+        longer words, so partially typed queries find results.
+        """
+        conn = conn or connection
+        if not self.is_supported(conn):
+            return None
+        terms = search_terms(query)
+        if not terms:
+            return []
+        if conn.vendor == 'sqlite':
+            rows = self._search_sqlite(conn, terms, limit, prefix)
+        else:
+            rows = self._search_postgresql(conn, terms, limit, prefix)
+        return [SearchHit(key, rank, highlight(snippet)) for key, rank, snippet in rows]
+
+    def filter(self, queryset, query, prefix=True):
+        """
+        Restrict a queryset of the indexed objects (keyed by primary key) to
+        those matching query, annotated with search_rank and ordered best
+        match first. Returns None when the database has no full-text support.
+        """
+        conn = connections[queryset.db]
+        if not self.is_supported(conn):
+            return None
+        terms = search_terms(query)
+        if not terms:
+            return queryset.none()
+        qn = conn.ops.quote_name
+        table = qn(self.table)
+        outer_pk = f'{qn(queryset.model._meta.db_table)}.{qn(queryset.model._meta.pk.column)}'
+        if conn.vendor == 'sqlite':
+            match = self._sqlite_match(terms, prefix)
+            weights = ', '.join(str(float(weight)) for name, weight in self.columns)
+            matches = RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [match])
+            # bm25() is lower for better matches; negate so higher ranks first
+            rank = RawSQL(
+                f"SELECT -bm25({table}, {weights}) FROM {table} "
+                f"WHERE {table} MATCH %s AND {table}.rowid = {outer_pk}",
+                [match],
+            )
+        else:
+            tsquery = self._pg_tsquery(terms, prefix)
+            matches = RawSQL(f"SELECT key FROM {table} WHERE document @@ to_tsquery('simple', %s)", [tsquery])
+            rank = RawSQL(
+                f"SELECT ts_rank_cd(document, to_tsquery('simple', %s)) FROM {table} "
+                f"WHERE {table}.key = {outer_pk}",
+                [tsquery],
+            )
+        return queryset.filter(pk__in=matches).annotate(search_rank=rank).order_by('-search_rank', 'pk')
+
+    def snippets(self, query, keys, prefix=True, conn=None):
+        """{key: highlighted snippet} for the given keys' matches of query"""
+        conn = conn or connection
+        keys = list(keys)
+        terms = search_terms(query)
+        if not self.is_supported(conn) or not terms or not keys:
+            return {}
+        qn = conn.ops.quote_name
+        table = qn(self.table)
+        placeholders = ', '.join(['%s'] * len(keys))
+        with conn.cursor() as cursor:
+            if conn.vendor == 'sqlite':
+                cursor.execute(
+                    f"SELECT rowid, snippet({table}, -1, %s, %s, %s, %s) FROM {table} "
+                    f"WHERE {table} MATCH %s AND rowid IN ({placeholders})",
+                    [_MATCH_START, _MATCH_END, '…', self.snippet_words, self._sqlite_match(terms, prefix), *keys],
+                )
+            else:
+                text = " || ' ' || ".join(qn(name) for name in self.column_names)
+                cursor.execute(
+                    f"SELECT key, ts_headline('simple', {text}, to_tsquery('simple', %s), %s) FROM {table} "
+                    f"WHERE key IN ({placeholders})",
+                    [self._pg_tsquery(terms, prefix), self._pg_headline_options(), *keys],
+                )
+            return {key: highlight(snippet) for key, snippet in cursor.fetchall()}
+
+    def _sqlite_match(self, terms, prefix):
+        match = ' '.join(f'"{term}"' for term in terms)
+        return match + '*' if prefix else match
+
+    def _pg_tsquery(self, terms, prefix):
+        tsquery_terms = list(terms)
+        if prefix:
+            tsquery_terms[-1] += ':*'
+        return ' & '.join(tsquery_terms)
+
+    def _pg_headline_options(self):
+        return f'StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxWords={self.snippet_words}, MinWords=5'
+
+    def _search_sqlite(self, conn, terms, limit, prefix):
+        qn = conn.ops.quote_name
+        table = qn(self.table)
+        weights = ', '.join(str(float(weight)) for name, weight in self.columns)
+        with conn.cursor() as cursor:
+            # bm25() is lower for better matches; negate so higher ranks first
+            cursor.execute(
+                f"SELECT rowid, -bm25({table}, {weights}) AS score, "
+                f"snippet({table}, -1, %s, %s, %s, %s) "
+                f"FROM {table} WHERE {table} MATCH %s ORDER BY score DESC LIMIT %s",
+                [_MATCH_START, _MATCH_END, '…', self.snippet_words, self._sqlite_match(terms, prefix), limit],
+            )
+            return cursor.fetchall()
+
+    def _search_postgresql(self, conn, terms, limit, prefix):
+        qn = conn.ops.quote_name
+        text = " || ' ' || ".join(qn(name) for name in self.column_names)
+        with conn.cursor() as cursor:
+            # Rank first, then build headlines for the returned rows only
+            cursor.execute(
+                f"SELECT hits.key, hits.score, ts_headline('simple', hits.body, hits.query, %s) "
+                f"FROM (SELECT key, ts_rank_cd(document, query) AS score, {text} AS body, query "
+                f"FROM {qn(self.table)}, to_tsquery('simple', %s) query "
+                f"WHERE document @@ query ORDER BY score DESC LIMIT %s) hits "
+                f"ORDER BY hits.score DESC",
+                [self._pg_headline_options(), self._pg_tsquery(terms, prefix), limit],
+            )
+            return cursor.fetchall()
@@ -0,0 +1,381 @@
+"""
+Signal handlers for the core app.
+"""
+from django.db.models.signals import m2m_changed, post_init, post_save, post_delete, pre_delete
+
+from .cache_tags import invalidate_tags, task_tags
+from .milestone_snapshot import bump_snapshot_version
+from .model_utils import get_section_task_model_map
+from .task_index import index_task, unindex_task
+
+
+def update_task_index(sender, instance, raw=False, **kwargs):
+    """Keep the TaskIndex entry in sync when a task is saved"""
+    if raw:
+        # Skip fixture loading; run rebuild_task_index afterwards instead
+        return
+    entry = index_task(instance)
+    if entry is not None:
+        invalidate_tags(*task_tags(entry.section))
+
+
+def remove_task_index(sender, instance, **kwargs):
+    """Drop the TaskIndex entry when a task is deleted"""
+    section = unindex_task(instance)
+    if section is not None:
+        invalidate_tags(*task_tags(section))
+
+
+def connect_task_signals():
+    """Connect the task handlers to every cross-section task model"""
+    for section, model in get_section_task_model_map().items():
+        post_save.connect(
+            update_task_index, sender=model,
+            dispatch_uid=f'core_task_index_save_{section}'
+        )
+        post_delete.connect(
+            remove_task_index, sender=model,
+            dispatch_uid=f'core_task_index_delete_{section}'
+        )
+
+
+def invalidate_milestone_snapshot(sender, instance, **kwargs):
+    """Bump the milestone snapshot version when a milestone or phase changes"""
+    bump_snapshot_version()
+
+
+def _game_task_milestone_state(instance):
+    # Read from __dict__ so deferred fields are never loaded just for this
+    return tuple(
+        instance.__dict__.get(field)
+        for field in ('status', 'milestone_id', 'company_section')
+    )
+
+
+def remember_game_task_state(sender, instance, **kwargs):
+    """Record the fields the milestone banner depends on when a GameTask loads"""
+    instance._milestone_state = _game_task_milestone_state(instance)
+
+
+def invalidate_milestone_snapshot_for_task(sender, instance, created=False, **kwargs):
+    """Bump the milestone snapshot version when a GameTask's status changes"""
+    state = _game_task_milestone_state(instance)
+    if created:
+        # A new task only matters to the banner once it is in progress
+        changed = instance.status == 'in_progress'
+    else:
+        changed = getattr(instance, '_milestone_state', None) != state
+    if changed:
+        bump_snapshot_version()
+    instance._milestone_state = state
+
+
+def invalidate_milestone_snapshot_for_deleted_task(sender, instance, **kwargs):
+    """Bump the milestone snapshot version when an in-progress GameTask is deleted"""
+    if instance.status == 'in_progress':
+        bump_snapshot_version()
+
+
+def connect_milestone_signals():
+    """Connect the milestone snapshot invalidation handlers"""
+    from strategy.models import StrategyMilestone, StrategyPhase
+    from projects.game_models import GameMilestone, GameTask
+
+    for model in (StrategyMilestone, StrategyPhase, GameMilestone):
+        post_save.connect(
+            invalidate_milestone_snapshot, sender=model,
+            dispatch_uid=f'core_milestone_snapshot_save_{model.__name__}'
+        )
+        post_delete.connect(
+            invalidate_milestone_snapshot, sender=model,
+            dispatch_uid=f'core_milestone_snapshot_delete_{model.__name__}'
+        )
+
+    post_init.connect(
+        remember_game_task_state, sender=GameTask,
+        dispatch_uid='core_milestone_snapshot_init_gametask'
+    )
+    post_save.connect(
+        invalidate_milestone_snapshot_for_task, sender=GameTask,
+        dispatch_uid='core_milestone_snapshot_save_gametask'
+    )
+    post_delete.connect(
+        invalidate_milestone_snapshot_for_deleted_task, sender=GameTask,
+        dispatch_uid='core_milestone_snapshot_delete_gametask'
+    )
+
+
+def invalidate_knowledge_base_tags(sender, instance, **kwargs):
+    """Invalidate cached Knowledge Base fragments when an article changes"""
+    invalidate_tags('kb', f'kb:article:{instance.pk}')
+
+
+def invalidate_knowledge_base_listing(sender, instance, **kwargs):
+    """Invalidate cached Knowledge Base listings when a category or tag changes"""
+    invalidate_tags('kb')
+
+
+def invalidate_game_stats(sender, instance, **kwargs):
+    """Invalidate a game's cached statistics when one of its assets or bugs changes"""
+    from projects.game_stats import game_stats_tag
+    invalidate_tags(game_stats_tag(instance.game_id))
+
+
+def connect_cache_tag_signals():
+    """Connect the cache tag invalidation handlers for non-task models"""
+    from education.knowledge.models import KnowledgeArticle, KnowledgeCategory, KnowledgeTag
+    from projects.game_models import GameAsset, GameBug
+
+    for signal in (post_save, post_delete):
+        signal.connect(
+            invalidate_knowledge_base_tags, sender=KnowledgeArticle,
+            dispatch_uid=f'core_cache_tags_kb_article_{signal is post_save}'
+        )
+        for model in (KnowledgeCategory, KnowledgeTag):
+            signal.connect(
+                invalidate_knowledge_base_listing, sender=model,
+                dispatch_uid=f'core_cache_tags_kb_{model.__name__}_{signal is post_save}'
+            )
+        for model in (GameAsset, GameBug):
+            signal.connect(
+                invalidate_game_stats, sender=model,
+                dispatch_uid=f'core_cache_tags_game_{model.__name__}_{signal is post_save}'
+            )
+
+
+def update_knowledge_search(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Refresh an article's Knowledge Base search entry when it is saved"""
+    if raw:
+        # Skip fixture loading; run rebuild_knowledge_search afterwards instead
+        return
+    from education.knowledge.search import INDEXED_FIELDS, index_article
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        # e.g. view count bumps
+        return
+    index_article(instance)
+
+
+def remove_knowledge_search(sender, instance, **kwargs):
+    """Drop an article's Knowledge Base search entry when it is deleted"""
+    from education.knowledge.search import unindex_article
+    unindex_article(instance)
+
+
+def connect_search_signals():
+    """Connect the full-text search index handlers for non-task models"""
+    from education.knowledge.models import KnowledgeArticle
+
+    post_save.connect(
+        update_knowledge_search, sender=KnowledgeArticle,
+        dispatch_uid='core_search_kb_article_save'
+    )
+    post_delete.connect(
+        remove_knowledge_search, sender=KnowledgeArticle,
+        dispatch_uid='core_search_kb_article_delete'
+    )
+
+
+def refresh_related_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Refresh related articles after an article's text or visibility changes"""
+    if raw:
+        # Skip fixture loading; run rebuild_related_articles afterwards instead
+        return
+    from education.knowledge.related import schedule_related_refresh
+    from education.knowledge.search import INDEXED_FIELDS
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    schedule_related_refresh([instance.pk])
+
+
+def refresh_related_on_delete(sender, instance, **kwargs):
+    """Refresh the articles that listed a deleted article among their related ones"""
+    from education.knowledge.models import RelatedArticle
+    from education.knowledge.related import schedule_related_refresh
+    # Collected before the delete cascades away the rows that tell us
+    schedule_related_refresh(RelatedArticle.objects.filter(related=instance).values_list('article_id', flat=True))
+
+
+def refresh_related_on_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh related articles when an article's tags change"""
+    from education.knowledge.related import schedule_related_refresh
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_related_refresh([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        # Changed from the tag side: each article gained or lost the tag
+        schedule_related_refresh(pk_set)
+    elif action == 'pre_clear':
+        # pk_set is empty on clear, so collect the articles before they are detached
+        schedule_related_refresh(instance.articles.values_list('pk', flat=True))
+
+
+def connect_related_article_signals():
+    """Connect the handlers that keep the related-articles index current"""
+    from education.knowledge.models import KnowledgeArticle
+
+    post_save.connect(
+        refresh_related_on_save, sender=KnowledgeArticle,
+        dispatch_uid='core_related_kb_article_save'
+    )
+    pre_delete.connect(
+        refresh_related_on_delete, sender=KnowledgeArticle,
+        dispatch_uid='core_related_kb_article_delete'
+    )
+    m2m_changed.connect(
+        refresh_related_on_tags, sender=KnowledgeArticle.tags.through,
+        dispatch_uid='core_related_kb_article_tags'
+    )
+
+
+def _epic_task_state(instance):
+    # Read from __dict__ so deferred fields are never loaded just for this
+    return instance.__dict__.get('epic_id'), instance.__dict__.get('parent_task_id')
+
+
+def remember_epic_task_state(sender, instance, **kwargs):
+    """Record which epic a task counted towards when it loads"""
+    instance._epic_state = _epic_task_state(instance)
+
+
+def _refresh_epics_for_task(sender, instance, states):
+    from projects.epic_stats import refresh_epic_stats
+    epic_ids = {epic_id for epic_id, _ in states}
+    parent_ids = {parent_id for _, parent_id in states if parent_id is not None}
+    if parent_ids:
+        # Subtasks count towards their parent's epic
+        epic_ids.update(sender.objects.filter(pk__in=parent_ids).values_list('epic_id', flat=True))
+    epic_ids.discard(None)
+    if epic_ids:
+        refresh_epic_stats(epic_ids)
+
+
+def update_epic_stats(sender, instance, raw=False, **kwargs):
+    """Refresh the roll-ups of the epics a saved task counts (or counted) towards"""
+    if raw:
+        # Skip fixture loading; run rebuild_epic_stats afterwards instead
+        return
+    state = _epic_task_state(instance)
+    _refresh_epics_for_task(sender, instance, {state, getattr(instance, '_epic_state', state)})
+    instance._epic_state = state
+
+
+def update_epic_stats_for_deleted_task(sender, instance, origin=None, **kwargs):
+    """Refresh the roll-ups of the epic a deleted task counted towards"""
+    from projects.task_models import Epic
+    if isinstance(origin, Epic):
+        # The epic and its stats are being deleted too
+        return
+    _refresh_epics_for_task(sender, instance, {_epic_task_state(instance)})
+
+
+def create_epic_stats(sender, instance, created=False, raw=False, **kwargs):
+    """Start a new epic with empty roll-ups"""
+    if created and not raw:
+        from projects.task_models import EpicStats
+        EpicStats.objects.get_or_create(epic=instance)
+
+
+def connect_epic_stats_signals():
+    """Connect the handlers that keep EpicStats current"""
+    from projects.epic_stats import get_epic_task_models
+    from projects.task_models import Epic
+
+    post_save.connect(create_epic_stats, sender=Epic, dispatch_uid='core_epic_stats_epic_save')
+    for model in get_epic_task_models():
+        post_init.connect(
+            remember_epic_task_state, sender=model,
+            dispatch_uid=f'core_epic_stats_init_{model.__name__}'
+        )
+        post_save.connect(
+            update_epic_stats, sender=model,
+            dispatch_uid=f'core_epic_stats_save_{model.__name__}'
+        )
+        post_delete.connect(
+            update_epic_stats_for_deleted_task, sender=model,
+            dispatch_uid=f'core_epic_stats_delete_{model.__name__}'
+        )
+
+
+def schedule_course_pdf_render(sender, instance, raw=False, **kwargs):
+    """Pre-render the PDF of a course whose content changed"""
+    if raw:
+        return
+    from education.course.models import Course
+    from education.course.pdf_cache import schedule_course_pdf
+    schedule_course_pdf(instance.pk if isinstance(instance, Course) else instance.course_id)
+
+
+def schedule_course_pdf_render_for_deleted_row(sender, instance, origin=None, **kwargs):
+    """Pre-render the PDF of a course that lost a concept, topic, example or term"""
+    from education.course.models import Course
+    if isinstance(origin, Course):
+        # The whole course is being deleted
+        return
+    schedule_course_pdf_render(sender, instance)
+
+
+def delete_course_pdfs(sender, instance, **kwargs):
+    """Remove a deleted course's stored PDFs"""
+    from education.course.pdf_cache import delete_course_pdfs
+    delete_course_pdfs(instance.pk)
+
+
+def connect_course_pdf_signals():
+    """Connect the handlers that keep the pre-rendered course PDFs current"""
+    from education.course.models import (
+        AdvancedTopicSection, ConceptSection, Course, GlossaryTerm, PracticalExample,
+    )
+
+    post_save.connect(schedule_course_pdf_render, sender=Course, dispatch_uid='core_course_pdf_course_save')
+    post_delete.connect(delete_course_pdfs, sender=Course, dispatch_uid='core_course_pdf_course_delete')
+    for model in (ConceptSection, AdvancedTopicSection, PracticalExample, GlossaryTerm):
+        post_save.connect(
+            schedule_course_pdf_render, sender=model,
+            dispatch_uid=f'core_course_pdf_save_{model.__name__}'
+        )
+        post_delete.connect(
+            schedule_course_pdf_render_for_deleted_row, sender=model,
+            dispatch_uid=f'core_course_pdf_delete_{model.__name__}'
+        )
+
+
+def record_saved_row(sender, instance, raw=False, **kwargs):
+    """Capture an insert or update for database sync"""
+    if raw:
+        # Fixture loading and replayed changes
+        return
+    from .change_log import record_instance_change
+    record_instance_change(instance)
+
+
+def record_deleted_row(sender, instance, **kwargs):
+    """Capture a delete for database sync"""
+    from .change_log import record_instance_change
+    from .models import ChangeLogEntry
+    record_instance_change(instance, ChangeLogEntry.ACTION_DELETE)
+
+
+def record_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Capture the rows whose many-to-many values changed, e.g. an article's tags"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    from .change_log import record_changes, record_instance_change
+    if not reverse:
+        record_instance_change(instance)
+    elif pk_set:
+        record_changes(model._default_manager.filter(pk__in=pk_set))
+
+
+def connect_change_log_signals():
+    """Connect the handlers that record row changes for core.change_log"""
+    from .change_log import synced_models
+
+    models = synced_models()
+    for model in models:
+        post_save.connect(record_saved_row, sender=model, dispatch_uid=f'core_change_log_save_{model._meta.label}')
+        post_delete.connect(record_deleted_row, sender=model, dispatch_uid=f'core_change_log_delete_{model._meta.label}')
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                record_m2m_change, sender=field.remote_field.through,
+                dispatch_uid=f'core_change_log_m2m_{model._meta.label}_{field.name}'
+            )
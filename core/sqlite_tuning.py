@@ -0,0 +1,115 @@
+"""
+SQLite settings for running the site on a single database file.
+
+Every new SQLite connection gets the PRAGMAs of the SQLITE_PROFILE
+setting ('production' unless configured), merged with any SQLITE_PRAGMAS
+overrides (a pragma set to None is left at SQLite's default):
+
+    SQLITE_PROFILE = 'production'
+    SQLITE_PRAGMAS = {'mmap_size': 0}
+
+The production profile switches to write-ahead logging, so readers no
+longer block the writer, syncs on checkpoints rather than on every commit,
+and lets a writer wait for the lock instead of failing at once.
+
+Write transactions begin with BEGIN IMMEDIATE (the 'transaction_mode'
+database option in settings), so they take the write lock up front
+instead of failing with "database is locked" when a read turns into a
+write. Writes that still time out waiting for the lock are retried with
+backoff by functions decorated with @retry_on_locked.
+
+`manage.py benchmark_sqlite_writes` measures concurrent task updates with
+SQLite's defaults and with the production profile.
+"""
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.backends.signals import connection_created
+
+SQLITE_PROFILES = {
+    # SQLite's built-in behaviour: rollback journal, fsync on every commit
+    'default': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        # Negative sizes are KiB: a 64 MiB page cache per connection
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+
+DEFAULT_PROFILE = 'production'
+DEFAULT_WRITE_RETRIES = 5
+DEFAULT_RETRY_DELAY = 0.05
+
+LOCKED_MESSAGES = ('database is locked', 'database table is locked', 'database schema is locked')
+
+
+def sqlite_pragmas():
+    """The PRAGMAs applied to new connections, as {name: value}"""
+    name = getattr(settings, 'SQLITE_PROFILE', DEFAULT_PROFILE)
+    if name not in SQLITE_PROFILES:
+        raise ValueError(f'Unknown SQLITE_PROFILE {name!r}; choose one of {sorted(SQLITE_PROFILES)}')
+    pragmas = {**SQLITE_PROFILES[name], **getattr(settings, 'SQLITE_PRAGMAS', {})}
+    return {pragma: value for pragma, value in pragmas.items() if value is not None}
+
+
+def apply_sqlite_pragmas(sender=None, connection=None, **kwargs):
+    """connection_created handler configuring SQLite connections"""
+    if connection is None or connection.vendor != 'sqlite':
+        return
+    pragmas = sqlite_pragmas()
+    for pragma, value in pragmas.items():
+        if not pragma.isidentifier() or not (isinstance(value, int) or str(value).isidentifier()):
+            raise ValueError(f'Invalid SQLite pragma {pragma}={value!r}')
+    with connection.cursor() as cursor:
+        for pragma, value in pragmas.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+def connect_sqlite_tuning():
+    connection_created.connect(apply_sqlite_pragmas, dispatch_uid='core.sqlite_tuning')
+
+
+def is_locked_error(error):
+    return isinstance(error, OperationalError) and any(message in str(error) for message in LOCKED_MESSAGES)
+
+
+def retry_on_locked(func=None, *, using=DEFAULT_DB_ALIAS, attempts=None, delay=None):
+    """
+    Retry the decorated function when SQLite reports the database locked,
+    waiting delay, 2 * delay, 4 * delay, ... (with jitter) between attempts.
+
+    Only the outermost transaction is retried: inside an atomic block the
+    error propagates so the block is rolled back as a whole.
+
+    Args:
+        using: The database alias the function writes to
+        attempts: Calls before giving up (SQLITE_WRITE_RETRIES by default)
+        delay: First wait in seconds (SQLITE_RETRY_DELAY by default)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            max_attempts = attempts or getattr(settings, 'SQLITE_WRITE_RETRIES', DEFAULT_WRITE_RETRIES)
+            first_delay = getattr(settings, 'SQLITE_RETRY_DELAY', DEFAULT_RETRY_DELAY) if delay is None else delay
+            attempt = 1
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as e:
+                    if (not is_locked_error(e) or attempt >= max_attempts
+                            or connections[using].in_atomic_block):
+                        raise
+                time.sleep(first_delay * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+                attempt += 1
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -1,60 +1,143 @@
 import json
+from collections import namedtuple
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
 from projects.task_models import SubTask
 
-def handle_subtasks(request, task_instance):
+from .change_log import record_changes
+
+# Subtasks affected by a sync, as lists of SubTask instances
+SubtaskChanges = namedtuple('SubtaskChanges', ['created', 'updated', 'deleted', 'unchanged'])
+
+
+def parse_subtask_data(subtask_data_list):
     """
-    Process subtasks from form submission and save them to the database.
-    Updates existing subtasks and adds new ones from the form.
-    
-    Args:
-        request: The HTTP request containing form data
-        task_instance: The task model instance to associate subtasks with
+    Parse the JSON subtask entries posted by the task forms.
+
+    Returns a list of dicts with id (or None), title and is_completed,
+    skipping invalid JSON and empty titles.
     """
-    # Get the content type for the task instance
-    content_type = ContentType.objects.get_for_model(task_instance.__class__)
-    
-    # Get existing subtasks for this task
-    existing_subtasks = SubTask.objects.filter(
-        content_type=content_type,
-        object_id=task_instance.id
-    )
-    
-    # If has_subtasks is False, delete any existing subtasks and return
-    if not task_instance.has_subtasks:
-        existing_subtasks.delete()
-        return
-    
-    # Get subtask data from the form
-    subtask_data_list = request.POST.getlist('subtasks')
-    
-    # First, let's delete all existing subtasks and recreate them
-    # This is the simplest way to handle title changes
-    existing_subtasks.delete()
-    
-    # Process each subtask from the form
+    subtasks = []
     for subtask_json in subtask_data_list:
         if not subtask_json:
             continue
-            
         try:
             subtask_data = json.loads(subtask_json)
-            title = subtask_data.get('title', '').strip()
-            completed = subtask_data.get('is_completed', subtask_data.get('completed', False))
-            
-            # Skip empty subtasks
-            if not title:
-                continue
-                
-            # Create the subtask
-            SubTask.objects.create(
-                content_type=content_type,
-                object_id=task_instance.id,
-                title=title,
-                is_completed=completed
-            )
-            print(f"Created/updated subtask: {title}, is_completed: {completed}")
-            
         except json.JSONDecodeError:
             # Skip invalid JSON
             continue
+        if not isinstance(subtask_data, dict):
+            continue
+
+        title = str(subtask_data.get('title', '')).strip()
+        if not title:
+            continue
+
+        subtask_id = subtask_data.get('id')
+        try:
+            subtask_id = int(subtask_id) if subtask_id not in (None, '') else None
+        except (TypeError, ValueError):
+            subtask_id = None
+
+        subtasks.append({
+            'id': subtask_id,
+            'title': title,
+            'is_completed': bool(subtask_data.get('is_completed', subtask_data.get('completed', False))),
+        })
+    return subtasks
+
+
+def sync_subtasks(task_instance, submitted):
+    """
+    Make a task's subtasks match the submitted list with the fewest writes.
+
+    Submitted subtasks are matched to existing ones by id, then by title, so
+    existing subtasks keep their ids. Unmatched submissions are created in
+    one bulk_create, changed ones saved in one bulk_update, and the rest
+    removed in one delete, all in a single transaction.
+
+    Args:
+        task_instance: The task model instance the subtasks belong to
+        submitted: Dicts with id (optional), title and is_completed
+
+    Returns:
+        SubtaskChanges listing the created, updated, deleted and unchanged subtasks
+    """
+    content_type = ContentType.objects.get_for_model(task_instance.__class__)
+
+    with transaction.atomic():
+        existing = list(
+            SubTask.objects.select_for_update()
+            .filter(content_type=content_type, object_id=task_instance.id)
+            .order_by('created_at', 'id')
+        )
+        by_id = {subtask.id: subtask for subtask in existing}
+        by_title = {}
+        for subtask in existing:
+            by_title.setdefault(subtask.title, []).append(subtask)
+
+        def claim(subtask):
+            del by_id[subtask.id]
+            by_title[subtask.title].remove(subtask)
+            return subtask
+
+        # Match by id first so renamed subtasks keep their ids
+        matches = []
+        for data in submitted:
+            subtask = by_id.get(data.get('id'))
+            matches.append(claim(subtask) if subtask is not None else None)
+        for index, data in enumerate(submitted):
+            if matches[index] is None and by_title.get(data['title']):
+                matches[index] = claim(by_title[data['title']][0])
+
+        now = timezone.now()
+        created, updated, unchanged = [], [], []
+        for data, subtask in zip(submitted, matches):
+            if subtask is None:
+                created.append(SubTask(
+                    content_type=content_type,
+                    object_id=task_instance.id,
+                    title=data['title'],
+                    is_completed=data['is_completed'],
+                ))
+            elif (subtask.title, subtask.is_completed) != (data['title'], data['is_completed']):
+                subtask.title = data['title']
+                subtask.is_completed = data['is_completed']
+                # bulk_update skips auto_now
+                subtask.updated_at = now
+                updated.append(subtask)
+            else:
+                unchanged.append(subtask)
+        deleted = list(by_id.values())
+
+        if deleted:
+            SubTask.objects.filter(id__in=[subtask.id for subtask in deleted]).delete()
+        if updated:
+            SubTask.objects.bulk_update(updated, ['title', 'is_completed', 'updated_at'])
+        if created:
+            SubTask.objects.bulk_create(created)
+        if updated or created:
+            record_changes(updated + created)
+
+    return SubtaskChanges(created, updated, deleted, unchanged)
+
+
+def handle_subtasks(request, task_instance):
+    """
+    Process subtasks from form submission and save them to the database.
+    Updates existing subtasks and adds new ones from the form.
+
+    Args:
+        request: The HTTP request containing form data
+        task_instance: The task model instance to associate subtasks with
+
+    Returns:
+        SubtaskChanges summarising what was written
+    """
+    # If has_subtasks is False, remove any existing subtasks
+    if not task_instance.has_subtasks:
+        return sync_subtasks(task_instance, [])
+
+    return sync_subtasks(task_instance, parse_subtask_data(request.POST.getlist('subtasks')))
@@ -1,10 +1,44 @@
 """
 Git Database Sync Views for R1D3 Project
 """
+from datetime import timedelta
+
+from django.conf import settings
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_http_methods
+from .db_digest import bucket_changes, digest_summary, get_database_digest
 from .git_sync import GitSyncManager
+from .job_queue import enqueue, job_payload
+from .jobs import FETCH_REMOTE_JOB, PULL_DATABASE_JOB, SYNC_DATABASE_JOB
+
+
+def _job_response(request, job):
+    """
+    The job's result once it has finished, otherwise a 202 with the URLs
+    to poll and cancel it. Git jobs share a lock, so the job may be
+    another user's sync that is still running.
+    """
+    job.refresh_from_db()
+    if job.created_by_id != request.user.pk and not request.user.is_staff:
+        return JsonResponse({
+            'success': False,
+            'message': 'Another database sync is already running. Try again when it finishes.',
+            'details': [],
+        }, status=409)
+    if job.is_finished:
+        payload = job_payload(job)
+        return JsonResponse(payload['result'] or {
+            'success': False, 'message': payload['error'], 'details': [], 'output': '',
+        })
+    return JsonResponse({
+        'job_id': job.pk,
+        'status_url': reverse('core:job_status', args=[job.pk]),
+        'cancel_url': reverse('core:job_cancel', args=[job.pk]),
+    }, status=202)
 
 
 @login_required
@@ -15,22 +49,28 @@ def sync_database(request):
     POST parameters:
     - commit_message: Optional message if there are local changes
     """
-    sync_manager = GitSyncManager()
     commit_message = request.POST.get('commit_message', '')
     
-    # Perform sync
-    result = sync_manager.sync_database(commit_message if commit_message else None)
-    
-    return JsonResponse(result)
+    # Git can take minutes; run the sync as a background job
+    job = enqueue(SYNC_DATABASE_JOB, user=request.user, commit_message=commit_message or None)
+    return _job_response(request, job)
 
 
 @login_required
 @require_http_methods(["GET"])
 def sync_status(request):
-    """Get current sync status"""
+    """
+    Get current sync status. The request never waits for the network:
+    when the last fetch is older than SYNC_FETCH_INTERVAL seconds, a
+    background job fetches so later checks see new remote commits.
+    """
     try:
         sync_manager = GitSyncManager()
         status = sync_manager.get_sync_status()
+        fetched_at = parse_datetime(status['fetched_at']) if status.get('fetched_at') else None
+        interval = timedelta(seconds=getattr(settings, 'SYNC_FETCH_INTERVAL', 300))
+        if fetched_at is None or timezone.now() - fetched_at > interval:
+            enqueue(FETCH_REMOTE_JOB, user=request.user, unique=True)
         return JsonResponse(status)
     except Exception as e:
         return JsonResponse({
@@ -44,11 +84,34 @@ def sync_status(request):
 @require_http_methods(["POST"])
 def pull_database(request):
     """Pull latest database changes only"""
-    sync_manager = GitSyncManager()
-    result = sync_manager.pull_latest()
-    
-    return JsonResponse({
-        'success': result['success'],
-        'message': 'Database pulled successfully' if result['success'] else f"Pull failed: {result['error']}",
-        'output': result['output']
-    })
+    job = enqueue(PULL_DATABASE_JOB, user=request.user)
+    return _job_response(request, job)
+
+
+@login_required
+@require_http_methods(["GET"])
+def sync_digest(request):
+    """
+    Checksum tree of the synced tables (see core.db_digest)
+    GET parameters:
+    - tables: Optional comma-separated tables to include bucket hashes for
+    """
+    tables = [label for label in request.GET.get('tables', '').split(',') if label]
+    return JsonResponse(digest_summary(get_database_digest(), tables))
+
+
+@login_required
+@require_http_methods(["GET"])
+def sync_digest_rows(request):
+    """
+    Rows of some buckets of a table, as changes for core.change_log.apply_changes
+    GET parameters:
+    - table: The table's model label, e.g. projects.gametask
+    - buckets: Comma-separated bucket numbers
+    """
+    try:
+        buckets = [int(bucket) for bucket in request.GET.get('buckets', '').split(',') if bucket]
+        changes = bucket_changes(request.GET.get('table', ''), buckets)
+    except (LookupError, ValueError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'changes': changes})
@@ -0,0 +1,132 @@
+"""
+Maintenance helpers for the denormalized TaskIndex table.
+
+The index mirrors the fields the cross-section dashboards filter and sort
+on, so those pages can run one SQL query instead of loading every task
+model into Python. Every entry also has a row in the task full-text
+search index (see core.task_search), keyed by the entry's id.
+"""
+from django.db import transaction
+
+from .cache_tags import invalidate_tags, task_tags
+from .models import TaskIndex
+from .model_utils import get_section_task_model_map, get_section_for_model
+from .task_search import TASK_SEARCH_INDEX, task_search_values
+
+# TaskIndex fields copied from the source task (see _index_values)
+INDEXED_FIELDS = [
+    'title', 'status', 'priority', 'due_date', 'assigned_to_id', 'assigned_to_name',
+    'epic_id', 'company_section', 'created_at', 'updated_at',
+]
+
+
+def _index_values(task):
+    """Build the TaskIndex field values for a task instance"""
+    return {
+        'title': (task.title or '')[:255],
+        'status': task.status,
+        'priority': task.priority,
+        'due_date': task.due_date,
+        'assigned_to_id': task.assigned_to_id,
+        'assigned_to_name': getattr(task, 'assigned_to_name', '') or '',
+        'epic_id': getattr(task, 'epic_id', None),
+        'company_section': getattr(task, 'company_section', '') or '',
+        'created_at': task.created_at,
+        'updated_at': task.updated_at,
+    }
+
+
+def index_task(task, section=None):
+    """Create or refresh the index and search entries for a single task"""
+    section = section or get_section_for_model(task.__class__)
+    if section is None:
+        return None
+    entry, _ = TaskIndex.objects.update_or_create(
+        section=section,
+        task_id=task.pk,
+        defaults=_index_values(task),
+    )
+    TASK_SEARCH_INDEX.update(entry.pk, task_search_values(task))
+    return entry
+
+
+def unindex_task(task, section=None):
+    """Remove the entries for a deleted task and return its section"""
+    section = section or get_section_for_model(task.__class__)
+    if section is None:
+        return None
+    entries = TaskIndex.objects.filter(section=section, task_id=task.pk)
+    TASK_SEARCH_INDEX.delete_many(entries.values_list('pk', flat=True))
+    entries.delete()
+    return section
+
+
+def reindex_tasks(model, task_ids):
+    """
+    Refresh the entries for the given ids of one task model.
+    Use this after QuerySet.update() or bulk_update(), which skip signals.
+    """
+    section = get_section_for_model(model)
+    if section is None:
+        return 0
+    task_ids = list(task_ids)
+    tasks = list(model.objects.filter(pk__in=task_ids))
+    with transaction.atomic():
+        # Update existing entries in place so their ids (the search keys) stay stable
+        entries = {
+            entry.task_id: entry
+            for entry in TaskIndex.objects.filter(section=section, task_id__in=task_ids)
+        }
+        tasks_by_id = {task.pk: task for task in tasks}
+        stale = [entry.pk for task_id, entry in entries.items() if task_id not in tasks_by_id]
+        changed, created = [], []
+        for task in tasks:
+            entry = entries.get(task.pk)
+            if entry is None:
+                created.append(TaskIndex(section=section, task_id=task.pk, **_index_values(task)))
+            else:
+                for field, value in _index_values(task).items():
+                    setattr(entry, field, value)
+                changed.append(entry)
+
+        TaskIndex.objects.filter(pk__in=stale).delete()
+        TASK_SEARCH_INDEX.delete_many(stale)
+        TaskIndex.objects.bulk_update(changed, INDEXED_FIELDS)
+        created = TaskIndex.objects.bulk_create(created)
+        if created and created[0].pk is None:
+            # Backends that do not return ids from bulk_create
+            created = list(TaskIndex.objects.filter(
+                section=section, task_id__in=[entry.task_id for entry in created]
+            ))
+
+        TASK_SEARCH_INDEX.update_many(
+            (entry.pk, task_search_values(tasks_by_id[entry.task_id]))
+            for entry in changed + created
+        )
+    invalidate_tags(*task_tags(section))
+    return len(tasks)
+
+
+def rebuild_task_index(batch_size=1000):
+    """
+    Rebuild the whole index, and the task search index, from the source
+    task tables. Returns a dict of section -> number of indexed tasks.
+    """
+    counts = {}
+    with transaction.atomic():
+        TaskIndex.objects.all().delete()
+        TASK_SEARCH_INDEX.clear()
+        for section, model in get_section_task_model_map().items():
+            tasks = {task.pk: task for task in model.objects.all().iterator(chunk_size=batch_size)}
+            TaskIndex.objects.bulk_create(
+                [TaskIndex(section=section, task_id=pk, **_index_values(task)) for pk, task in tasks.items()],
+                batch_size=batch_size,
+            )
+            entries = TaskIndex.objects.filter(section=section).values_list('pk', 'task_id')
+            TASK_SEARCH_INDEX.update_many(
+                (entry_id, task_search_values(tasks[task_id])) for entry_id, task_id in entries.iterator()
+            )
+            counts[section] = len(tasks)
+    invalidate_tags('tasks')
+    return counts
+
@@ -0,0 +1,42 @@
+"""
+Full-text search over every task model.
+
+Each TaskIndex entry has a matching row in the task search index, keyed
+by the entry's id, holding the task's title, description, tags, output
+and additional note. core.task_index writes both together, so anything
+that keeps the TaskIndex current keeps search current too.
+"""
+from .search import FullTextIndex
+
+TASK_SEARCH_INDEX = FullTextIndex('core_task_search', [
+    ('title', 10),
+    ('tags', 5),
+    ('description', 3),
+    ('output', 2),
+    ('note', 2),
+])
+
+
+def task_search_values(task):
+    """The text indexed for a task instance; missing fields index as empty"""
+    return {
+        'title': task.title or '',
+        'tags': getattr(task, 'tags', '') or '',
+        'description': getattr(task, 'description', '') or '',
+        'output': getattr(task, 'output', '') or '',
+        'note': getattr(task, 'additional_note_text', '') or '',
+    }
+
+
+def filter_tasks(queryset, query):
+    """
+    Restrict a TaskIndex queryset to the entries matching query, best match
+    first, or return None when the database has no full-text support. The
+    queryset's own filters apply before ranking, so no match is dropped.
+    """
+    return TASK_SEARCH_INDEX.filter(queryset, query)
+
+
+def task_snippets(query, entries):
+    """{TaskIndex id: highlighted snippet} for the entries shown on a page"""
+    return TASK_SEARCH_INDEX.snippets(query, [entry.pk for entry in entries])
@@ -0,0 +1,135 @@
+"""
+Status changes for many tasks at once, across sections.
+
+Updates are grouped by task model and new status and applied as one
+UPDATE ... WHERE id IN (...) per group inside a single transaction.
+Queryset updates skip model signals, so the task index, epic roll-ups,
+linked GDD features and the milestone banner are refreshed here in bulk.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .change_log import record_changes
+from .milestone_snapshot import bump_snapshot_version
+from .model_utils import get_section_task_model_map
+from .sqlite_tuning import retry_on_locked
+from .task_index import reindex_tasks
+
+VALID_STATUSES = ('to_do', 'in_progress', 'in_review', 'done', 'backlog', 'blocked')
+
+
+def get_status_model_map():
+    """
+    Map every accepted task_type to its model: section keys ('r1d3', 'game')
+    and lowercased class names ('r1d3task', 'gametask').
+    """
+    model_map = {}
+    for section, model in get_section_task_model_map().items():
+        model_map[section] = model
+        model_map[model.__name__.lower()] = model
+    return model_map
+
+
+def _status_display(model, status):
+    return dict(model._meta.get_field('status').choices).get(status, status.replace('_', ' ').title())
+
+
+@retry_on_locked
+def bulk_update_task_status(updates):
+    """
+    Apply a list of status changes in one transaction.
+
+    Args:
+        updates: Dicts with task_type, task_id and status
+
+    Returns:
+        One result dict per update, in order, with 'success' and either
+        the new status (plus old_status and status_display) or an 'error'
+        and its HTTP-style 'code'
+    """
+    model_map = get_status_model_map()
+    results = []
+    # model -> {task_id: (status, [result indexes])}; later updates of a task win
+    pending = {}
+
+    for update in updates:
+        result = {'success': False}
+        results.append(result)
+        if not isinstance(update, dict):
+            result.update(error='Each update must be an object', code=400)
+            continue
+
+        task_type, task_id, status = update.get('task_type'), update.get('task_id'), update.get('status')
+        result.update(task_type=task_type, task_id=task_id)
+        missing = [name for name, value in (('task_id', task_id), ('task_type', task_type), ('status', status)) if not value]
+        if missing:
+            result.update(error=f'Missing required fields: {missing}', code=400)
+            continue
+
+        model = model_map.get(str(task_type).lower())
+        if model is None:
+            result.update(error=f'Invalid task type: {task_type}', code=400)
+            continue
+        try:
+            task_id = int(task_id)
+        except (TypeError, ValueError):
+            result.update(error=f'Invalid task ID: {task_id}', code=400)
+            continue
+        if status not in VALID_STATUSES:
+            result.update(error=f'Invalid status: {status}', code=400)
+            continue
+
+        entry = pending.setdefault(model, {}).setdefault(task_id, [None, []])
+        entry[0] = status
+        entry[1].append(len(results) - 1)
+
+    if not pending:
+        return results
+
+    from projects.epic_stats import get_epic_task_models, refresh_epic_stats
+    from projects.game_models import GameTask, GDDFeature
+    epic_models = set(get_epic_task_models())
+    now = timezone.now()
+    epic_ids = set()
+    game_tasks_changed = False
+
+    with transaction.atomic():
+        for model, tasks in pending.items():
+            fields = ['pk', 'status'] + (['epic_id'] if model in epic_models else [])
+            current = {row[0]: row for row in model.objects.filter(pk__in=list(tasks)).values_list(*fields)}
+
+            by_status = {}
+            for task_id, (status, indexes) in tasks.items():
+                row = current.get(task_id)
+                for index in indexes:
+                    if row is None:
+                        results[index].update(error=f'Task not found: {task_id}', code=404)
+                    else:
+                        results[index].update(
+                            success=True, status=status, old_status=row[1],
+                            status_display=_status_display(model, status),
+                        )
+                if row is not None and row[1] != status:
+                    by_status.setdefault(status, []).append(task_id)
+                    if len(row) > 2:
+                        epic_ids.add(row[2])
+
+            changed = []
+            for status, task_ids in by_status.items():
+                model.objects.filter(pk__in=task_ids).update(status=status, updated_at=now)
+                if model is GameTask:
+                    GDDFeature.objects.filter(task_id__in=task_ids).update(status=status)
+                    record_changes(GDDFeature.objects.filter(task_id__in=task_ids))
+                changed.extend(task_ids)
+
+            if changed:
+                record_changes(model.objects.filter(pk__in=changed))
+                reindex_tasks(model, changed)
+                game_tasks_changed = game_tasks_changed or model is GameTask
+
+        if epic_ids - {None}:
+            refresh_epic_stats(epic_ids)
+        if game_tasks_changed:
+            bump_snapshot_version()
+
+    return results
@@ -33,3 +33,40 @@ def get_subtask_by_id(subtask_id):
         return SubTask.objects.get(id=subtask_id)
     except SubTask.DoesNotExist:
         return None
+
+
+def prefetch_task_subtasks(tasks):
+    """
+    Load the subtasks of many tasks at once, one query per task model.
+
+    Each task gets subtasks_cached (a list ordered like get_task_subtasks),
+    completed_subtask_count and subtask_progress, which the BaseTask
+    subtask methods use instead of querying.
+
+    Args:
+        tasks: Task model instances, possibly of different models
+
+    Returns:
+        The tasks, for chaining
+    """
+    tasks = list(tasks)
+    tasks_by_model = {}
+    for task in tasks:
+        tasks_by_model.setdefault(task.__class__, []).append(task)
+    content_types = ContentType.objects.get_for_models(*tasks_by_model)
+
+    for model, model_tasks in tasks_by_model.items():
+        subtasks_by_task = {task.pk: [] for task in model_tasks}
+        subtasks = SubTask.objects.filter(
+            content_type=content_types[model],
+            object_id__in=list(subtasks_by_task)
+        ).order_by('created_at')
+        for subtask in subtasks:
+            subtasks_by_task[subtask.object_id].append(subtask)
+
+        for task in model_tasks:
+            task.subtasks_cached = subtasks_by_task[task.pk]
+            task.completed_subtask_count = sum(1 for subtask in task.subtasks_cached if subtask.is_completed)
+            total = len(task.subtasks_cached)
+            task.subtask_progress = int((task.completed_subtask_count / total) * 100) if total else 100
+    return tasks
@@ -0,0 +1,60 @@
+"""
+Tests for buffered KnowledgeArticle view counts.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from education.knowledge.models import KnowledgeArticle
+from education.knowledge.view_counts import ARTICLE_VIEW_COUNTER
+
+
+class ArticleViewCounterTests(TestCase):
+    """Test that views are buffered and flushed with one atomic update."""
+
+    def setUp(self):
+        cache.clear()
+        ARTICLE_VIEW_COUNTER.flush()
+        self.user = User.objects.create_user(username='viewer', password='testpassword')
+        self.first = KnowledgeArticle.objects.create(title='First', content='x', author=self.user, view_count=5)
+        self.second = KnowledgeArticle.objects.create(title='Second', content='y', author=self.user)
+
+    def tearDown(self):
+        # Never leave hits (or a pending timer) behind for other tests
+        ARTICLE_VIEW_COUNTER.flush()
+
+    def test_views_are_buffered_then_flushed(self):
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                self.first.increment_view_count()
+            self.second.increment_view_count()
+
+        self.assertEqual(ARTICLE_VIEW_COUNTER.pending_for(self.first.pk), 3)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 5)
+
+        flushed_before = ARTICLE_VIEW_COUNTER.stats()['flushed']
+        with self.assertNumQueries(1):
+            self.assertEqual(ARTICLE_VIEW_COUNTER.flush(), 4)
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.view_count, self.second.view_count), (8, 1))
+        stats = ARTICLE_VIEW_COUNTER.stats()
+        self.assertEqual(stats['pending'], 0)
+        self.assertEqual(stats['flushed'] - flushed_before, 4)
+
+    def test_detail_view_counts_without_writing(self):
+        client = Client()
+        client.login(username='viewer', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = client.get(reverse('education:knowledge_article', args=[self.first.slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ARTICLE_VIEW_COUNTER.pending_for(self.first.pk), 1)
+
+        stats = client.get(reverse('education:knowledge_view_count_stats')).json()
+        self.assertEqual(stats['pending'], 1)
@@ -0,0 +1,88 @@
+"""
+Tests for the shared bulk-edit service and the department batch views.
+"""
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.bulk_edit import BulkEditError, bulk_edit_tasks
+from core.models import TaskBulkEdit, TaskIndex
+from indie_news.models import IndieNewsTask
+from projects.task_models import EducationTask, Epic, EpicStats
+
+
+class BulkEditTests(TestCase):
+    """Test validation, the grouped update and its side effects."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='editor', password='testpassword')
+        self.epic = Epic.objects.create(title='Courses', company_section='education')
+        self.tasks = [EducationTask.objects.create(title=f'Lesson {i}', epic=self.epic) for i in range(3)]
+        self.ids = [task.pk for task in self.tasks]
+
+    def test_validation(self):
+        with self.assertRaisesMessage(BulkEditError, 'Invalid status'):
+            bulk_edit_tasks(EducationTask, self.ids, {'status': 'finished'})
+        with self.assertRaisesMessage(BulkEditError, 'User not found: 999'):
+            bulk_edit_tasks(EducationTask, self.ids, {'assigned_to': 999})
+        with self.assertRaisesMessage(BulkEditError, 'cannot be bulk edited'):
+            bulk_edit_tasks(EducationTask, self.ids, {'title': 'Renamed'})
+        with self.assertRaisesMessage(BulkEditError, 'No fields to update'):
+            bulk_edit_tasks(EducationTask, self.ids, {'status': ''})
+        self.assertFalse(TaskBulkEdit.objects.exists())
+
+    def test_bulk_edit(self):
+        result = bulk_edit_tasks(
+            EducationTask, self.ids + [999999],
+            {'status': 'done', 'assigned_to': self.user.pk, 'due_date': '2026-11-01', 'course_id': 'CS101'},
+            allowed_fields=('status', 'assigned_to', 'due_date', 'course_id'),
+            user=self.user, user_name='Ricardo',
+        )
+        self.assertEqual(result.updated_count, 3)
+        for task in EducationTask.objects.all():
+            self.assertEqual((task.status, task.assigned_to, task.due_date, task.course_id),
+                             ('done', self.user, date(2026, 11, 1), 'CS101'))
+
+        self.assertEqual(TaskIndex.objects.filter(section='education', status='done').count(), 3)
+        self.assertEqual(EpicStats.objects.get(epic=self.epic).done_count, 3)
+        record = TaskBulkEdit.objects.get()
+        self.assertEqual((record.section, record.task_ids, record.edited_by_name), ('education', self.ids, 'Ricardo'))
+        self.assertEqual(record.changes['due_date'], '2026-11-01')
+
+        bulk_edit_tasks(EducationTask, self.ids, {'assigned_to': 'unassigned', 'due_date': 'no_date'})
+        self.assertFalse(EducationTask.objects.filter(assigned_to__isnull=False).exists())
+
+    def test_department_views(self):
+        client = Client()
+        client.login(username='editor', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = client.post(
+            reverse('education:batch_task_update'),
+            json.dumps({'task_ids': self.ids, 'update_data': {'priority': 'high', 'target_audience': 'Kids'}}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.json()['updated_count'], 3)
+        self.assertEqual(EducationTask.objects.filter(priority='high', target_audience='Kids').count(), 3)
+
+        news = IndieNewsTask.objects.create(title='Story')
+        response = client.post(
+            reverse('indie_news:task_batch_update'),
+            json.dumps({'task_ids': [news.pk], 'assigned_to': 999}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        response = client.post(
+            reverse('indie_news:task_batch_update'),
+            json.dumps({'task_ids': [news.pk], 'news_type': 'review', 'status': 'in_progress'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.json()['updated_count'], 1)
+        self.assertEqual(TaskBulkEdit.objects.filter(edited_by=self.user).count(), 2)
@@ -0,0 +1,55 @@
+"""
+Tests for tag-based cache invalidation.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth.models import User
+
+from core import cache_tags
+from education.knowledge.models import KnowledgeArticle, KnowledgeCategory
+
+
+class CacheTagTests(TestCase):
+    """Test that invalidating a tag only drops the entries carrying it."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_only_matching_tags(self):
+        cache_tags.set('arcade-stats', 1, tags=['tasks', 'tasks:arcade'])
+        cache_tags.set('theme-park-stats', 2, tags=['tasks', 'tasks:theme_park'])
+        cache_tags.set('banner', 3, tags=['milestones'])
+
+        cache_tags.invalidate_tags('tasks:arcade')
+        self.assertIsNone(cache_tags.get('arcade-stats'))
+        self.assertEqual(cache_tags.get('theme-park-stats'), 2)
+        self.assertEqual(cache_tags.get('banner'), 3)
+
+        cache_tags.invalidate_tags('tasks')
+        self.assertIsNone(cache_tags.get('theme-park-stats'))
+        self.assertEqual(cache_tags.get('banner'), 3)
+
+    def test_get_or_set(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return 'value'
+
+        self.assertEqual(cache_tags.get_or_set('key', build, tags=['kb']), 'value')
+        self.assertEqual(cache_tags.get_or_set('key', build, tags=['kb']), 'value')
+        self.assertEqual(len(calls), 1)
+
+    def test_article_save_invalidates_kb_tags(self):
+        author = User.objects.create_user(username='writer', password='testpassword')
+        category = KnowledgeCategory.objects.create(name='Design')
+        article = KnowledgeArticle.objects.create(
+            title='Level design basics', content='<p>Start small</p>', category=category, author=author,
+        )
+        cache_tags.set('article', 'html', tags=[f'kb:article:{article.pk}'])
+        cache_tags.set('listing', 'html', tags=['kb'])
+
+        article.title = 'Level design fundamentals'
+        article.save()
+        self.assertIsNone(cache_tags.get('article'))
+        self.assertIsNone(cache_tags.get('listing'))
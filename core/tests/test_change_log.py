@@ -0,0 +1,152 @@
+"""
+Tests for row-level change capture and changeset replay.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import change_log
+from core.change_log import apply_changes, apply_changeset, export_changeset, pending_changes, read_changeset
+from core.git_sync import GitSyncManager
+from core.models import ChangeLogEntry, TaskIndex
+from projects.task_models import R1D3Task
+
+
+@override_settings(SYNC_NODE_ID='here')
+class ChangeLogTests(TestCase):
+    """Test capture, export, idempotent replay and last-writer-wins."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.task = R1D3Task.objects.create(title='Draft', priority='low')
+
+    def remote_change(self, change_id, changed_at, action='save', **fields):
+        """A change of self.task made on another machine"""
+        data = None
+        if action == 'save':
+            data = ChangeLogEntry.objects.filter(model='projects.r1d3task', object_pk=str(self.task.pk)).latest('pk').data
+            data.update(fields, updated_at=changed_at.isoformat())
+        return {
+            'id': change_id, 'origin': 'there', 'model': 'projects.r1d3task', 'pk': str(self.task.pk),
+            'action': action, 'changed_at': changed_at.isoformat(), 'fields': data,
+        }
+
+    def test_export_writes_latest_change_per_row(self):
+        self.task.title = 'Final'
+        self.task.save()
+        self.assertEqual(pending_changes().filter(model='projects.r1d3task').count(), 2)
+
+        path = export_changeset(self.directory)
+        changes = [change for change in read_changeset(path) if change['model'] == 'projects.r1d3task']
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['fields']['title'], 'Final')
+        self.assertEqual(changes[0]['origin'], 'here')
+        self.assertFalse(pending_changes().exists())
+        self.assertIsNone(export_changeset(self.directory))
+
+        # Our own file is never applied back
+        self.assertEqual(apply_changeset(path).entries, 0)
+
+    def test_replay_is_idempotent_and_last_writer_wins(self):
+        later = self.task.updated_at + timedelta(minutes=5)
+        change = self.remote_change('a' * 32, later, title='Remote title')
+
+        self.assertEqual(apply_changes([change]).applied, 1)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.updated_at), ('Remote title', later))
+        # post_save ran, so the task index follows
+        self.assertEqual(TaskIndex.objects.get(section='r1d3', task_id=self.task.pk).title, 'Remote title')
+        # Replayed rows are not exported again
+        self.assertFalse(pending_changes().filter(change_id='a' * 32).exists())
+
+        self.assertEqual(apply_changes([change]).skipped, 1)
+
+        older = self.remote_change('b' * 32, later - timedelta(minutes=1), title='Stale title')
+        self.assertEqual(apply_changes([older]).applied, 0)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'Remote title')
+
+    def test_known_changes_are_looked_up_in_batches(self):
+        start = self.task.updated_at + timedelta(minutes=5)
+        changes = [
+            self.remote_change(f'{number:032x}', start + timedelta(seconds=number), title=f'Title {number}')
+            for number in range(5)
+        ]
+        # Large changesets stay under SQLite's limit on query parameters
+        with mock.patch.object(change_log, 'QUERY_BATCH_SIZE', 2):
+            self.assertEqual(apply_changes(changes).applied, 5)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(apply_changes(changes).skipped, 5)
+        lookups = [query['sql'] for query in queries if '"change_id" IN' in query['sql']]
+        self.assertEqual(len(lookups), 3)
+
+    def test_replayed_delete(self):
+        change = self.remote_change('c' * 32, timezone.now() + timedelta(minutes=5), action='delete')
+        self.assertEqual(apply_changes([change]).applied, 1)
+        self.assertFalse(R1D3Task.objects.filter(pk=self.task.pk).exists())
+        self.assertFalse(pending_changes().filter(action=ChangeLogEntry.ACTION_DELETE).exists())
+
+
+@override_settings(SYNC_NODE_ID='here')
+class GitSyncPendingTests(TestCase):
+    """Test that changes stay pending until their changeset is pushed."""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_dir, ignore_errors=True)
+        remote = os.path.join(self.base_dir, 'remote.git')
+        work = os.path.join(self.base_dir, 'work')
+        self.git(self.base_dir, 'init', '-q', '--bare', remote)
+        self.git(self.base_dir, 'clone', '-q', remote, work)
+        self.git(work, 'config', 'user.email', 'sync@example.com')
+        self.git(work, 'config', 'user.name', 'Sync')
+        self.git(work, 'commit', '-q', '--allow-empty', '-m', 'Initial')
+        self.git(work, 'push', '-q', 'origin', 'HEAD')
+        self.work = work
+        settings = override_settings(BASE_DIR=work, SYNC_CHANGESET_DIR=os.path.join(work, 'sync', 'changesets'))
+        settings.enable()
+        self.addCleanup(settings.disable)
+        R1D3Task.objects.create(title='Draft')
+
+    def git(self, cwd, *args):
+        subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True)
+
+    def test_failed_commit_keeps_changes_pending(self):
+        hook = os.path.join(self.work, '.git', 'hooks', 'pre-commit')
+        with open(hook, 'w') as f:
+            f.write('#!/bin/sh\nexit 1\n')
+        os.chmod(hook, 0o755)
+
+        manager = GitSyncManager()
+        self.assertFalse(manager.commit_database('Fails')['success'])
+        self.assertTrue(pending_changes().exists())
+        self.assertEqual(os.listdir(os.path.join(self.work, 'sync', 'changesets')), [])
+        self.assertIn('unsynced changes', manager.check_database_changes()['status'])
+
+        os.remove(hook)
+        self.assertTrue(manager.commit_database('Works')['success'])
+        self.assertFalse(pending_changes().exists())
+
+    def test_unpushed_commit_stays_pending(self):
+        manager = GitSyncManager()
+        self.assertTrue(manager.commit_database('Local only')['success'])
+        self.assertEqual(manager.check_database_changes(), {'has_changes': True, 'status': '1 commits not pushed'})
+
+        # The next sync only has to push
+        self.assertTrue(manager.commit_database('Nothing new')['success'])
+        self.assertTrue(manager.push_changes()['success'])
+        self.assertFalse(manager.check_database_changes()['has_changes'])
+
+    def test_uncommitted_changeset_file_is_pending(self):
+        export_changeset()
+        status = GitSyncManager().check_database_changes()
+        self.assertEqual(status, {'has_changes': True, 'status': '1 changeset files not committed'})
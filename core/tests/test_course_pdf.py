@@ -0,0 +1,104 @@
+"""
+Tests for the pre-rendered course PDFs.
+"""
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import Job
+from education.course.models import ConceptSection, Course
+from education.course.pdf_cache import course_fingerprint, course_pdf_path, delete_course_pdfs
+from education.jobs import RENDER_COURSE_PDF_JOB
+
+
+@override_settings(JOBS_RUN_INLINE=False)
+class CoursePDFCacheTests(TestCase):
+    """Test the content fingerprint and serving stored PDFs."""
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='teacher', password='testpass123')
+        self.client = Client()
+        self.client.login(username='teacher', password='testpass123')
+        session = self.client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+        self.course = Course.objects.create(
+            title='Physics', central_theme='Motion', author=self.user, objective='Learn',
+            summary='Summary', introduction='Intro', practical_applications='Apps',
+        )
+        self.concept = ConceptSection.objects.create(
+            course=self.course, name='Velocity', definition='Speed with direction',
+            detailed_explanation='...', illustrative_example='A car', order=1,
+        )
+        self.url = reverse('education:course_pdf', args=[self.course.pk])
+
+    def test_fingerprint_follows_course_content(self):
+        fingerprint = course_fingerprint(self.course)
+        self.assertEqual(course_fingerprint(Course.objects.get(pk=self.course.pk)), fingerprint)
+
+        self.concept.definition = 'Rate of change of position'
+        self.concept.save()
+        self.assertNotEqual(course_fingerprint(self.course), fingerprint)
+
+    def test_serves_stored_pdf_with_validators(self):
+        fingerprint = course_fingerprint(self.course)
+        default_storage.save(course_pdf_path(self.course.pk, fingerprint), ContentFile(b'%PDF-1.4 test'))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 test')
+        self.assertEqual(response['ETag'], f'"{fingerprint}"')
+        self.assertIn('Last-Modified', response)
+        self.assertFalse(Job.objects.exists())
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{fingerprint}"')
+        self.assertEqual(response.status_code, 304)
+
+    def test_changed_course_queues_a_render(self):
+        old_path = course_pdf_path(self.course.pk, course_fingerprint(self.course))
+        default_storage.save(old_path, ContentFile(b'%PDF-1.4 old'))
+        self.course.summary = 'New summary'
+        self.course.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'education/course/pdf_pending.html')
+        job = Job.objects.get(name=RENDER_COURSE_PDF_JOB)
+        self.assertEqual(job.kwargs, {'course_id': self.course.pk})
+
+        delete_course_pdfs(self.course.pk)
+        self.assertFalse(default_storage.exists(old_path))
+
+    def test_other_users_can_poll_a_shared_render(self):
+        # Queued by a course edit, so nobody created it
+        job = Job.objects.create(name=RENDER_COURSE_PDF_JOB, kwargs={'course_id': self.course.pk})
+        User.objects.create_user(username='student', password='testpass123')
+        self.client.login(username='student', password='testpass123')
+        session = self.client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['job'], job)
+        status = self.client.get(response.context['status_url'])
+        self.assertEqual((status.status_code, status.json()['status']), (200, Job.STATUS_QUEUED))
+
+        other = Course.objects.create(
+            title='Chemistry', central_theme='Atoms', author=self.user, objective='Learn',
+            summary='Summary', introduction='Intro', practical_applications='Apps',
+        )
+        url = reverse('education:course_pdf_status', args=[other.pk, job.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,72 @@
+"""
+Tests for the department task statistics.
+"""
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.bulk_edit import bulk_edit_tasks
+from core.dashboard_stats import get_task_stats, task_stats_context
+from projects.task_models import ArcadeTask, EducationTask, SocialMediaTask, ThemeParkTask
+
+
+class DashboardStatsTests(TestCase):
+    """Test the grouped counts, their caching and the department pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='manager', password='testpassword')
+        yesterday = date.today() - timedelta(days=1)
+        ThemeParkTask.objects.create(title='Paint', zone='north', attraction_id='coaster', status='done')
+        ThemeParkTask.objects.create(title='Oil', zone='north', priority='high', due_date=yesterday)
+        ThemeParkTask.objects.create(title='Map', zone='south')
+        ThemeParkTask.objects.create(title='Signs')
+
+    def test_counts_and_caching(self):
+        with self.assertNumQueries(2):
+            stats = get_task_stats(ThemeParkTask, group_fields=('zone', 'attraction_id'))
+        self.assertEqual(stats['total'], 4)
+        self.assertEqual(stats['status']['done'], 1)
+        self.assertEqual(stats['status']['to_do'], 3)
+        self.assertEqual(stats['priority'], {'low': 0, 'medium': 3, 'high': 1, 'critical': 0})
+        self.assertEqual((stats['overdue'], stats['completed_this_week']), (1, 1))
+        self.assertEqual(stats['groups'], {'zone': [('north', 2), ('south', 1)], 'attraction_id': [('coaster', 1)]})
+
+        task_stats = task_stats_context(stats, percent_step=10)
+        self.assertEqual((task_stats['done_percent'], task_stats['to_do_percent']), (20, 80))
+
+        with self.assertNumQueries(0):
+            get_task_stats(ThemeParkTask, group_fields=('zone', 'attraction_id'))
+        self.assertEqual(get_task_stats(ThemeParkTask, filters={'zone': 'north'})['total'], 2)
+
+    def test_task_writes_invalidate(self):
+        get_task_stats(ThemeParkTask)
+        task = ThemeParkTask.objects.create(title='Fence')
+        self.assertEqual(get_task_stats(ThemeParkTask)['total'], 5)
+
+        bulk_edit_tasks(ThemeParkTask, [task.pk], {'status': 'blocked'})
+        self.assertEqual(get_task_stats(ThemeParkTask)['status']['blocked'], 1)
+
+    def test_department_pages(self):
+        client = Client()
+        client.login(username='manager', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+        SocialMediaTask.objects.create(title='Post', channel='twitter')
+        ArcadeTask.objects.create(title='Repair', status='in_progress')
+        EducationTask.objects.create(title='Lesson', course_id='CS101')
+
+        response = client.get(reverse('theme_park:tasks'))
+        self.assertEqual([zone['id'] for zone in response.context['zones']], ['north', 'south'])
+        response = client.get(reverse('social_media:tasks'))
+        self.assertEqual(response.context['channels'], [{'id': 'twitter', 'title': 'twitter', 'count': 1}])
+        response = client.get(reverse('arcade:tasks'))
+        self.assertEqual(response.context['task_stats']['in_progress_percent'], 100)
+        self.assertIn(self.user, response.context['users'])
+        response = client.get(reverse('education:tasks'), {'course_id': 'CS101'})
+        self.assertEqual(list(response.context['course_ids']), ['CS101'])
+        self.assertEqual(response.context['total_tasks'], 1)
@@ -0,0 +1,59 @@
+"""
+Tests for the table checksum tree and bucket exchange.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.change_log import apply_changes
+from core.db_digest import bucket_changes, database_digest, diff_digests
+from projects.task_models import R1D3Task
+
+
+@override_settings(DB_DIGEST_BUCKET_SIZE=10, SYNC_NODE_ID='here')
+class DatabaseDigestTests(TestCase):
+    """Test that only changed tables and buckets differ and can be exchanged."""
+
+    def setUp(self):
+        cache.clear()
+        self.tasks = [R1D3Task.objects.create(title=f'Task {i}') for i in range(25)]
+
+    def test_diff_finds_changed_bucket(self):
+        before = database_digest()
+        self.assertEqual(database_digest(), before)
+        task = self.tasks[12]
+        with self.settings(SYNC_NODE_ID='there'):
+            # Same rows and times as here; ties go to the later origin name
+            changes = bucket_changes('projects.r1d3task', [task.pk // 10])
+
+        # Simulate an older edit elsewhere; QuerySet.update is not captured
+        R1D3Task.objects.filter(pk=task.pk).update(title='Stale', updated_at=task.updated_at - timedelta(hours=1))
+        after = database_digest()
+        self.assertEqual(diff_digests(before, after), {'projects.r1d3task': [str(task.pk // 10)]})
+        self.assertEqual(after['tables']['projects.gametask'], before['tables']['projects.gametask'])
+
+        # Replaying the other side's bucket restores the newer row
+        self.assertEqual(apply_changes(changes).applied, 1)
+        self.assertEqual(R1D3Task.objects.get(pk=task.pk).title, 'Task 12')
+        self.assertEqual(database_digest()['root'], before['root'])
+
+    def test_endpoint(self):
+        User.objects.create_user(username='sync', password='testpass123')
+        client = Client()
+        client.login(username='sync', password='testpass123')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = client.get(reverse('core:sync_digest'), {'tables': 'projects.r1d3task'})
+        self.assertEqual(response.status_code, 200)
+        tables = response.json()['tables']
+        self.assertEqual(tables['projects.r1d3task']['rows'], 25)
+        self.assertEqual(len(tables['projects.r1d3task']['buckets']), 3)
+        self.assertNotIn('buckets', tables['projects.gametask'])
+
+        response = client.get(reverse('core:sync_digest_rows'), {'table': 'core.job', 'buckets': '0'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,73 @@
+"""
+Tests for the per-epic task roll-ups.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from indie_news.models import IndieNewsTask
+from projects.epic_stats import compute_epic_stats, rebuild_epic_stats
+from projects.task_models import ArcadeTask, Epic, EpicStats, R1D3Task
+
+
+class EpicStatsTests(TestCase):
+    """Test roll-up maintenance from task signals and the epic list view."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='epicuser', password='testpassword')
+        self.epic = Epic.objects.create(title='Launch', company_section='r1d3')
+        self.other = Epic.objects.create(title='Marketing', company_section='social_media')
+
+    def assertStats(self, epic, expected):
+        stats = EpicStats.objects.get(epic=epic)
+        self.assertEqual((stats.task_count, stats.done_count, stats.subtask_count), expected)
+
+    def test_signals_keep_stats_current(self):
+        self.assertStats(self.epic, (0, 0, 0))
+
+        task = R1D3Task.objects.create(title='Plan', epic=self.epic, status='done')
+        ArcadeTask.objects.create(title='Cabinet', epic=self.epic)
+        IndieNewsTask.objects.create(title='Story', epic=self.epic)
+        R1D3Task.objects.create(title='Budget', parent_task=task, task_level='subtask')
+        self.assertStats(self.epic, (3, 1, 1))
+        self.assertEqual(Epic.objects.get(pk=self.epic.pk).get_progress(), 33)
+
+        task = R1D3Task.objects.get(pk=task.pk)
+        task.epic = self.other
+        task.save()
+        self.assertStats(self.epic, (2, 0, 0))
+        self.assertStats(self.other, (1, 1, 1))
+
+        task.delete()
+        self.assertStats(self.other, (0, 0, 0))
+
+        EpicStats.objects.all().delete()
+        self.assertEqual(rebuild_epic_stats(), 2)
+        self.assertStats(self.epic, (2, 0, 0))
+        self.assertEqual(compute_epic_stats([self.epic.pk]), {self.epic.pk: (2, 0, 0)})
+
+    def test_epic_list_queries_do_not_grow_with_epics(self):
+        client = Client()
+        client.login(username='epicuser', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(reverse('projects:epic_list'))
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        list_queries()  # warm the cached fragments shared by every page
+        baseline = list_queries()
+        for index in range(3):
+            epic = Epic.objects.create(title=f'Epic {index}', company_section='arcade')
+            ArcadeTask.objects.create(title=f'Task {index}', epic=epic, status='done')
+        list_queries()
+        self.assertEqual(list_queries(), baseline)
+        self.assertContains(client.get(reverse('projects:epic_list')), '100%')
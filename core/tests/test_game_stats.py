@@ -0,0 +1,51 @@
+"""
+Tests for the cached per-game statistics.
+"""
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from projects.game_models import GameAsset, GameBug, GameProject
+from projects.game_stats import get_game_stats
+from projects.task_models import GameDevelopmentTask
+
+
+class GameStatsTests(TestCase):
+    """Test the aggregate counts and their invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='dev', password='testpassword')
+        self.game = GameProject.objects.create(title='Farm', description='Farming', start_date=date(2025, 1, 1))
+        GameDevelopmentTask.objects.create(title='Crops', game=self.game, status='done')
+        GameDevelopmentTask.objects.create(title='Weather', game=self.game, status='to_do')
+        GameAsset.objects.create(game=self.game, name='Tractor', asset_type='3d_model')
+        GameBug.objects.create(
+            game=self.game, title='Crash', description='x', steps_to_reproduce='x',
+            expected_result='x', actual_result='x', reported_by=self.user,
+        )
+
+    def test_counts_and_caching(self):
+        with self.assertNumQueries(3):
+            stats = get_game_stats(self.game)
+        self.assertEqual(stats['tasks_by_status']['done'], 50)
+        self.assertEqual(stats['assets_by_type'], {
+            '3d_model': 1, '2d_image': 0, 'music': 0, 'video': 0, 'reference': 0, 'other': 0,
+        })
+        self.assertEqual((stats['total_bugs'], stats['open_bugs']), (1, 1))
+
+        with self.assertNumQueries(0):
+            get_game_stats(self.game)
+
+    def test_invalidation(self):
+        get_game_stats(self.game)
+        GameAsset.objects.create(game=self.game, name='Barn', asset_type='3d_model')
+        self.assertEqual(get_game_stats(self.game)['assets_by_type']['3d_model'], 2)
+
+        GameDevelopmentTask.objects.filter(game=self.game).update(status='done')
+        self.assertEqual(get_game_stats(self.game)['tasks_by_status']['done'], 50)  # update() skips signals
+
+        GameDevelopmentTask.objects.get(title='Weather').save()
+        self.assertEqual(get_game_stats(self.game)['tasks_by_status']['done'], 100)
@@ -0,0 +1,77 @@
+"""
+Tests for GDD feature extraction and patching task statuses into GDD HTML.
+"""
+from datetime import date
+
+from django.test import TestCase
+
+from projects.game_models import GameDesignDocument, GameProject, GameTask, GDDFeature, GDDSection
+from projects.gdd_utils import create_sections_and_features, update_gdd_html_with_task_status
+
+FEATURE_ROW = '<tr><td>{name}</td><td><span class="status backlog">backlog</span></td></tr>'
+
+
+class GDDStatusTests(TestCase):
+    """Test the indexed status update of feature tables."""
+
+    def setUp(self):
+        game = GameProject.objects.create(title='Farm', description='x', start_date=date(2025, 1, 1))
+        rows = ''.join(FEATURE_ROW.format(name=f'Feature {i}') for i in range(200))
+        self.gdd = GameDesignDocument.objects.create(
+            game=game, high_concept='x', player_experience='x', core_mechanics='x',
+            html_content=f'<h2>Core</h2><table class="feature-table"><tr><th>Feature</th><th>Status</th></tr>{rows}</table>',
+        )
+        section = GDDSection.objects.create(gdd=self.gdd, title='Core', section_id='core')
+        for i in range(200):
+            task = GameTask.objects.create(title=f'Feature {i}', game=game, status='done' if i % 2 else 'to_do')
+            GDDFeature.objects.create(
+                section=section, feature_name=f'Feature {i}', description='x', task=task,
+                status='implemented' if i % 2 else 'backlog',
+            )
+
+    def test_update(self):
+        # One query for the features, one UPDATE of the document and its change log entry
+        with self.assertNumQueries(3):
+            html = update_gdd_html_with_task_status(self.gdd)
+        self.assertIn('<td>Feature 1</td><td><span class="status done">implemented</span></td>', html)
+        self.assertIn('<td>Feature 2</td><td><span class="status to_do">backlog</span></td>', html)
+        self.assertEqual(GameDesignDocument.objects.get(pk=self.gdd.pk).html_content, html)
+
+        # Nothing changed, so nothing is saved
+        with self.assertNumQueries(1):
+            self.assertEqual(update_gdd_html_with_task_status(self.gdd), html)
+
+
+class GDDExtractionTests(TestCase):
+    """Test feature extraction and the unchanged-document shortcut."""
+
+    def setUp(self):
+        game = GameProject.objects.create(title='Farm', description='x', start_date=date(2025, 1, 1))
+        self.gdd = GameDesignDocument.objects.create(game=game, high_concept='x', player_experience='x', core_mechanics='x')
+
+    def html(self, *names):
+        rows = ''.join(f'<tr><td>{name}</td><td>About {name}</td><td>High</td></tr>' for name in names)
+        header = '<tr><th>Feature</th><th>Description</th><th>Priority</th></tr>'
+        return (
+            f'<h2 id="core">Core</h2><p>Intro</p><table class="feature-table">{header}{rows}</table>'
+            f'<h2 id="art">Art</h2><table class="feature-table">{header}<tr><td>Sprites</td><td>x</td><td>Low</td></tr></table>'
+        )
+
+    def test_extraction(self):
+        html = self.html(*[f'Feature {i}' for i in range(50)])
+        # Section lookup and insert, feature lookup and insert, hash update, change log insert
+        with self.assertNumQueries(6):
+            sections, features = create_sections_and_features(self.gdd, html)
+        self.assertEqual(list(sections), ['core', 'art'])
+        self.assertEqual(len(features), 51)
+        feature = GDDFeature.objects.get(feature_name='Feature 3')
+        self.assertEqual((feature.section.title, feature.priority, feature.order), ('Core', 'high', 4))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(create_sections_and_features(self.gdd, html), ({}, []))
+
+        # A changed document only adds what is new
+        sections, features = create_sections_and_features(self.gdd, self.html('Feature 0', 'Weather'))
+        self.assertEqual([feature.feature_name for feature in features], ['Weather'])
+        self.assertEqual(GDDFeature.objects.get(feature_name='Weather').order, 51)
+        self.assertEqual(GDDSection.objects.filter(gdd=self.gdd).count(), 2)
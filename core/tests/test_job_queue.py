@@ -0,0 +1,221 @@
+"""
+Tests for the background job queue and the views that enqueue jobs.
+"""
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.job_queue import (
+    JobFailed, cancel_job, check_cancelled, claim_job, enqueue, register_job, requeue_stale_jobs,
+    run_due_jobs, run_job, set_progress,
+)
+from core.git_sync import GitSyncManager
+from core.models import Job
+from projects.game_models import GameDesignDocument, GameProject, GameTask, GDDFeature, GDDSection
+
+CALLS = []
+
+
+@register_job('tests.flaky', max_attempts=2)
+def flaky(job, fail_times=0):
+    CALLS.append(job.attempts)
+    set_progress(job, 50, 'Half way')
+    if job.attempts <= fail_times:
+        raise RuntimeError('Temporary failure')
+    return {'attempts': job.attempts}
+
+
+@register_job('tests.refuse')
+def refuse(job):
+    raise JobFailed('Nothing to do')
+
+
+@register_job('tests.steps', lock='tests')
+def steps(job):
+    # Cancelled while running, as if from another request
+    cancel_job(job)
+    check_cancelled(job)
+    CALLS.append('finished')
+
+
+@register_job('tests.other_steps', lock='tests')
+def other_steps(job):
+    CALLS.append('other')
+
+
+@override_settings(JOBS_RUN_INLINE=False, JOB_RETRY_DELAY=0)
+class JobQueueTests(TestCase):
+    """Test claiming, retries, failure and the polling endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        CALLS.clear()
+        self.user = User.objects.create_user(username='worker', password='testpassword')
+
+    def test_retry_then_succeed(self):
+        job = enqueue('tests.flaky', user=self.user, fail_times=1)
+        self.assertEqual(enqueue('tests.flaky', unique=True, fail_times=1), job)
+        self.assertEqual(run_due_jobs(), 2)
+
+        job.refresh_from_db()
+        self.assertEqual(CALLS, [1, 2])
+        self.assertEqual((job.status, job.progress, job.result), (Job.STATUS_SUCCEEDED, 100, {'attempts': 2}))
+        self.assertFalse(claim_job(job, 'other'))
+
+    def test_failures(self):
+        flaky_job = enqueue('tests.flaky', fail_times=5)
+        refused = enqueue('tests.refuse')
+        run_due_jobs()
+
+        flaky_job.refresh_from_db()
+        refused.refresh_from_db()
+        self.assertEqual((flaky_job.status, flaky_job.attempts), (Job.STATUS_FAILED, 2))
+        self.assertIn('RuntimeError: Temporary failure', flaky_job.error)
+        self.assertEqual((refused.status, refused.attempts, refused.error), (Job.STATUS_FAILED, 1, 'Nothing to do'))
+
+    def test_cancel_and_lock(self):
+        job = enqueue('tests.steps', user=self.user)
+        self.assertEqual(enqueue('tests.steps'), job)
+
+        self.assertTrue(claim_job(job, 'worker'))
+        # A different job holding the lock waits until the running one finishes
+        queued = enqueue('tests.other_steps')
+        self.assertNotEqual(queued, job)
+        self.assertTrue(claim_job(queued, 'other worker'))
+        self.assertFalse(run_job(queued))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts, CALLS), (Job.STATUS_QUEUED, 0, []))
+
+        self.assertTrue(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.cancel_requested, CALLS), (Job.STATUS_CANCELLED, True, []))
+        self.assertFalse(cancel_job(job))
+
+        Job.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        self.assertEqual(run_due_jobs(), 1)
+        self.assertEqual((Job.objects.get(pk=queued.pk).status, CALLS), (Job.STATUS_SUCCEEDED, ['other']))
+
+        queued = enqueue('tests.other_steps')
+        self.assertTrue(cancel_job(queued))
+        self.assertEqual(run_due_jobs(), 0)
+        self.assertEqual(Job.objects.get(pk=queued.pk).status, Job.STATUS_CANCELLED)
+
+    def test_requeue_stale_jobs(self):
+        job = enqueue('tests.flaky')
+        claim_job(job, 'crashed')
+        Job.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.STATUS_QUEUED)
+
+    def test_status_endpoint(self):
+        job = enqueue('tests.flaky', user=self.user)
+        client = Client()
+        client.login(username='worker', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+        url = reverse('core:job_status', args=[job.pk])
+        self.assertEqual(client.get(url).json()['status'], 'queued')
+
+        run_due_jobs()
+        data = client.get(url).json()
+        self.assertEqual((data['finished'], data['success'], data['result']), (True, True, {'attempts': 1}))
+
+        client.force_login(User.objects.create_user(username='other', password='testpassword'))
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+        self.assertEqual(client.get(url).status_code, 404)
+
+
+class JobViewTests(TestCase):
+    """Test that the heavy views hand their work to jobs."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='lead', password='testpassword', is_staff=True)
+        self.client = Client()
+        self.client.login(username='lead', password='testpassword')
+        session = self.client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        game = GameProject.objects.create(title='Farm', description='x', start_date=date(2025, 1, 1))
+        self.gdd = GameDesignDocument.objects.create(game=game, high_concept='x', player_experience='x', core_mechanics='x')
+        section = GDDSection.objects.create(gdd=self.gdd, title='Core', section_id='core')
+        for name in ('Planting', 'Harvest'):
+            GDDFeature.objects.create(section=section, feature_name=name, description='x')
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_convert_features_in_background(self):
+        response = self.client.post(reverse('games:convert_all_features', args=[self.gdd.pk]))
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(GameTask.objects.exists())
+
+        job = Job.objects.get(name='projects.convert_gdd_features')
+        self.assertEqual((job.kwargs, job.created_by), ({'gdd_id': self.gdd.pk}, self.user))
+        run_due_jobs()
+        self.assertEqual(GameTask.objects.count(), 2)
+        self.assertFalse(GDDFeature.objects.filter(task__isnull=True).exists())
+
+    @override_settings(JOBS_RUN_INLINE=True)
+    def test_inline_jobs(self):
+        # The job runs as soon as the request's transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('games:convert_all_features', args=[self.gdd.pk]))
+        self.assertEqual(GameTask.objects.count(), 2)
+        self.assertEqual(Job.objects.get().status, Job.STATUS_SUCCEEDED)
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_sync_returns_job(self):
+        response = self.client.post(reverse('core:sync_database'))
+        self.assertEqual(response.status_code, 202)
+        job = Job.objects.get(name='core.sync_database')
+        self.assertEqual(response.json()['status_url'], reverse('core:job_status', args=[job.pk]))
+
+        # One Git operation at a time: a second sync is the pending one
+        response = self.client.post(reverse('core:sync_database'))
+        self.assertEqual((response.status_code, response.json()['job_id']), (202, job.pk))
+
+        response = self.client.post(response.json()['cancel_url'])
+        self.assertEqual(response.json()['status'], Job.STATUS_CANCELLED)
+        self.assertEqual(self.client.post(reverse('core:job_cancel', args=[job.pk])).status_code, 409)
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_sync_status_fetches_in_background(self):
+        commands = []
+
+        def run_git_command(manager, *args, should_cancel=None):
+            commands.append(args[0])
+            return {'success': False, 'output': '', 'error': 'no git', 'returncode': 1}
+
+        with mock.patch.object(GitSyncManager, 'run_git_command', run_git_command):
+            for _ in range(2):
+                response = self.client.get(reverse('core:sync_status'))
+                self.assertEqual(response.status_code, 200)
+        self.assertNotIn('fetch', commands)
+        self.assertEqual(Job.objects.get(name='core.fetch_remote').status, Job.STATUS_QUEUED)
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_sync_after_status_check(self):
+        # The Sync button checks the status (queueing a fetch), then syncs
+        with mock.patch.object(GitSyncManager, 'get_sync_status', return_value={'fetched_at': None}):
+            self.client.get(reverse('core:sync_status'))
+        fetch = Job.objects.get(name='core.fetch_remote')
+
+        response = self.client.post(reverse('core:sync_database'), {'commit_message': 'Tasks'})
+        self.assertEqual(response.status_code, 202)
+        sync = Job.objects.get(name='core.sync_database')
+        self.assertEqual((response.json()['job_id'], sync.kwargs), (sync.pk, {'commit_message': 'Tasks'}))
+        self.assertNotEqual(sync, fetch)
+
+        # The sync waits for the fetch to finish instead of running alongside it
+        self.assertTrue(claim_job(fetch, 'worker'))
+        self.assertTrue(claim_job(sync, 'other worker'))
+        self.assertFalse(run_job(sync))
+        self.assertEqual(Job.objects.get(pk=sync.pk).status, Job.STATUS_QUEUED)
@@ -0,0 +1,84 @@
+"""
+Tests for the full-text Knowledge Base search.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from education.knowledge.models import KnowledgeArticle, KnowledgeCategory, KnowledgeTag
+from education.knowledge.search import article_snippets, rebuild_knowledge_search, search_articles
+
+
+class KnowledgeSearchTests(TestCase):
+    """Test ranking, prefix matching, facets and incremental updates."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kbuser', password='testpassword')
+        self.category = KnowledgeCategory.objects.create(name='Rendering')
+        self.tag = KnowledgeTag.objects.create(name='Shaders')
+
+        self.title_match = KnowledgeArticle.objects.create(
+            title='Shader basics', summary='Intro', content='<p>Vertex and fragment programs</p>',
+            author=self.user, category=self.category,
+        )
+        self.title_match.tags.add(self.tag)
+        self.body_match = KnowledgeArticle.objects.create(
+            title='Lighting', summary='Light models',
+            content='<p>Lighting is computed in a <strong>shader</strong></p>',
+            content_blocks=[{'type': 'text', 'title': 'Notes', 'text': '<em>Phong</em> shading', 'id': 'b1'}],
+            author=self.user,
+        )
+
+    def test_ranking_and_snippets(self):
+        articles = list(search_articles('shader').articles)
+        self.assertEqual(articles, [self.title_match, self.body_match])
+        snippet = article_snippets('shader', articles)[self.body_match.pk]
+        self.assertIn('<mark>shader</mark>', snippet)
+        self.assertNotIn('<strong>', snippet)
+
+    def test_prefix_blocks_and_facets(self):
+        result = search_articles('phon')
+        self.assertEqual(list(result.articles), [self.body_match])
+
+        result = search_articles('shader')
+        self.assertEqual([(c.name, c.hit_count) for c in result.category_facets], [('Rendering', 1)])
+        self.assertEqual([(t.name, t.hit_count) for t in result.tag_facets], [('Shaders', 1)])
+
+    def test_incremental_updates(self):
+        self.body_match.is_published = False
+        self.body_match.save()
+        self.assertEqual(search_articles('shader').articles.count(), 1)
+
+        self.title_match.delete()
+        self.assertFalse(search_articles('shader').articles.exists())
+
+        self.body_match.is_published = True
+        self.body_match.save()
+        self.assertEqual(rebuild_knowledge_search(), 1)
+        self.assertEqual(search_articles('lighting').articles.count(), 1)
+
+    def test_dashboard_and_suggestions(self):
+        client = Client()
+        client.login(username='kbuser', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = client.get(reverse('education:knowledge_base'), {'q': 'shader', 'category': 'rendering'})
+        self.assertEqual(list(response.context['articles']), [self.title_match])
+        self.assertEqual(len(response.context['category_facets']), 1)
+
+        response = client.get(reverse('education:knowledge_search_suggest'), {'q': 'light'})
+        self.assertEqual(response.json()['results'][0]['title'], 'Lighting')
+
+    def test_search_is_not_capped(self):
+        KnowledgeArticle.objects.bulk_create([
+            KnowledgeArticle(title=f'Shader shader {i}', slug=f'shader-{i}', summary='shader', content='', author=self.user)
+            for i in range(600)
+        ])
+        rebuild_knowledge_search()
+        result = search_articles('shader', KnowledgeArticle.objects.filter(category=self.category))
+        self.assertEqual(list(result.articles), [self.title_match])
+        self.assertEqual(search_articles('shader').articles.count(), 602)
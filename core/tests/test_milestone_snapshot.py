@@ -0,0 +1,78 @@
+"""
+Tests for the cached milestone snapshot behind the milestone context processors.
+"""
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory
+
+from core.context_processors import milestone_info
+from strategy.context_processors import strategy_milestone_info
+from projects.game_models import GameProject, GameMilestone, GameTask
+from strategy.models import StrategyPhase, StrategyMilestone
+
+
+class MilestoneSnapshotTests(TestCase):
+    """Test that the milestone banner is served from the cache and invalidated by signals."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.game = GameProject.objects.create(
+            title='PeacefulFarm', description='Farming game', start_date=date(2025, 1, 1),
+        )
+        self.milestone = GameMilestone.objects.create(
+            game=self.game, title='Build Game Portfolio', due_date=date(2025, 6, 1), status='in_progress',
+        )
+
+    def test_processors_share_one_cached_snapshot(self):
+        milestone_info(self.factory.get('/'))
+
+        request = self.factory.get('/')
+        with self.assertNumQueries(0):
+            context = milestone_info(request)
+            strategy_context = strategy_milestone_info(request)
+
+        self.assertEqual(context['milestone_title'], 'Build Game Portfolio')
+        self.assertEqual(context['game_title'], 'PeacefulFarm')
+        self.assertEqual(context['company_phase'].phase_type, 'indie_dev')
+        self.assertIsNone(strategy_context['strategy_in_progress_milestone'])
+
+    def test_milestone_change_invalidates_snapshot(self):
+        milestone_info(self.factory.get('/'))
+
+        phase = StrategyPhase.objects.create(
+            name='Arcade Machines', phase_type='arcade', description='Arcade phase',
+            order=2, start_year=2026, end_year=2028,
+        )
+        StrategyMilestone.objects.create(
+            title='Prototype First Arcade Cabinet', description='Cabinet', phase=phase, status='in_progress',
+        )
+
+        request = self.factory.get('/')
+        context = milestone_info(request)
+        strategy_context = strategy_milestone_info(request)
+        self.assertEqual(context['milestone_title'], 'Prototype First Arcade Cabinet')
+        self.assertEqual(strategy_context['strategy_company_phase'].order, 2)
+        # Everything the strategy debug page shows about the milestone
+        milestone = strategy_context['strategy_in_progress_milestone']
+        self.assertEqual((milestone.status, milestone.phase_id), ('in_progress', phase.pk))
+
+    def test_game_task_status_change_invalidates_snapshot(self):
+        self.milestone.status = 'not_started'
+        self.milestone.save()
+        other = GameMilestone.objects.create(
+            game=self.game, title='Open First Arcade Location', due_date=date(2026, 1, 1),
+        )
+        task = GameTask.objects.create(title='Wire cabinet', milestone=other, status='to_do')
+        self.assertEqual(milestone_info(self.factory.get('/'))['milestone_title'], 'Release First Indie Game')
+
+        task.status = 'in_progress'
+        task.save()
+        context = milestone_info(self.factory.get('/'))
+        self.assertEqual(context['milestone_title'], 'Open First Arcade Location')
+        self.assertEqual(context['phase_type'], 'arcade')
+
+        # Rendering the banner never writes milestone status back
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'not_started')
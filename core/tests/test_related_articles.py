@@ -0,0 +1,96 @@
+"""
+Tests for the precomputed related-articles index.
+"""
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from education.knowledge.models import KnowledgeArticle, KnowledgeTag, RelatedArticle
+from core.job_queue import run_due_jobs
+from core.models import Job
+from education.jobs import REFRESH_RELATED_ARTICLES_JOB
+from education.knowledge import related
+from education.knowledge.related import rebuild_related_articles
+
+
+class RelatedArticlesTests(TestCase):
+    """Test similarity ranking and incremental refreshes."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kbuser', password='testpassword')
+        self.tag = KnowledgeTag.objects.create(name='Shaders')
+        # Run the refreshes the creates schedule, so later changes are not folded into them
+        with self.captureOnCommitCallbacks(execute=True):
+            self.shaders = self._article('Shader basics', 'Vertex shaders and fragment shaders in a render pipeline')
+            self.lighting = self._article('Lighting shaders', 'Fragment shaders compute lighting in the render pipeline')
+            self.audio = self._article('Audio mixing', 'Mixing sound effects and music tracks')
+        Job.objects.all().delete()
+        rebuild_related_articles()
+
+    def _article(self, title, content):
+        return KnowledgeArticle.objects.create(title=title, content=f'<p>{content}</p>', author=self.user)
+
+    def test_ranking(self):
+        self.assertEqual(self.shaders.get_related_articles(), [self.lighting])
+        self.assertFalse(RelatedArticle.objects.filter(article=self.audio).exists())
+
+    def test_refresh_on_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.audio.content = '<p>Shaders for audio visualisers in the render pipeline</p>'
+            self.audio.save()
+        self.assertIn(self.audio, self.shaders.get_related_articles(limit=5))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lighting.tags.add(self.tag)
+            self.audio.tags.add(self.tag)
+        self.assertEqual(self.lighting.get_related_articles(limit=1), [self.audio])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lighting.delete()
+        self.assertEqual(self.shaders.get_related_articles(), [self.audio])
+
+    def test_one_refresh_per_transaction(self):
+        with mock.patch.object(related, '_Corpus', wraps=related._Corpus) as corpus:
+            with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+                self.audio.content = '<p>Shaders for audio visualisers in the render pipeline</p>'
+                self.audio.save()
+                self.audio.tags.set([self.tag])
+                self.lighting.tags.add(self.tag)
+        self.assertEqual(corpus.call_count, 1)
+        self.assertEqual(Job.objects.get(name=REFRESH_RELATED_ARTICLES_JOB).kwargs,
+                         {'article_ids': sorted([self.audio.pk, self.lighting.pk])})
+        self.assertEqual(self.lighting.get_related_articles(limit=1), [self.audio])
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_rolled_back_refresh_is_not_joined(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    self.audio.tags.add(self.tag)
+                    raise RuntimeError('Form invalid')
+            except RuntimeError:
+                pass
+            self.lighting.tags.add(self.tag)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(callbacks[0].article_ids, {self.lighting.pk})
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_refresh_runs_in_a_job(self):
+        with mock.patch.object(related, '_Corpus', wraps=related._Corpus) as corpus:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.audio.tags.add(self.tag)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.lighting.tags.add(self.tag)
+            # Nothing is computed in the request, and the second change joined the queued job
+            self.assertEqual(corpus.call_count, 0)
+            job = Job.objects.get(name=REFRESH_RELATED_ARTICLES_JOB)
+            self.assertEqual(job.kwargs, {'article_ids': sorted([self.audio.pk, self.lighting.pk])})
+
+            self.assertEqual(run_due_jobs(), 1)
+        self.assertEqual(corpus.call_count, 1)
+        # Sharing the tag is enough to be related
+        self.assertIn(self.audio, self.lighting.get_related_articles(limit=5))
@@ -0,0 +1,80 @@
+"""
+Tests for the SQLite connection settings and the locked-write retries.
+"""
+from django.db import OperationalError, connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.sqlite_tuning import apply_sqlite_pragmas, retry_on_locked, sqlite_pragmas
+
+
+class SQLitePragmaTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_new_connections_get_the_production_profile(self):
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('cache_size'), -64 * 1024)
+        self.assertEqual(self.pragma('temp_store'), 2)
+
+    @override_settings(SQLITE_PROFILE='production', SQLITE_PRAGMAS={'cache_size': -2000, 'mmap_size': None})
+    def test_overrides_replace_or_drop_profile_pragmas(self):
+        pragmas = sqlite_pragmas()
+        self.assertEqual(pragmas['cache_size'], -2000)
+        self.assertNotIn('mmap_size', pragmas)
+        self.assertEqual(pragmas['journal_mode'], 'WAL')
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': '1; DROP TABLE core_job'})
+    def test_invalid_values_are_rejected(self):
+        with self.assertRaises(ValueError):
+            apply_sqlite_pragmas(connection=connection)
+
+    @override_settings(SQLITE_PROFILE='fast')
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            sqlite_pragmas()
+
+
+class RetryOnLockedTests(SimpleTestCase):
+    def flaky(self, failures, message='database is locked'):
+        calls = []
+
+        @retry_on_locked(attempts=3, delay=0)
+        def write():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise OperationalError(message)
+            return 'written'
+        return write, calls
+
+    def test_locked_writes_are_retried(self):
+        write, calls = self.flaky(failures=2)
+        self.assertEqual(write(), 'written')
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_after_the_last_attempt(self):
+        write, calls = self.flaky(failures=3)
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 3)
+
+    def test_other_errors_are_not_retried(self):
+        write, calls = self.flaky(failures=1, message='no such table: core_job')
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+
+class RetryInsideTransactionTests(TestCase):
+    def test_not_retried_inside_an_atomic_block(self):
+        calls = []
+
+        @retry_on_locked(attempts=3, delay=0)
+        def write():
+            calls.append(1)
+            raise OperationalError('database is locked')
+
+        with transaction.atomic(), self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,66 @@
+"""
+Tests for the diffing subtask synchronizer and batched subtask loading.
+"""
+from django.test import TestCase
+
+from core.subtask_handler import parse_subtask_data, sync_subtasks
+from core.task_utils import get_task_subtasks, prefetch_task_subtasks
+from projects.task_models import ArcadeTask, R1D3Task
+
+
+class SubtaskSyncTests(TestCase):
+    """Test matching, bulk writes and id stability."""
+
+    def setUp(self):
+        self.task = R1D3Task.objects.create(title='Ship it', has_subtasks=True)
+        changes = sync_subtasks(self.task, parse_subtask_data([
+            '{"title": "Write"}', '{"title": "Review"}', '{"title": "Merge"}', 'not json', '{"title": " "}',
+        ]))
+        self.assertEqual(len(changes.created), 3)
+        self.ids = {subtask.title: subtask.id for subtask in get_task_subtasks(self.task)}
+
+    def test_diff_keeps_ids(self):
+        submitted = parse_subtask_data([
+            '{"id": %d, "title": "Write docs", "is_completed": true}' % self.ids['Write'],
+            '{"title": "Review"}',
+            '{"title": "Release"}',
+        ])
+        with self.assertNumQueries(9):
+            # savepoint, select, delete (collect, delete, change log),
+            # update, insert, change log insert, release
+            changes = sync_subtasks(self.task, submitted)
+
+        self.assertEqual([s.title for s in changes.created], ['Release'])
+        self.assertEqual([s.id for s in changes.updated], [self.ids['Write']])
+        self.assertEqual([s.id for s in changes.deleted], [self.ids['Merge']])
+        self.assertEqual([s.id for s in changes.unchanged], [self.ids['Review']])
+
+        subtasks = {subtask.title: subtask for subtask in get_task_subtasks(self.task)}
+        self.assertEqual(set(subtasks), {'Write docs', 'Review', 'Release'})
+        self.assertEqual(subtasks['Write docs'].id, self.ids['Write'])
+        self.assertTrue(subtasks['Write docs'].is_completed)
+
+    def test_clear(self):
+        changes = sync_subtasks(self.task, [])
+        self.assertEqual(len(changes.deleted), 3)
+        self.assertFalse(get_task_subtasks(self.task).exists())
+
+
+class SubtaskPrefetchTests(TestCase):
+    """Test loading subtasks for a mixed list of tasks."""
+
+    def test_prefetch_mixed_tasks(self):
+        tasks = [
+            R1D3Task.objects.create(title='One', has_subtasks=True),
+            R1D3Task.objects.create(title='Two'),
+            ArcadeTask.objects.create(title='Three', has_subtasks=True),
+        ]
+        sync_subtasks(tasks[0], [{'title': 'A', 'is_completed': True}, {'title': 'B', 'is_completed': False}])
+        sync_subtasks(tasks[2], [{'title': 'C', 'is_completed': True}])
+
+        with self.assertNumQueries(2):
+            prefetch_task_subtasks(tasks)
+        with self.assertNumQueries(0):
+            progress = [(t.get_subtask_count(), t.get_completed_subtask_count(), t.get_subtask_progress()) for t in tasks]
+        self.assertEqual(progress, [(2, 1, 50), (0, 0, 100), (1, 1, 100)])
+        self.assertEqual([s.title for s in tasks[0].subtasks_cached], ['A', 'B'])
@@ -0,0 +1,172 @@
+"""
+Tests for the denormalized TaskIndex table, the task search index and
+the global task dashboard that reads from them.
+"""
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from projects.task_models import R1D3Task, ArcadeTask
+from indie_news.models import IndieNewsTask
+from core.models import TaskIndex
+from core.task_index import rebuild_task_index, reindex_tasks
+from core.task_search import filter_tasks, task_snippets
+
+
+class TaskIndexSignalTests(TestCase):
+    """Test that task writes keep the index in sync."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='indexuser', password='testpassword')
+
+    def test_save_creates_and_updates_entry(self):
+        task = ArcadeTask.objects.create(title='Fix joystick', status='to_do', assigned_to=self.user)
+        entry = TaskIndex.objects.get(section='arcade', task_id=task.id)
+        self.assertEqual(entry.title, 'Fix joystick')
+        self.assertEqual(entry.assigned_to, self.user)
+
+        task.status = 'done'
+        task.save()
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'done')
+        self.assertEqual(TaskIndex.objects.count(), 1)
+
+    def test_delete_removes_entry(self):
+        task = IndieNewsTask.objects.create(title='Review a roguelike')
+        self.assertTrue(TaskIndex.objects.filter(section='indie_news', task_id=task.id).exists())
+        task.delete()
+        self.assertFalse(TaskIndex.objects.filter(section='indie_news').exists())
+
+    def test_reindex_after_queryset_update(self):
+        task = R1D3Task.objects.create(title='Plan roadmap', status='to_do')
+        R1D3Task.objects.filter(pk=task.pk).update(status='in_review')
+        reindex_tasks(R1D3Task, [task.pk])
+        self.assertEqual(TaskIndex.objects.get(section='r1d3', task_id=task.pk).status, 'in_review')
+
+    def test_rebuild(self):
+        R1D3Task.objects.create(title='Task one')
+        ArcadeTask.objects.create(title='Task two')
+        TaskIndex.objects.all().delete()
+        counts = rebuild_task_index()
+        self.assertEqual(counts['r1d3'], 1)
+        self.assertEqual(counts['arcade'], 1)
+        self.assertEqual(TaskIndex.objects.count(), 2)
+
+
+class GlobalTaskDashboardIndexTests(TestCase):
+    """Test the global dashboard served from the task index."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='dashuser', password='testpassword')
+        self.client = Client()
+        self.client.login(username='dashuser', password='testpassword')
+        session = self.client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        R1D3Task.objects.create(title='Open R1D3 task', status='to_do')
+        ArcadeTask.objects.create(title='Open arcade task', status='in_progress', assigned_to=self.user)
+        ArcadeTask.objects.create(title='Finished arcade task', status='done')
+
+    def test_dashboard_lists_open_tasks(self):
+        response = self.client.get(reverse('core:global_task_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Open R1D3 task')
+        self.assertContains(response, 'Open arcade task')
+        self.assertNotContains(response, 'Finished arcade task')
+        self.assertEqual(response.context['task_stats']['total'], 3)
+        self.assertEqual(response.context['task_stats']['done'], 1)
+
+    def test_dashboard_filters(self):
+        response = self.client.get(reverse('core:global_task_dashboard'), {
+            'company_section': 'arcade', 'assigned_to': 'me',
+        })
+        titles = [task.title for task in response.context['tasks']]
+        self.assertEqual(titles, ['Open arcade task'])
+
+        section_counts = {s['section_name']: s['count'] for s in response.context['section_stats']}
+        self.assertEqual(section_counts['arcade'], 2)
+        self.assertEqual(section_counts['r1d3'], 1)
+
+    def test_stats_cache_invalidated_by_task_write(self):
+        url = reverse('core:global_task_dashboard')
+        self.assertEqual(self.client.get(url).context['task_stats']['total'], 3)
+        R1D3Task.objects.create(title='Another task')
+        self.assertEqual(self.client.get(url).context['task_stats']['total'], 4)
+
+
+class TaskSearchTests(TestCase):
+    """Test the full-text task search kept in sync with the index."""
+
+    def setUp(self):
+        cache.clear()
+        self.task = ArcadeTask.objects.create(
+            title='Replace coin mechanism', description='The <b>coin</b> slot jams on cabinet 3',
+            tags='hardware',
+        )
+        R1D3Task.objects.create(title='Quarterly planning', description='Budget review')
+
+    def search(self, query):
+        return list(filter_tasks(TaskIndex.objects.all(), query))
+
+    def test_ranked_results_with_snippets(self):
+        entries = self.search('coin')
+        entry = TaskIndex.objects.get(section='arcade', task_id=self.task.id)
+        self.assertEqual(entries, [entry])
+        # Matches are highlighted and the indexed text is escaped
+        snippet = task_snippets('coin', entries)[entry.pk]
+        self.assertIn('<mark>coin</mark>', snippet)
+        self.assertNotIn('<b>', snippet)
+
+    def test_prefix_and_updates(self):
+        self.assertEqual(len(self.search('hardw')), 1)
+        self.task.tags = 'electrical'
+        self.task.save()
+        self.assertEqual(self.search('hardware'), [])
+        self.assertEqual(len(self.search('electrical')), 1)
+
+        self.task.delete()
+        self.assertEqual(self.search('electrical'), [])
+
+    def test_search_survives_reindex_and_rebuild(self):
+        ArcadeTask.objects.filter(pk=self.task.pk).update(title='Replace token mechanism')
+        reindex_tasks(ArcadeTask, [self.task.pk])
+        self.assertEqual(len(self.search('token')), 1)
+
+        rebuild_task_index()
+        self.assertEqual(self.search('token'), [TaskIndex.objects.get(section='arcade')])
+
+    def test_dashboard_search(self):
+        User.objects.create_user(username='searchuser', password='testpassword')
+        client = Client()
+        client.login(username='searchuser', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = client.get(reverse('core:global_task_dashboard'), {'search': 'budget'})
+        self.assertEqual([task.title for task in response.context['tasks']], ['Quarterly planning'])
+        self.assertContains(response, '<mark>Budget</mark>')
+
+    def test_dashboard_search_filters_before_ranking(self):
+        # More done tasks outrank the open one than a capped hit list would hold
+        ArcadeTask.objects.bulk_create([
+            ArcadeTask(title=f'Widget repair {i}', status='done') for i in range(600)
+        ])
+        ArcadeTask.objects.create(title='Cabinet check', description='Check the widget')
+        rebuild_task_index()
+        User.objects.create_user(username='searchuser', password='testpassword')
+        client = Client()
+        client.login(username='searchuser', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = client.get(reverse('core:global_task_dashboard'), {'search': 'widget'})
+        self.assertEqual([task.title for task in response.context['tasks']], ['Cabinet check'])
+
+        response = client.get(reverse('core:global_task_dashboard'), {'search': 'widget', 'status': 'done'})
+        self.assertEqual(response.context['paginator'].count, 600)
+        self.assertIn('<mark>Widget</mark>', response.context['tasks'][0].search_snippet)
@@ -0,0 +1,19 @@
+"""
+Tests for the composite indexes the section task models inherit from BaseTask.
+"""
+from django.test import TestCase
+
+from core.model_utils import get_task_model_map
+from projects.task_models import BaseTask, ArcadeTask
+
+
+class SectionTaskMetaTests(TestCase):
+    """The section task models get BaseTask's indexes but not its ordering."""
+
+    def test_indexes_without_default_ordering(self):
+        models = [model for model in get_task_model_map().values() if issubclass(model, BaseTask)]
+        self.assertIn(ArcadeTask, models)
+        for model in models:
+            self.assertFalse(model.objects.all().ordered, model)
+            index_fields = {tuple(index.fields) for index in model._meta.indexes}
+            self.assertIn(('status', 'due_date'), index_fields, model)
@@ -0,0 +1,42 @@
+"""
+Tests for the UNION ALL task query builder used by the all-tasks dashboard.
+"""
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from projects.task_models import R1D3Task, ArcadeTask, EducationTask
+from projects.task_query import TaskUnionQuery
+
+
+class TaskUnionQueryTests(TestCase):
+    """Test filtering, ordering and paging across the section tables."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='queryuser', password='testpassword')
+        R1D3Task.objects.create(title='Low priority', priority='low')
+        ArcadeTask.objects.create(title='Critical undated', priority='critical', assigned_to=self.user)
+        ArcadeTask.objects.create(title='Critical later', priority='critical', due_date=date(2030, 1, 1))
+        EducationTask.objects.create(title='Critical sooner', priority='critical', due_date=date(2029, 1, 1), status='done')
+
+    def test_rows_ordered_by_priority_then_due_date(self):
+        titles = [row.title for row in TaskUnionQuery().rows()]
+        self.assertEqual(titles, ['Critical sooner', 'Critical later', 'Critical undated', 'Low priority'])
+
+    def test_filters_apply_to_every_section(self):
+        rows = TaskUnionQuery().filter(assigned_to=self.user).rows()
+        self.assertEqual([(row.section, row.title) for row in rows], [('arcade', 'Critical undated')])
+        self.assertEqual(TaskUnionQuery().filter(status='to_do').count(), 3)
+
+    def test_page_and_grouped_counts(self):
+        task_query = TaskUnionQuery()
+        with self.assertNumQueries(2):
+            page = task_query.page(2, per_page=3)
+            rows = list(page.object_list)
+        self.assertEqual(page.paginator.count, 4)
+        self.assertEqual([row.title for row in rows], ['Low priority'])
+        self.assertEqual(rows[0].get_priority_display(), 'Low')
+
+        self.assertEqual(task_query.counts_by('priority'), {'critical': 3, 'low': 1})
+        self.assertEqual(task_query.counts_by('section'), {'r1d3': 1, 'arcade': 2, 'education': 1})
@@ -0,0 +1,82 @@
+"""
+Tests for bulk task status changes.
+"""
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from core.models import TaskIndex
+from core.task_status import bulk_update_task_status
+from projects.game_models import GameDesignDocument, GameProject, GameTask, GDDFeature, GDDSection
+from projects.task_models import ArcadeTask, Epic, EpicStats, R1D3Task
+
+
+class BulkTaskStatusTests(TestCase):
+    """Test grouped updates, side effects and per-item results."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kanban', password='testpassword')
+        self.epic = Epic.objects.create(title='Launch', company_section='r1d3')
+        self.r1d3 = [R1D3Task.objects.create(title=f'R{i}', epic=self.epic, status='to_do') for i in range(3)]
+        self.arcade = ArcadeTask.objects.create(title='Cabinet', status='backlog')
+
+        game = GameProject.objects.create(title='Farm', description='Farming', start_date=date(2025, 1, 1))
+        gdd = GameDesignDocument.objects.create(game=game, high_concept='x', player_experience='x', core_mechanics='x')
+        section = GDDSection.objects.create(gdd=gdd, title='Core', section_id='core')
+        self.game_task = GameTask.objects.create(title='Plant', game=game, status='to_do')
+        self.feature = GDDFeature.objects.create(section=section, feature_name='Planting', description='x', task=self.game_task)
+
+    def test_bulk_update(self):
+        updates = [
+            {'task_type': 'r1d3', 'task_id': task.pk, 'status': 'done'} for task in self.r1d3
+        ] + [
+            {'task_type': 'ArcadeTask', 'task_id': self.arcade.pk, 'status': 'in_progress'},
+            {'task_type': 'game', 'task_id': self.game_task.pk, 'status': 'in_review'},
+            {'task_type': 'r1d3', 'task_id': 999999, 'status': 'done'},
+            {'task_type': 'r1d3', 'task_id': self.r1d3[0].pk, 'status': 'nope'},
+            {'task_type': 'unknown', 'task_id': 1, 'status': 'done'},
+        ]
+        results = bulk_update_task_status(updates)
+
+        self.assertEqual([r['success'] for r in results], [True] * 5 + [False] * 3)
+        self.assertEqual([r['code'] for r in results[5:]], [404, 400, 400])
+        self.assertEqual(results[0]['old_status'], 'to_do')
+        self.assertEqual(results[3]['status_display'], 'In Progress')
+
+        self.assertEqual(R1D3Task.objects.filter(status='done').count(), 3)
+        self.assertEqual(GDDFeature.objects.get(pk=self.feature.pk).status, 'in_review')
+        self.assertEqual(TaskIndex.objects.get(section='arcade', task_id=self.arcade.pk).status, 'in_progress')
+        self.assertEqual(EpicStats.objects.get(epic=self.epic).done_count, 3)
+
+    def test_endpoints(self):
+        client = Client()
+        client.login(username='kanban', password='testpassword')
+        session = client.session
+        session['current_user_name'] = 'Ricardo'
+        session.save()
+
+        response = client.post(
+            reverse('core:bulk_update_task_status'),
+            json.dumps({'updates': [
+                {'task_type': 'r1d3', 'task_id': self.r1d3[0].pk, 'status': 'blocked'},
+                {'task_type': 'r1d3', 'task_id': 'abc', 'status': 'done'},
+            ]}),
+            content_type='application/json',
+        )
+        data = response.json()
+        self.assertEqual((data['success'], data['updated_count']), (False, 1))
+        self.assertEqual(data['results'][1]['error'], 'Invalid task ID: abc')
+
+        response = client.post(reverse('core:update_task_status'), {
+            'task_type': 'R1D3Task', 'task_id': self.r1d3[1].pk, 'status': 'in_review',
+        })
+        self.assertEqual(response.json()['status_display'], 'In Review')
+        response = client.post(reverse('core:update_task_status'), {
+            'task_type': 'r1d3', 'task_id': 999999, 'status': 'done',
+        })
+        self.assertEqual(response.status_code, 404)
@@ -7,8 +7,9 @@ from .quick_link_views import (
 from .debug_views import debug_milestones
 from .views_milestone import get_milestone_display, test_milestone_update
 from .profile_views import select_profile, clear_profile
-from .sync_views import sync_database, sync_status, pull_database
+from .sync_views import sync_database, sync_status, pull_database, sync_digest, sync_digest_rows
 from .subtask_views import toggle_subtask
+from .job_views import job_cancel, job_status
 
 app_name = 'core'
 
@@ -41,6 +42,7 @@ urlpatterns = [
     
     # AJAX Task Status Update
     path('R1D3-tasks/update-status/', views.update_task_status, name='update_task_status'),
+    path('tasks/bulk-update-status/', views.bulk_update_task_status_view, name='bulk_update_task_status'),
     path('quick-links/reorder/', reorder_quick_links, name='quick_link_reorder'),
     
     # Milestone display endpoints
@@ -54,6 +56,12 @@ urlpatterns = [
     path('api/sync/database/', sync_database, name='sync_database'),
     path('api/sync/status/', sync_status, name='sync_status'),
     path('api/sync/pull/', pull_database, name='pull_database'),
+    path('api/sync/digest/', sync_digest, name='sync_digest'),
+    path('api/sync/digest/rows/', sync_digest_rows, name='sync_digest_rows'),
+    
+    # Background jobs
+    path('api/jobs/<int:pk>/', job_status, name='job_status'),
+    path('api/jobs/<int:pk>/cancel/', job_cancel, name='job_cancel'),
     
     # Subtask API
     path('api/subtasks/<int:subtask_id>/toggle/', toggle_subtask, name='toggle_subtask'),
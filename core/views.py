@@ -12,6 +12,7 @@ from datetime import date, timedelta, datetime
 import json
 from django.template.loader import render_to_string
 from django.core.cache import cache
+from django.core.paginator import Paginator
 
 # Import Git sync manager
 from .git_sync import GitSyncManager
@@ -24,6 +25,10 @@ from .context_processors import breadcrumbs_processor
 
 # Import model utilities
 from .model_utils import get_task_model_map, get_task_type_for_model
+from .models import TaskIndex
+from .task_search import filter_tasks, task_snippets
+from .task_status import bulk_update_task_status
+from . import cache_tags
 
 # Import task models for dashboard stats
 TASK_MODELS_AVAILABLE = False
@@ -360,6 +365,8 @@ class GlobalTaskDashboardView(LoginRequiredMixin, View):
     template_name = 'core/global_task_dashboard.html'
     login_url = '/'  # Temporarily changed from '/accounts/login/' while allauth is disabled
     
+    paginate_by = 50
+    
     def get_template_names(self):
         return [self.template_name]
     
@@ -372,143 +379,81 @@ class GlobalTaskDashboardView(LoginRequiredMixin, View):
         due_date_filter = request.GET.get('due_date', '')
         search_query = request.GET.get('search', '')
         
-        # Get all tasks from all available task models
-        from projects.task_models import (
-            R1D3Task, GameDevelopmentTask, EducationTask,
-            SocialMediaTask, ArcadeTask, ThemeParkTask
-        )
-        
-        # Import indie news tasks
-        indie_news_tasks = []
-        try:
-            from indie_news.models import IndieNewsTask
-            indie_news_tasks = list(IndieNewsTask.objects.all())
-            print(f"Loaded {len(indie_news_tasks)} indie news tasks")
-            # Debug info for indie news tasks
-            for task in indie_news_tasks:
-                print(f"  - Indie News Task: {task.title} (ID: {task.id})")
-        except ImportError as e:
-            print(f"IndieNewsTask model not available: {e}")
-            pass
-        
-        # Get tasks from each model - GlobalTaskDashboard shows ALL tasks
-        r1d3_tasks = list(R1D3Task.objects.all())
-        game_dev_tasks = list(GameDevelopmentTask.objects.all())
-        education_tasks = list(EducationTask.objects.all())
-        social_media_tasks = list(SocialMediaTask.objects.all())
-        arcade_tasks = list(ArcadeTask.objects.all())
-        theme_park_tasks = list(ThemeParkTask.objects.all())
-        
-        # For backward compatibility, also get tasks from the legacy GameTask model
-        game_tasks = list(GameTask.objects.all())
-        
-        # Add task_type information to each task
-        for task in r1d3_tasks:
-            task.task_type = 'r1d3'
-        
-        for task in game_dev_tasks:
-            task.task_type = 'game_development'
-            
-        for task in education_tasks:
-            task.task_type = 'education'
-            
-        for task in social_media_tasks:
-            task.task_type = 'social_media'
-            
-        for task in arcade_tasks:
-            task.task_type = 'arcade'
-            
-        for task in theme_park_tasks:
-            task.task_type = 'theme_park'
-            
-        for task in game_tasks:
-            task.task_type = 'game'
-            
-        # Add task_type information to indie news tasks
-        for task in indie_news_tasks:
-            task.task_type = 'indie_news'
-            
-        # Combine all tasks into a single list
-        all_tasks = r1d3_tasks + game_dev_tasks + education_tasks + social_media_tasks + arcade_tasks + theme_park_tasks + game_tasks + indie_news_tasks
-        
-        # Sort tasks by created_at (newest first)
-        tasks = sorted(all_tasks, key=lambda x: x.created_at, reverse=True)
-        
-        # Apply filters - since we're working with a Python list, we need to filter manually
-        filtered_tasks = tasks
+        # All sections are read from the denormalized task index, which is
+        # kept current by signals (see core.signals)
+        all_tasks = TaskIndex.objects.all()
+        tasks = all_tasks.select_related('assigned_to')
         
         # Filter by status
         if status_filter and status_filter != 'all':
-            filtered_tasks = [task for task in filtered_tasks if task.status == status_filter]
+            tasks = tasks.filter(status=status_filter)
         else:
             # By default, exclude tasks with 'done' status unless explicitly requested
-            filtered_tasks = [task for task in filtered_tasks if task.status != 'done']
+            tasks = tasks.exclude(status='done')
         
         # Filter by priority
         if priority_filter and priority_filter != 'all':
-            filtered_tasks = [task for task in filtered_tasks if task.priority == priority_filter]
+            tasks = tasks.filter(priority=priority_filter)
         
         # Filter by assigned_to
         if assigned_filter == 'me':
-            filtered_tasks = [task for task in filtered_tasks if task.assigned_to == request.user]
-            print(f"Tasks after assigned_to filter 'me': {len(filtered_tasks)}")
+            tasks = tasks.filter(assigned_to=request.user)
         elif assigned_filter == 'unassigned':
-            filtered_tasks = [task for task in filtered_tasks if task.assigned_to is None]
-            print(f"Tasks after assigned_to filter 'unassigned': {len(filtered_tasks)}")
+            tasks = tasks.filter(assigned_to__isnull=True)
         
-        # For company section, we need to check the task_type attribute
+        # Filter by company section
         if company_section_filter:
-            # Use the task_type attribute we added to each task
-            filtered_tasks = [task for task in filtered_tasks if task.task_type == company_section_filter]
+            tasks = tasks.filter(section=company_section_filter)
         
         today = date.today()
+        open_statuses = ['to_do', 'in_progress', 'blocked']
         if due_date_filter == 'overdue':
-            filtered_tasks = [task for task in filtered_tasks if task.due_date and task.due_date < today and task.status in ['to_do', 'in_progress', 'blocked']]
+            tasks = tasks.filter(due_date__lt=today, status__in=open_statuses)
         elif due_date_filter == 'today':
-            filtered_tasks = [task for task in filtered_tasks if task.due_date and task.due_date == today]
+            tasks = tasks.filter(due_date=today)
         elif due_date_filter == 'this_week':
             end_of_week = today + timedelta(days=(6 - today.weekday()))
-            filtered_tasks = [task for task in filtered_tasks if task.due_date and today <= task.due_date <= end_of_week]
+            tasks = tasks.filter(due_date__range=(today, end_of_week))
         
+        # Full-text search ranks the filtered entries, best match first
+        searched = None
         if search_query:
-            filtered_tasks = [task for task in filtered_tasks if 
-                             search_query.lower() in task.title.lower() or 
-                             (task.description and search_query.lower() in task.description.lower())]
-            
-        # Update tasks with filtered results
-        tasks = filtered_tasks
-        
-        # Calculate task statistics from the combined task list
-        today = date.today()
-        task_stats = {
-            'total': len(all_tasks),
-            'to_do': len([t for t in all_tasks if t.status == 'to_do']),
-            'in_progress': len([t for t in all_tasks if t.status == 'in_progress']),
-            'in_review': len([t for t in all_tasks if t.status == 'in_review']),
-            'done': len([t for t in all_tasks if t.status == 'done']),
-            'backlog': len([t for t in all_tasks if t.status == 'backlog']),
-            'blocked': len([t for t in all_tasks if t.status == 'blocked']),
-            'overdue': len([t for t in all_tasks if t.due_date and t.due_date < today and t.status in ['to_do', 'in_progress', 'blocked']]),
-        }
-        
-        # Calculate section statistics using the new task models
-        # Count tasks by type using the specialized task models
-        section_stats = [
-            {'section_name': 'r1d3', 'count': len(r1d3_tasks)},
-            {'section_name': 'game_development', 'count': len(game_dev_tasks) + len([t for t in game_tasks if getattr(t, 'company_section', '') == 'game_development' or not getattr(t, 'company_section', '')])},
-            {'section_name': 'education', 'count': len(education_tasks) + len([t for t in game_tasks if getattr(t, 'company_section', '') == 'education'])},
-            {'section_name': 'social_media', 'count': len(social_media_tasks) + len([t for t in game_tasks if getattr(t, 'company_section', '') == 'social_media'])},
-            {'section_name': 'arcade', 'count': len(arcade_tasks) + len([t for t in game_tasks if getattr(t, 'company_section', '') == 'arcade'])},
-            {'section_name': 'theme_park', 'count': len(theme_park_tasks) + len([t for t in game_tasks if getattr(t, 'company_section', '') == 'theme_park'])},
-            {'section_name': 'indie_news', 'count': len(indie_news_tasks)},
-        ]
+            searched = filter_tasks(tasks, search_query)
+            if searched is None:
+                # No full-text support on this database
+                tasks = tasks.filter(title__icontains=search_query)
+            else:
+                tasks = searched
+        if searched is None:
+            # Newest first
+            tasks = tasks.order_by('-created_at')
+        
+        paginator = Paginator(tasks, self.paginate_by)
+        page_obj = paginator.get_page(request.GET.get('page'))
+        if searched is not None:
+            page_obj.object_list = list(page_obj.object_list)
+            snippets = task_snippets(search_query, page_obj.object_list)
+            for task in page_obj.object_list:
+                task.search_snippet = snippets.get(task.pk, '')
+        
+        # Dashboard statistics are cached until a task write invalidates the 'tasks' tag
+        task_stats, section_stats = cache_tags.get_or_set(
+            f'global_task_dashboard:stats:{today.isoformat()}',
+            lambda: self.get_task_stats(all_tasks, today),
+            tags=['tasks'],
+        )
         
         # Get recent and upcoming tasks
-        recent_tasks = sorted([t for t in all_tasks if t.status == 'done'], key=lambda x: x.updated_at, reverse=True)[:5]
-        upcoming_tasks = sorted([t for t in all_tasks if t.due_date and t.due_date >= today and t.status in ['to_do', 'in_progress']], key=lambda x: x.due_date)[:5]
+        recent_tasks = all_tasks.filter(status='done').order_by('-updated_at')[:5]
+        upcoming_tasks = all_tasks.filter(
+            due_date__gte=today, status__in=['to_do', 'in_progress']
+        ).order_by('due_date')[:5]
         
         context = {
-            'tasks': tasks,
+            'tasks': page_obj.object_list,
+            'page_obj': page_obj,
+            'paginator': paginator,
+            'is_paginated': page_obj.has_other_pages(),
             'task_stats': task_stats,
             'section_stats': section_stats,
             'recent_tasks': recent_tasks,
@@ -523,6 +468,41 @@ class GlobalTaskDashboardView(LoginRequiredMixin, View):
         }
         
         return render(request, self.template_name, context)
+    
+    @staticmethod
+    def get_task_stats(all_tasks, today):
+        """Compute status and section counts from the task index"""
+        open_statuses = ['to_do', 'in_progress', 'blocked']
+        
+        # Calculate task statistics in a single aggregate query
+        task_stats = all_tasks.aggregate(
+            total=Count('id'),
+            to_do=Count('id', filter=Q(status='to_do')),
+            in_progress=Count('id', filter=Q(status='in_progress')),
+            in_review=Count('id', filter=Q(status='in_review')),
+            done=Count('id', filter=Q(status='done')),
+            backlog=Count('id', filter=Q(status='backlog')),
+            blocked=Count('id', filter=Q(status='blocked')),
+            overdue=Count('id', filter=Q(due_date__lt=today, status__in=open_statuses)),
+        )
+        
+        # Count tasks per section; legacy GameTask rows are counted under
+        # their own company_section (blank means game development)
+        section_counts = {section: 0 for section in [
+            'r1d3', 'game_development', 'education', 'social_media',
+            'arcade', 'theme_park', 'indie_news',
+        ]}
+        for row in all_tasks.order_by().values('section', 'company_section').annotate(count=Count('id')):
+            section = row['section']
+            if section == 'game':
+                section = row['company_section'] or 'game_development'
+            if section in section_counts:
+                section_counts[section] += row['count']
+        section_stats = [
+            {'section_name': section, 'count': count}
+            for section, count in section_counts.items()
+        ]
+        return task_stats, section_stats
 
 
 class SocialMediaTaskDashboardView(LoginRequiredMixin, View):
@@ -652,128 +632,63 @@ class R1D3TaskCreateView(LoginRequiredMixin, CreateView):
         return context
 
 
+def _read_request_data(request):
+    """Parse a JSON body or fall back to form data; returns (data, error response)"""
+    # The body can only be read once, so never touch both request.POST and request.body
+    if request.content_type and 'application/json' in request.content_type:
+        try:
+            return json.loads(request.body), None
+        except json.JSONDecodeError as e:
+            return None, JsonResponse({'error': f'Invalid JSON: {str(e)}'}, status=400)
+    return request.POST, None
+
+
 @login_required
 @require_POST
 def update_task_status(request):
     """AJAX view to update task status directly from the task table."""
+    data, error = _read_request_data(request)
+    if error:
+        return error
+    
+    result = bulk_update_task_status([{
+        'task_type': data.get('task_type'),
+        'task_id': data.get('task_id'),
+        'status': data.get('status'),
+    }])[0]
+    if not result['success']:
+        return JsonResponse({'error': result['error']}, status=result['code'])
     
-    # Import the task models if they're not already available
-    global R1D3Task, GameDevelopmentTask, EducationTask, SocialMediaTask, ArcadeTask, ThemeParkTask, GameTask
-    
-    # If the models weren't imported successfully at the module level, try importing them now
-    if not TASK_MODELS_AVAILABLE:
-        try:
-            from projects.task_models import (
-                R1D3Task, GameDevelopmentTask, EducationTask,
-                SocialMediaTask, ArcadeTask, ThemeParkTask
-            )
-            from projects.game_models import GameTask
-        except ImportError as e:
-            return JsonResponse({'error': f'Task models not available: {str(e)}'}, status=500)
-    
-    # Handle both JSON and form data
-    print(f"DEBUG: Content-Type: {request.content_type}")
-    print(f"DEBUG: Request method: {request.method}")
-    
-    # IMPORTANT: We can only read the request body ONCE
-    # So we need to be careful not to access both request.POST and request.body
-    
-    # Check if it's JSON content
-    if request.content_type and 'application/json' in request.content_type:
-        try:
-            # For JSON requests, read the body directly
-            data = json.loads(request.body)
-            print(f"DEBUG: Parsed JSON data: {data}")
-        except json.JSONDecodeError as e:
-            print(f"DEBUG: JSON decode error: {e}")
-            return JsonResponse({'error': f'Invalid JSON: {str(e)}'}, status=400)
-    else:
-        # For form data, use request.POST but don't access request.body
-        data = request.POST
-        print(f"[DEBUG] Form data: {dict(data)}")
-    
-    # Log the data we received
-    print(f"[DEBUG] Received data: {data}")
-    
-    
-    task_id = data.get('task_id')
-    task_type = data.get('task_type')
-    status = data.get('status')
-    
-    print(f"[DEBUG] Task ID: {task_id}, Task Type: {task_type}, Status: {status}")
-    
-    # Validate required fields
-    if not all([task_id, task_type, status]):
-        missing = []
-        if not task_id: missing.append('task_id')
-        if not task_type: missing.append('task_type')
-        if not status: missing.append('status')
-        print(f"[DEBUG] Missing fields: {missing}")
-        return JsonResponse({'error': f'Missing required fields: {missing}'}, status=400)
-    
-    # Normalize task_type to lowercase for case-insensitive matching
-    task_type_lower = task_type.lower()
-    
-    # Comprehensive model mapping with both snake_case and CamelCase keys
-    model_map = {
-        # Snake case keys (normalized from frontend)
-        'r1d3': R1D3Task,
-        'game_development': GameDevelopmentTask,
-        'education': EducationTask,
-        'social_media': SocialMediaTask,
-        'arcade': ArcadeTask,
-        'theme_park': ThemeParkTask,
-        'game': GameTask,
-        # Class name keys (from template filter)
-        'r1d3task': R1D3Task,
-        'gamedevelopmenttask': GameDevelopmentTask,
-        'educationtask': EducationTask,
-        'socialmediatask': SocialMediaTask,
-        'arcadetask': ArcadeTask,
-        'themeparktask': ThemeParkTask,
-        'gametask': GameTask,
-    }
-    
-    # Try to get model using case-insensitive matching
-    model = None
-    for key, value in model_map.items():
-        if key.lower() == task_type_lower:
-            model = value
-            break
-    
-    if not model:
-        print(f"[DEBUG] Invalid task type: {task_type}")
-        return JsonResponse({'error': f'Invalid task type: {task_type}'}, status=400)
-    
-    print(f"[DEBUG] Using model: {model.__name__}")
-    
-    try:
-        task = model.objects.get(pk=task_id)
-        print(f"[DEBUG] Found task: {task}")
-    except model.DoesNotExist:
-        print(f"[DEBUG] Task not found: {task_id}")
-        return JsonResponse({'error': f'Task not found: {task_id}'}, status=404)
-    except ValueError as e:
-        print(f"[DEBUG] Invalid task ID: {task_id}, Error: {e}")
-        return JsonResponse({'error': f'Invalid task ID: {task_id}'}, status=400)
-    
-    valid_statuses = ['to_do', 'in_progress', 'in_review', 'done', 'backlog', 'blocked']
-    if status not in valid_statuses:
-        print(f"[DEBUG] Invalid status: {status}")
-        return JsonResponse({'error': f'Invalid status: {status}'}, status=400)
+    return JsonResponse({
+        'success': True,
+        'task_id': data.get('task_id'),
+        'status': result['status'],
+        'status_display': result['status_display'],
+    })
 
-    old_status = task.status
-    print(f"[DEBUG] Updating status from {old_status} to {status}")
-    task.status = status
-    task.save(update_fields=['status'])
-    print(f"[DEBUG] Task status updated successfully - ID: {task_id}, Old: {old_status}, New: {status}")
 
-    # Return success response
+@login_required
+@require_POST
+def bulk_update_task_status_view(request):
+    """
+    AJAX view to change the status of many tasks, from any sections, at once.
+    Expects JSON like {"updates": [{"task_type", "task_id", "status"}, ...]}
+    and returns one result per update.
+    """
+    data, error = _read_request_data(request)
+    if error:
+        return error
+    
+    updates = data.get('updates') if isinstance(data, dict) else None
+    if not isinstance(updates, list):
+        return JsonResponse({'error': 'Expected a list of updates'}, status=400)
+    
+    results = bulk_update_task_status(updates)
+    updated = sum(1 for result in results if result['success'])
     return JsonResponse({
-        'success': True,
-        'task_id': task_id,
-        'status': status,
-        'status_display': task.get_status_display() if hasattr(task, 'get_status_display') else status.replace('_', ' ').title()
+        'success': updated == len(results),
+        'updated_count': updated,
+        'results': results,
     })
 
 
@@ -2,8 +2,6 @@ from django.shortcuts import render
 from django.http import HttpResponse, JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.template.loader import render_to_string
-from django.core.cache import cache
-from django.db import connection
 from django.views.decorators.csrf import csrf_exempt
 
 @login_required
@@ -12,25 +10,9 @@ def get_milestone_display(request):
     AJAX endpoint to get the current milestone display HTML.
     This is used to update the milestone display without refreshing the page.
     """
-    # Clear any cached data to ensure we get fresh milestone data
-    cache.clear()
-    
-    # Reset database connection to ensure fresh queries
-    connection.close()
-    
-    # Force database connection to be closed and reopened
-    from django.db import connection
-    connection.close()
-    
-    # Import models directly to ensure fresh queries
-    from projects.game_models import GameMilestone
-    from django.utils import timezone
-    
-    # Get the milestone data from the context processor
-    from core.context_processors import breadcrumbs_processor
-    
-    # Force a fresh context
-    context_data = breadcrumbs_processor(request)
+    # Get the milestone data from the cached milestone snapshot
+    from core.context_processors import milestone_info
+    context_data = milestone_info(request)
     
     # Add a timestamp to force template refresh
     import time
@@ -96,19 +78,13 @@ def test_milestone_update(request):
     Test endpoint to verify that milestone updates are working correctly.
     This endpoint will return the current milestone data as JSON.
     """
-    # Clear any cached data to ensure we get fresh milestone data
-    cache.clear()
-    
-    # Reset database connection to ensure fresh queries
-    connection.close()
-    
-    # Get the milestone data from the context processor
-    from core.context_processors import breadcrumbs_processor
-    context_data = breadcrumbs_processor(request)
+    # Get the milestone data from the cached milestone snapshot
+    from core.context_processors import milestone_info
+    context_data = milestone_info(request)
     
     # Extract the milestone data
     milestone_data = {
-        'timestamp': context_data.get('milestone_debug', {}).get('timestamp', None),
+        'timestamp': context_data.get('debug_info', {}).get('timestamp', None),
         'in_progress_milestone': None,
         'company_phase': None,
     }
@@ -119,15 +95,13 @@ def test_milestone_update(request):
         milestone_data['in_progress_milestone'] = {
             'id': milestone.id,
             'title': milestone.title,
-            'due_date': str(milestone.due_date),
-            'is_completed': milestone.is_completed,
         }
     
     # Add company phase data if available
     if context_data.get('company_phase'):
         phase = context_data['company_phase']
         milestone_data['company_phase'] = {
-            'id': phase.id,
+            'id': getattr(phase, 'id', None),
             'name': phase.name,
             'phase_type': phase.phase_type,
             'order': phase.order,
@@ -0,0 +1,105 @@
+"""
+Pre-rendered course PDFs.
+
+A course's PDF is stored under MEDIA_ROOT at course_pdfs/<course>/<fingerprint>.pdf,
+where the fingerprint hashes the course, every related concept, topic,
+example and glossary row, and the PDF template itself. Downloads send the
+stored file (with the fingerprint as ETag) and only render when no file
+matches the current content. Saving a course or one of its rows schedules
+a background render (see core.signals), so the next download is usually
+ready.
+"""
+import hashlib
+import importlib.util
+import json
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.template.loader import get_template
+
+COURSE_PDF_DIR = 'course_pdfs/{course_id}'
+PDF_TEMPLATE = 'education/course/pdf_template.html'
+
+
+def _related_rows(course):
+    return {
+        'concepts': course.concepts.all().order_by('order'),
+        'advanced_topics': course.advanced_topics.all().order_by('order'),
+        'practical_examples': course.practical_examples.all().order_by('order'),
+        'glossary_terms': course.glossary_terms.all().order_by('term'),
+    }
+
+
+def course_fingerprint(course):
+    """SHA-256 of everything the course PDF is rendered from"""
+    content = {
+        'course': [getattr(course, field.attname) for field in course._meta.concrete_fields],
+        'author': [course.author.get_full_name(), course.author.username] if course.author else None,
+        'template': get_template(PDF_TEMPLATE).template.source,
+    }
+    for name, rows in _related_rows(course).items():
+        fields = [field.attname for field in rows.model._meta.concrete_fields]
+        content[name] = list(rows.order_by(*rows.query.order_by, 'pk').values_list(*fields))
+    return hashlib.sha256(json.dumps(content, cls=DjangoJSONEncoder).encode()).hexdigest()
+
+
+def course_pdf_path(course_id, fingerprint):
+    return f'{COURSE_PDF_DIR.format(course_id=course_id)}/{fingerprint}.pdf'
+
+
+def get_cached_pdf(course, fingerprint):
+    """Storage path of the PDF for this fingerprint, or None if not rendered yet"""
+    path = course_pdf_path(course.pk, fingerprint)
+    return path if default_storage.exists(path) else None
+
+
+def render_course_pdf(course):
+    """
+    Make sure the PDF for the course's current content exists, rendering
+    it if needed, and remove PDFs of older versions.
+    Returns (path, fingerprint).
+    """
+    fingerprint = course_fingerprint(course)
+    path = get_cached_pdf(course, fingerprint)
+    if path is None:
+        from weasyprint import HTML
+        from weasyprint.text.fonts import FontConfiguration
+
+        html_string = get_template(PDF_TEMPLATE).render({'course': course, **_related_rows(course)})
+        pdf = HTML(string=html_string).write_pdf(font_config=FontConfiguration())
+        path = course_pdf_path(course.pk, fingerprint)
+        # Another worker may have rendered the same version meanwhile
+        if not default_storage.exists(path):
+            path = default_storage.save(path, ContentFile(pdf))
+
+    delete_course_pdfs(course.pk, keep=path)
+    return path, fingerprint
+
+
+def delete_course_pdfs(course_id, keep=None):
+    """Delete a course's stored PDFs, except keep"""
+    directory = COURSE_PDF_DIR.format(course_id=course_id)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        path = f'{directory}/{name}'
+        if path != keep:
+            default_storage.delete(path)
+
+
+def schedule_course_pdf(course_id):
+    """
+    Render the course's PDF in the background once the current transaction
+    commits. Skipped when jobs run inline, so editing a course on a
+    development server does not wait for WeasyPrint.
+    """
+    if getattr(settings, 'JOBS_RUN_INLINE', False) or importlib.util.find_spec('weasyprint') is None:
+        return
+    from core.job_queue import enqueue
+    from education.jobs import RENDER_COURSE_PDF_JOB
+    transaction.on_commit(lambda: enqueue(RENDER_COURSE_PDF_JOB, unique=True, course_id=course_id))
@@ -2,14 +2,20 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy, reverse
-from django.http import HttpResponseRedirect, HttpResponse
+from django.http import HttpResponseRedirect, HttpResponse, FileResponse, JsonResponse
+from django.core.files.storage import default_storage
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django.db import transaction
 from django.contrib import messages
-from django.template.loader import render_to_string
 
-# WeasyPrint will be imported lazily when needed to avoid system dependency issues
+# WeasyPrint is imported lazily by the PDF job (education.jobs) to avoid system dependency issues
 
+from core.job_queue import enqueue, job_payload
 from core.mixins import BreadcrumbMixin
+from core.models import Job
+from education.jobs import RENDER_COURSE_PDF_JOB
+from .pdf_cache import course_fingerprint, get_cached_pdf
 from .models import Course, ConceptSection, AdvancedTopicSection, PracticalExample, GlossaryTerm
 from .forms import (
     CourseForm, 
@@ -236,49 +242,75 @@ class CourseDeleteView(BreadcrumbMixin, LoginRequiredMixin, DeleteView):
 
 
 class CoursePDFView(LoginRequiredMixin, View):
-    """View for exporting a course as PDF"""
+    """
+    View for exporting a course as PDF. The PDF for the course's current
+    content is sent from the pre-rendered cache (education.course.pdf_cache);
+    otherwise a background job renders it while a page polls the job and
+    comes back with ?job=<id> when it is done.
+    """
     
     def get(self, request, *args, **kwargs):
-        # Try to import WeasyPrint lazily
-        try:
-            from weasyprint import HTML
-            from weasyprint.text.fonts import FontConfiguration
-        except (ImportError, OSError) as e:
-            messages.error(request, f"PDF export is not available. WeasyPrint dependencies are missing: {str(e)}")
-            return redirect('education:course_detail', pk=self.kwargs['pk'])
-            
         # Get the course object
-        course = get_object_or_404(Course, pk=self.kwargs['pk'])
-        
-        # Get related objects
-        concepts = course.concepts.all().order_by('order')
-        advanced_topics = course.advanced_topics.all().order_by('order')
-        practical_examples = course.practical_examples.all().order_by('order')
-        glossary_terms = course.glossary_terms.all().order_by('term')
+        course = get_object_or_404(Course.objects.select_related('author'), pk=self.kwargs['pk'])
         
-        # Prepare context for the template
-        context = {
-            'course': course,
-            'concepts': concepts,
-            'advanced_topics': advanced_topics,
-            'practical_examples': practical_examples,
-            'glossary_terms': glossary_terms,
-        }
+        fingerprint = course_fingerprint(course)
+        path = get_cached_pdf(course, fingerprint)
+        if path is not None:
+            return self.pdf_response(request, course, path, fingerprint)
         
-        # Render the template to a string
-        html_string = render_to_string('education/course/pdf_template.html', context)
+        job_id = request.GET.get('job')
+        if job_id:
+            job = get_object_or_404(Job, pk=job_id, name=RENDER_COURSE_PDF_JOB, kwargs__course_id=course.pk)
+            if job.status == Job.STATUS_FAILED:
+                messages.error(request, f"Error generating PDF: {job_payload(job)['error']}")
+                return redirect('education:course_detail', pk=course.pk)
         
-        try:
-            # Generate PDF
-            font_config = FontConfiguration()
-            html = HTML(string=html_string, base_url=request.build_absolute_uri('/'))
-            pdf = html.write_pdf(font_config=font_config)
-            
-            # Create HTTP response with PDF
-            response = HttpResponse(pdf, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="{course.title}.pdf"'
-            
-            return response
-        except Exception as e:
-            messages.error(request, f"Error generating PDF: {str(e)}")
+        # The course changed since the job ran, or it has not run yet
+        job = enqueue(RENDER_COURSE_PDF_JOB, user=request.user, unique=True, course_id=course.pk)
+        # Finished already when jobs run inline
+        job.refresh_from_db()
+        if job.status == Job.STATUS_SUCCEEDED and default_storage.exists(job.result['path']):
+            return self.pdf_response(request, course, job.result['path'], job.result['fingerprint'])
+        if job.status == Job.STATUS_FAILED:
+            messages.error(request, f"Error generating PDF: {job_payload(job)['error']}")
             return redirect('education:course_detail', pk=course.pk)
+        
+        return render(request, 'education/course/pdf_pending.html', {
+            'course': course,
+            'job': job,
+            'status_url': reverse('education:course_pdf_status', args=[course.pk, job.pk]),
+            'download_url': f"{reverse('education:course_pdf', args=[course.pk])}?job={job.pk}",
+        })
+    
+    def pdf_response(self, request, course, path, fingerprint):
+        """Send a stored PDF, or 304 if the browser already has this version"""
+        etag = quote_etag(fingerprint)
+        last_modified = default_storage.get_modified_time(path).timestamp()
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        
+        response = FileResponse(
+            default_storage.open(path, 'rb'),
+            as_attachment=True, filename=f'{course.title}.pdf', content_type='application/pdf',
+        )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Revalidate every time, so an edited course is never served stale
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class CoursePDFStatusView(LoginRequiredMixin, View):
+    """
+    Status of a course's PDF render job, for the page waiting on it. Render
+    jobs are shared by everyone exporting the course (and may have been
+    queued by a course edit), so anyone who can export the course can poll
+    its jobs, unlike core:job_status.
+    """
+    
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(
+            Job, pk=self.kwargs['job_id'], name=RENDER_COURSE_PDF_JOB, kwargs__course_id=self.kwargs['pk'],
+        )
+        return JsonResponse(job_payload(job))
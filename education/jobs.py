@@ -0,0 +1,34 @@
+"""
+Background job handlers for the education app (see core.job_queue)
+"""
+from core.job_queue import JobFailed, register_job, set_progress
+from .course.models import Course
+
+RENDER_COURSE_PDF_JOB = 'education.render_course_pdf'
+REFRESH_RELATED_ARTICLES_JOB = 'education.refresh_related_articles'
+
+
+@register_job(RENDER_COURSE_PDF_JOB)
+def render_course_pdf(job, course_id):
+    # Try to import WeasyPrint lazily
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError) as e:
+        raise JobFailed(f"PDF export is not available. WeasyPrint dependencies are missing: {str(e)}")
+    from .course.pdf_cache import render_course_pdf as render
+
+    course = Course.objects.select_related('author').filter(pk=course_id).first()
+    if course is None:
+        raise JobFailed('The course no longer exists.')
+
+    set_progress(job, 10, 'Generating PDF...')
+    path, fingerprint = render(course)
+    return {'path': path, 'fingerprint': fingerprint}
+
+
+@register_job(REFRESH_RELATED_ARTICLES_JOB)
+def refresh_related_articles(job, article_ids):
+    from .knowledge.related import refresh_related_articles as refresh
+
+    refresh(article_ids)
+    return {'articles': len(article_ids)}
@@ -105,11 +105,20 @@ class KnowledgeArticle(models.Model):
         return reverse('education:knowledge_article', kwargs={'slug': self.slug})
     
     def increment_view_count(self):
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """Count a view; the write is buffered (see knowledge.view_counts)"""
+        from .view_counts import record_article_view
+        record_article_view(self)
     
     def get_related_articles(self, limit=3):
-        """Get related articles based on tags"""
+        """Get related articles from the precomputed similarity index"""
+        related = list(
+            KnowledgeArticle.objects.filter(related_from__article=self, is_published=True)
+            .order_by('related_from__rank')[:limit]
+        )
+        if related:
+            return related
+        
+        # Not indexed yet (or nothing similar): fall back to shared tags
         if not self.tags.exists():
             return KnowledgeArticle.objects.filter(
                 is_published=True
@@ -121,6 +130,28 @@ class KnowledgeArticle(models.Model):
         ).exclude(id=self.id).distinct().order_by('-updated_at')[:limit]
 
 
+class RelatedArticle(models.Model):
+    """
+    Precomputed neighbour of a knowledge article, by content and tag similarity.
+    Maintained by education.knowledge.related.
+    """
+    article = models.ForeignKey(KnowledgeArticle, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(KnowledgeArticle, on_delete=models.CASCADE, related_name='related_from')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    
+    class Meta:
+        verbose_name = "Related Article"
+        verbose_name_plural = "Related Articles"
+        ordering = ['article', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'rank'], name='education_relatedarticle_unique_rank'),
+        ]
+    
+    def __str__(self):
+        return f"{self.article} -> {self.related} ({self.score:.2f})"
+
+
 class MediaAttachment(models.Model):
     """Media attachments for knowledge articles"""
     article = models.ForeignKey(
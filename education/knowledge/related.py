@@ -0,0 +1,231 @@
+"""
+Precomputed related articles for the Knowledge Base.
+
+Similarity between two published articles combines the cosine of their
+TF-IDF term vectors (title, summary, content and content blocks) with the
+overlap of their tags. The top RELATED_ARTICLES_LIMIT neighbours of every
+article are stored in RelatedArticle, so the detail page reads them with
+one indexed query.
+
+Saving, deleting or re-tagging an article refreshes the rows that can be
+affected (see core.signals) in a background job. The articles changed in
+one transaction share one refresh, and changes made while a refresh is
+still queued join it, so the corpus is built once per batch rather than
+once per signal. Other rows keep the IDF weights they were
+computed with until `manage.py rebuild_related_articles` rebuilds
+everything, which is meant to run periodically.
+"""
+import math
+import threading
+import weakref
+from collections import Counter
+
+from django.db import transaction
+
+from core.search import search_terms
+from .search import article_search_values
+
+RELATED_ARTICLES_LIMIT = 10
+
+# How much each signal contributes to the similarity score
+TERM_WEIGHT = 0.7
+TAG_WEIGHT = 0.3
+
+MIN_TERM_LENGTH = 3
+
+STOP_WORDS = frozenset("""
+    the and for are but not you all any can had her was one our out has him his how its
+    may new now see two who did get let say she too use this that with have from they will
+    your what when make like than then them well were been into more some such only other
+    also there their which about would these after first where over just most very each
+""".split())
+
+
+def article_terms(article):
+    """Counter of the indexable terms in an article"""
+    text = ' '.join(article_search_values(article).values())
+    return Counter(
+        term for term in search_terms(text)
+        if len(term) >= MIN_TERM_LENGTH and term not in STOP_WORDS and not term.isdigit()
+    )
+
+
+def tfidf_vectors(term_counts):
+    """
+    L2-normalised sparse TF-IDF vectors (dicts of term -> weight) for a
+    dict of article id -> term Counter.
+    """
+    total = len(term_counts)
+    document_frequency = Counter()
+    for counts in term_counts.values():
+        document_frequency.update(counts.keys())
+    idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+    vectors = {}
+    for article_id, counts in term_counts.items():
+        vector = {term: (1 + math.log(count)) * idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors[article_id] = {term: weight / norm for term, weight in vector.items()} if norm else {}
+    return vectors
+
+
+def cosine(a, b):
+    """Cosine of two L2-normalised sparse vectors"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def tag_similarity(a, b):
+    """Jaccard overlap of two tag id sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Corpus:
+    """Term vectors and tag sets for every published article"""
+
+    def __init__(self):
+        from .models import KnowledgeArticle
+
+        articles = KnowledgeArticle.objects.filter(is_published=True).only(
+            'id', 'title', 'summary', 'content', 'content_blocks'
+        )
+        self.vectors = tfidf_vectors({article.pk: article_terms(article) for article in articles})
+        self.tags = {article_id: set() for article_id in self.vectors}
+        through = KnowledgeArticle.tags.through
+        for article_id, tag_id in through.objects.filter(
+            knowledgearticle_id__in=list(self.vectors)
+        ).values_list('knowledgearticle_id', 'knowledgetag_id'):
+            self.tags[article_id].add(tag_id)
+
+    def similarity(self, a, b):
+        return (
+            TERM_WEIGHT * cosine(self.vectors[a], self.vectors[b])
+            + TAG_WEIGHT * tag_similarity(self.tags[a], self.tags[b])
+        )
+
+    def neighbours(self, article_id, limit=RELATED_ARTICLES_LIMIT):
+        """The best (score, related_id) pairs for an article"""
+        scores = [
+            (self.similarity(article_id, other), other)
+            for other in self.vectors if other != article_id
+        ]
+        scores = [(score, other) for score, other in scores if score > 0]
+        scores.sort(key=lambda pair: (-pair[0], pair[1]))
+        return scores[:limit]
+
+
+def _write_neighbours(corpus, article_ids):
+    from .models import RelatedArticle
+
+    RelatedArticle.objects.filter(article_id__in=article_ids).delete()
+    RelatedArticle.objects.bulk_create([
+        RelatedArticle(article_id=article_id, related_id=related_id, score=score, rank=rank)
+        for article_id in article_ids if article_id in corpus.vectors
+        for rank, (score, related_id) in enumerate(corpus.neighbours(article_id), start=1)
+    ])
+
+
+def rebuild_related_articles():
+    """Recompute the neighbours of every article; returns the number of articles"""
+    from .models import RelatedArticle
+
+    corpus = _Corpus()
+    with transaction.atomic():
+        RelatedArticle.objects.all().delete()
+        _write_neighbours(corpus, list(corpus.vectors))
+    return len(corpus.vectors)
+
+
+def refresh_related_articles(changed_ids):
+    """
+    Refresh the rows affected by changes to the given articles: their own
+    neighbours, and those of every article that lists them or that they
+    would now enter the top of.
+    """
+    from .models import RelatedArticle
+
+    changed_ids = set(changed_ids)
+    if not changed_ids:
+        return
+    corpus = _Corpus()
+
+    # Lowest stored score per article, to see whether a changed article now qualifies
+    affected = set(changed_ids)
+    cutoffs = {}
+    counts = Counter()
+    for article_id, related_id, score in RelatedArticle.objects.values_list('article_id', 'related_id', 'score'):
+        if related_id in changed_ids:
+            affected.add(article_id)
+        counts[article_id] += 1
+        cutoffs[article_id] = min(score, cutoffs.get(article_id, score))
+
+    for article_id in corpus.vectors:
+        if article_id in affected:
+            continue
+        full = counts[article_id] >= RELATED_ARTICLES_LIMIT
+        for changed_id in changed_ids & corpus.vectors.keys():
+            score = corpus.similarity(article_id, changed_id)
+            if score > 0 and (not full or score > cutoffs[article_id]):
+                affected.add(article_id)
+                break
+
+    with transaction.atomic():
+        _write_neighbours(corpus, affected)
+
+
+# The refresh the current transaction registered, per thread (and so per connection)
+_pending = threading.local()
+
+
+class _RelatedRefresh:
+    """The on_commit callback collecting one transaction's changed articles"""
+
+    def __init__(self, article_ids):
+        self.article_ids = set(article_ids)
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        enqueue_related_refresh(self.article_ids)
+
+
+def schedule_related_refresh(article_ids):
+    """Refresh related articles for article_ids in the background once the current transaction commits"""
+    article_ids = set(article_ids)
+    if not article_ids:
+        return
+    # Only Django's list of on_commit callbacks holds on to the refresh, so
+    # it is gone once a rollback discards them and a new one is registered
+    pending = getattr(_pending, 'refresh', None)
+    refresh = pending() if pending is not None else None
+    if refresh is not None and not refresh.done:
+        refresh.article_ids |= article_ids
+        return
+    refresh = _RelatedRefresh(article_ids)
+    _pending.refresh = weakref.ref(refresh)
+    transaction.on_commit(refresh)
+
+
+def enqueue_related_refresh(article_ids):
+    """
+    Queue a refresh of related articles for article_ids, adding them to
+    the refresh job that is already queued if there is one.
+    """
+    from core.job_queue import enqueue
+    from core.models import Job
+    from education.jobs import REFRESH_RELATED_ARTICLES_JOB
+
+    article_ids = set(article_ids)
+    with transaction.atomic():
+        queued = Job.objects.select_for_update().filter(
+            name=REFRESH_RELATED_ARTICLES_JOB, status=Job.STATUS_QUEUED
+        ).order_by('pk').first()
+        if queued is not None:
+            merged = sorted(article_ids | set(queued.kwargs.get('article_ids', [])))
+            # Only while no worker has claimed it
+            if Job.objects.filter(pk=queued.pk, status=Job.STATUS_QUEUED).update(kwargs={'article_ids': merged}):
+                return queued
+        return enqueue(REFRESH_RELATED_ARTICLES_JOB, article_ids=sorted(article_ids))
@@ -0,0 +1,123 @@
+"""
+Ranked full-text search for the Knowledge Base.
+
+Published articles are indexed by id over their title, summary, the plain
+text of their HTML content and the text of their content blocks. The index
+is updated from signals whenever an article is saved or deleted (see
+core.signals), and rebuilt with `manage.py rebuild_knowledge_search`.
+"""
+from collections import namedtuple
+
+from django.db.models import Count
+
+from core.search import FullTextIndex, strip_html
+
+KNOWLEDGE_SEARCH_INDEX = FullTextIndex('education_knowledge_search', [
+    ('title', 10),
+    ('summary', 4),
+    ('content', 1),
+    ('blocks', 1),
+], snippet_words=20)
+
+# Article fields whose changes require re-indexing
+INDEXED_FIELDS = frozenset({'title', 'summary', 'content', 'content_blocks', 'is_published'})
+
+# Content block keys that hold readable text (see article_detail.html)
+BLOCK_TEXT_KEYS = {'title', 'text', 'content', 'bulletPoints', 'items', 'caption', 'imageAlt'}
+
+KnowledgeSearchResult = namedtuple('KnowledgeSearchResult', ['articles', 'category_facets', 'tag_facets'])
+
+
+def content_blocks_text(blocks):
+    """Plain text of the readable parts of an article's content blocks"""
+    parts = []
+
+    def collect(value, readable):
+        if isinstance(value, str):
+            if readable:
+                parts.append(strip_html(value))
+        elif isinstance(value, list):
+            for item in value:
+                collect(item, readable)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                collect(item, key in BLOCK_TEXT_KEYS)
+
+    collect(blocks, False)
+    return ' '.join(part for part in parts if part)
+
+
+def article_search_values(article):
+    """The text indexed for an article"""
+    return {
+        'title': article.title,
+        'summary': article.summary,
+        'content': strip_html(article.content),
+        'blocks': content_blocks_text(article.content_blocks),
+    }
+
+
+def index_article(article):
+    """Add or refresh an article in the index; unpublished articles are removed"""
+    if article.is_published:
+        KNOWLEDGE_SEARCH_INDEX.update(article.pk, article_search_values(article))
+    else:
+        KNOWLEDGE_SEARCH_INDEX.delete(article.pk)
+
+
+def unindex_article(article):
+    KNOWLEDGE_SEARCH_INDEX.delete(article.pk)
+
+
+def rebuild_knowledge_search(batch_size=500):
+    """Re-index every published article and return how many were indexed"""
+    from .models import KnowledgeArticle
+
+    KNOWLEDGE_SEARCH_INDEX.clear()
+    articles = KnowledgeArticle.objects.filter(is_published=True).only(
+        'id', 'title', 'summary', 'content', 'content_blocks'
+    )
+    rows = [(article.pk, article_search_values(article)) for article in articles.iterator(chunk_size=batch_size)]
+    KNOWLEDGE_SEARCH_INDEX.update_many(rows)
+    return len(rows)
+
+
+def search_articles(query, queryset=None, prefix=True):
+    """
+    Search published articles, or only those in queryset, best match first.
+
+    Returns a KnowledgeSearchResult whose articles are a ranked queryset of
+    every match, to be paged by the caller, with category and tag facet
+    counts over all published matches, or None when the database has no
+    full-text support.
+    """
+    from .models import KnowledgeArticle, KnowledgeCategory, KnowledgeTag
+
+    published = KnowledgeArticle.objects.filter(is_published=True)
+    matches = KNOWLEDGE_SEARCH_INDEX.filter(published, query, prefix=prefix)
+    if matches is None:
+        return None
+    articles = matches if queryset is None else KNOWLEDGE_SEARCH_INDEX.filter(queryset, query, prefix=prefix)
+
+    match_ids = matches.order_by().values('pk')
+    category_facets = list(
+        KnowledgeCategory.objects.filter(articles__in=match_ids)
+        .annotate(hit_count=Count('articles'))
+        .order_by('-hit_count', 'name')
+    )
+    tag_facets = list(
+        KnowledgeTag.objects.filter(articles__in=match_ids)
+        .annotate(hit_count=Count('articles'))
+        .order_by('-hit_count', 'name')
+    )
+    return KnowledgeSearchResult(articles, category_facets, tag_facets)
+
+
+def article_snippets(query, articles, prefix=True):
+    """{article id: highlighted snippet} for the articles shown on a page"""
+    return KNOWLEDGE_SEARCH_INDEX.snippets(query, [article.pk for article in articles], prefix=prefix)
+
+
+def suggest_articles(query, limit=8):
+    """The top SearchHits keyed by article id, or None without full-text support"""
+    return KNOWLEDGE_SEARCH_INDEX.search(query, limit=limit)
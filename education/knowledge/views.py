@@ -4,11 +4,14 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy, reverse
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponseRedirect
+from django.db import transaction
 from django.db.models import Q
 
 from core.mixins import BreadcrumbMixin
 from .models import KnowledgeArticle, KnowledgeCategory, KnowledgeTag, MediaAttachment
 from .forms import KnowledgeArticleForm, MediaAttachmentForm
+from .search import article_snippets, search_articles, suggest_articles
+from .view_counts import ARTICLE_VIEW_COUNTER
 
 class KnowledgeBaseView(LoginRequiredMixin, BreadcrumbMixin, ListView):
     """Main view for the Knowledge Base dashboard"""
@@ -32,7 +35,12 @@ class KnowledgeBaseView(LoginRequiredMixin, BreadcrumbMixin, ListView):
         
         # Search if provided
         search_query = self.request.GET.get('q')
+        self.search_result = search_articles(search_query, queryset) if search_query else None
+        if self.search_result is not None:
+            # Ranked full-text search over every match, most relevant first
+            return self.search_result.articles
         if search_query:
+            # No full-text support on this database
             queryset = queryset.filter(
                 Q(title__icontains=search_query) | 
                 Q(summary__icontains=search_query) |
@@ -55,6 +63,14 @@ class KnowledgeBaseView(LoginRequiredMixin, BreadcrumbMixin, ListView):
         context['active_tag'] = self.request.GET.get('tag', '')
         context['search_query'] = self.request.GET.get('q', '')
         
+        # Snippets and facets for full-text search results
+        if self.search_result is not None:
+            snippets = article_snippets(context['search_query'], context['articles'])
+            for article in context['articles']:
+                article.search_snippet = snippets.get(article.pk, '')
+            context['category_facets'] = self.search_result.category_facets
+            context['tag_facets'] = self.search_result.tag_facets
+        
         return context
     
     def get_breadcrumbs(self):
@@ -65,6 +81,34 @@ class KnowledgeBaseView(LoginRequiredMixin, BreadcrumbMixin, ListView):
         return breadcrumbs
 
 
+class KnowledgeSearchSuggestView(LoginRequiredMixin, View):
+    """Type-ahead suggestions for the Knowledge Base search box"""
+    limit = 8
+    
+    def get(self, request):
+        query = request.GET.get('q', '')
+        hits = suggest_articles(query, limit=self.limit)
+        if hits is None:
+            articles = KnowledgeArticle.objects.filter(
+                is_published=True, title__icontains=query
+            ) if query else KnowledgeArticle.objects.none()
+            suggestions = [
+                {'title': article.title, 'url': article.get_absolute_url(), 'snippet': ''}
+                for article in articles[:self.limit]
+            ]
+        else:
+            articles = KnowledgeArticle.objects.in_bulk([hit.key for hit in hits])
+            suggestions = [
+                {
+                    'title': articles[hit.key].title,
+                    'url': articles[hit.key].get_absolute_url(),
+                    'snippet': str(hit.snippet),
+                }
+                for hit in hits if hit.key in articles
+            ]
+        return JsonResponse({'query': query, 'results': suggestions})
+
+
 class KnowledgeArticleDetailView(LoginRequiredMixin, BreadcrumbMixin, DetailView):
     """View for displaying a knowledge article"""
     model = KnowledgeArticle
@@ -120,11 +164,18 @@ class KnowledgeArticleDetailView(LoginRequiredMixin, BreadcrumbMixin, DetailView
     
     def get(self, request, *args, **kwargs):
         response = super().get(request, *args, **kwargs)
-        # Increment view count
+        # Increment view count (buffered, written in batches)
         self.object.increment_view_count()
         return response
 
 
+class KnowledgeViewCountStatsView(LoginRequiredMixin, View):
+    """Pending and flushed article view counts, as JSON"""
+    
+    def get(self, request):
+        return JsonResponse(ARTICLE_VIEW_COUNTER.stats())
+
+
 class KnowledgeArticleCreateView(LoginRequiredMixin, BreadcrumbMixin, CreateView):
     """View for creating a new knowledge article"""
     model = KnowledgeArticle
@@ -185,7 +236,9 @@ class KnowledgeArticleCreateView(LoginRequiredMixin, BreadcrumbMixin, CreateView
         
         # Save the form
         try:
-            self.object = form.save()
+            # Article and tags together, so they share one related-articles refresh
+            with transaction.atomic():
+                self.object = form.save()
             logger.info(f"Article saved with ID: {self.object.id}, slug: {self.object.slug}")
             logger.info(f"Content blocks saved to database: {bool(form.instance.content_blocks)}")
             
@@ -327,7 +380,9 @@ class KnowledgeArticleUpdateView(LoginRequiredMixin, BreadcrumbMixin, UpdateView
         
         # Save the form
         try:
-            self.object = form.save()
+            # Article and tags together, so they share one related-articles refresh
+            with transaction.atomic():
+                self.object = form.save()
             logger.info(f"Article updated with ID: {self.object.id}, slug: {self.object.slug}")
             
             # If we didn't have the ID before (new article), update the session key
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from education.knowledge.search import rebuild_knowledge_search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Knowledge Base full-text search index from the published articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Articles loaded per query')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding Knowledge Base search index...')
+        count = rebuild_knowledge_search(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} articles'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from education.knowledge.related import rebuild_related_articles
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed related articles of every published Knowledge Base article'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding related articles...')
+        count = rebuild_related_articles()
+        self.stdout.write(self.style.SUCCESS(f'Computed related articles for {count} articles'))
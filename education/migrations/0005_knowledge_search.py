@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:40
+
+from django.db import migrations
+
+from core.search import FullTextIndex, strip_html
+
+
+# Snapshot of education.knowledge.search.KNOWLEDGE_SEARCH_INDEX at the time of this migration
+KNOWLEDGE_SEARCH_INDEX = FullTextIndex('education_knowledge_search', [
+    ('title', 10),
+    ('summary', 4),
+    ('content', 1),
+    ('blocks', 1),
+], snippet_words=20)
+
+
+def create_knowledge_search(apps, schema_editor):
+    from education.knowledge.search import content_blocks_text
+
+    conn = schema_editor.connection
+    KNOWLEDGE_SEARCH_INDEX.create(conn)
+
+    KnowledgeArticle = apps.get_model('education', 'KnowledgeArticle')
+    KNOWLEDGE_SEARCH_INDEX.update_many([
+        (article.pk, {
+            'title': article.title,
+            'summary': article.summary,
+            'content': strip_html(article.content),
+            'blocks': content_blocks_text(article.content_blocks),
+        })
+        for article in KnowledgeArticle.objects.filter(is_published=True).iterator()
+    ], conn=conn)
+
+
+def drop_knowledge_search(apps, schema_editor):
+    KNOWLEDGE_SEARCH_INDEX.drop(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0004_knowledgearticle_content_blocks'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_knowledge_search, drop_knowledge_search),
+    ]
@@ -22,6 +22,8 @@ urlpatterns = [
     
     # Knowledge Base URLs
     path('knowledge/', knowledge_views.KnowledgeBaseView.as_view(), name='knowledge_base'),
+    path('knowledge/search/suggest/', knowledge_views.KnowledgeSearchSuggestView.as_view(), name='knowledge_search_suggest'),
+    path('knowledge/view-counts/', knowledge_views.KnowledgeViewCountStatsView.as_view(), name='knowledge_view_count_stats'),
     path('knowledge/create/', knowledge_views.KnowledgeArticleCreateView.as_view(), name='knowledge_article_create'),
     path('knowledge/article/<slug:slug>/', knowledge_views.KnowledgeArticleDetailView.as_view(), name='knowledge_article'),
     path('knowledge/article/<slug:slug>/edit/', knowledge_views.KnowledgeArticleUpdateView.as_view(), name='knowledge_article_update'),
@@ -39,4 +41,5 @@ urlpatterns = [
     path('courses/<int:pk>/update/', course_views.CourseUpdateView.as_view(), name='course_update'),
     path('courses/<int:pk>/delete/', course_views.CourseDeleteView.as_view(), name='course_delete'),
     path('courses/<int:pk>/pdf/', course_views.CoursePDFView.as_view(), name='course_pdf'),
+    path('courses/<int:pk>/pdf/status/<int:job_id>/', course_views.CoursePDFStatusView.as_view(), name='course_pdf_status'),
 ]
@@ -1,7 +1,6 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView, ListView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, Q
 from django.utils import timezone
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
@@ -14,7 +13,8 @@ from core.mixins import BreadcrumbMixin
 
 from projects.game_models import GameTask
 from projects.task_models import EducationTask
-from django.contrib.auth.models import User
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
+from core.dashboard_stats import assignable_users, get_task_stats
 
 
 class EducationDashboardView(LoginRequiredMixin, TemplateView):
@@ -78,38 +78,25 @@ class EducationTasksView(BreadcrumbMixin, LoginRequiredMixin, TemplateView):
         tasks = EducationTask.objects.all()
         
         # Apply filters from query parameters
-        course_id = self.request.GET.get('course_id')
-        if course_id:
-            tasks = tasks.filter(course_id=course_id)
-            
-        target_audience = self.request.GET.get('target_audience')
-        if target_audience:
-            tasks = tasks.filter(target_audience=target_audience)
-            
-        status = self.request.GET.get('status')
-        if status:
-            tasks = tasks.filter(status=status)
-            
-        priority = self.request.GET.get('priority')
-        if priority:
-            tasks = tasks.filter(priority=priority)
-            
-        # Get unique course IDs and target audiences for filters
-        context['course_ids'] = EducationTask.objects.values_list('course_id', flat=True).distinct()
-        context['target_audiences'] = EducationTask.objects.values_list('target_audience', flat=True).distinct()
+        filters = {
+            'course_id': self.request.GET.get('course_id'),
+            'target_audience': self.request.GET.get('target_audience'),
+            'status': self.request.GET.get('status'),
+            'priority': self.request.GET.get('priority'),
+        }
+        tasks = tasks.filter(**{name: value for name, value in filters.items() if value})
+        
+        # Unique course IDs and target audiences for filters, from one grouped query
+        options = get_task_stats(EducationTask, group_fields=('course_id', 'target_audience'))
+        context['course_ids'] = [value for value, _ in options['groups']['course_id']]
+        context['target_audiences'] = [value for value, _ in options['groups']['target_audience']]
         context['tasks'] = tasks
-        context['users'] = User.objects.all()
+        context['users'] = assignable_users()
         
         # Task statistics for status cards
-        task_stats = {
-            'to_do': tasks.filter(status='to_do').count(),
-            'in_progress': tasks.filter(status='in_progress').count(),
-            'in_review': tasks.filter(status='in_review').count(),
-            'done': tasks.filter(status='done').count(),
-            'backlog': tasks.filter(status='backlog').count(),
-        }
-        context['task_stats'] = task_stats
-        context['total_tasks'] = tasks.count()
+        stats = get_task_stats(EducationTask, filters=filters) if any(filters.values()) else options
+        context['task_stats'] = stats['status']
+        context['total_tasks'] = stats['total']
         
         return context
 
@@ -122,65 +109,27 @@ class EducationTaskBatchUpdateView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
-            task_ids = data.get('task_ids', [])
-            update_data = data.get('update_data', {})
-            
-            if not task_ids or not update_data:
-                return JsonResponse({'success': False, 'message': 'No tasks or update data provided'}, status=400)
-            
-            # Filter tasks by ID and ensure they are education tasks
-            tasks = GameTask.objects.filter(id__in=task_ids, company_section='education')
-            
-            if not tasks.exists():
-                return JsonResponse({'success': False, 'message': 'No valid education tasks found'}, status=404)
-            
-            # Process update data
-            update_fields = {}
-            
-            if 'status' in update_data and update_data['status']:
-                update_fields['status'] = update_data['status']
-                
-            if 'priority' in update_data and update_data['priority']:
-                update_fields['priority'] = update_data['priority']
-                
-            if 'assigned_to' in update_data:
-                if update_data['assigned_to'] == 'unassigned':
-                    update_fields['assigned_to'] = None
-                elif update_data['assigned_to']:
-                    try:
-                        user = User.objects.get(id=update_data['assigned_to'])
-                        update_fields['assigned_to'] = user
-                    except User.DoesNotExist:
-                        pass
-                        
-            if 'due_date' in update_data:
-                if update_data['due_date'] == 'no_date':
-                    update_fields['due_date'] = None
-                elif update_data['due_date']:
-                    update_fields['due_date'] = update_data['due_date']
-                    
-            if 'course_id' in update_data and update_data['course_id']:
-                update_fields['course_id'] = update_data['course_id']
-                
-            if 'target_audience' in update_data and update_data['target_audience']:
-                update_fields['target_audience'] = update_data['target_audience']
-            
-            # Apply updates
-            if update_fields:
-                tasks.update(**update_fields)
-                
-                return JsonResponse({
-                    'success': True,
-                    'message': f'Successfully updated {tasks.count()} tasks',
-                    'updated_count': tasks.count()
-                })
-            else:
-                return JsonResponse({'success': False, 'message': 'No valid update fields provided'}, status=400)
-                
         except json.JSONDecodeError:
             return JsonResponse({'success': False, 'message': 'Invalid JSON data'}, status=400)
-        except Exception as e:
-            return JsonResponse({'success': False, 'message': f'Error: {str(e)}'}, status=500)
+        
+        task_ids = data.get('task_ids', [])
+        update_data = data.get('update_data', {})
+        if not task_ids or not update_data:
+            return JsonResponse({'success': False, 'message': 'No tasks or update data provided'}, status=400)
+        
+        try:
+            result = bulk_edit_from_request(request, EducationTask, task_ids, update_data, extra_fields=('course_id', 'target_audience'))
+        except BulkEditError as e:
+            return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        
+        if not result.updated_count:
+            return JsonResponse({'success': False, 'message': 'No valid education tasks found'}, status=404)
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Successfully updated {result.updated_count} tasks',
+            'updated_count': result.updated_count
+        })
 
 
 class EducationTaskCreateView(BreadcrumbMixin, LoginRequiredMixin, TemplateView):
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.3 on 2026-10-18 15:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('indie_news', '0005_remove_indienewstask_team_and_more'),
+        ('projects', '0103_task_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='indienewstask',
+            options={'ordering': ['-priority', 'due_date', 'title'], 'verbose_name': 'Indie News Task', 'verbose_name_plural': 'Indie News Tasks'},
+        ),
+        migrations.AddIndex(
+            model_name='indienewstask',
+            index=models.Index(fields=['status', 'due_date'], name='indie_news__status_a89055_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indienewstask',
+            index=models.Index(fields=['assigned_to', 'status'], name='indie_news__assigne_2f18e3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indienewstask',
+            index=models.Index(fields=['epic', 'status'], name='indie_news__epic_id_272dcf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indienewstask',
+            index=models.Index(fields=['task_level', 'parent_task'], name='indie_news__task_le_79fea2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indienewstask',
+            index=models.Index(fields=['-priority', 'due_date', 'title'], name='indie_news__priorit_4f237a_idx'),
+        ),
+    ]
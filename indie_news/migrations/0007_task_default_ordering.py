@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('indie_news', '0006_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='indienewstask',
+            options={'ordering': [], 'verbose_name': 'Indie News Task', 'verbose_name_plural': 'Indie News Tasks'},
+        ),
+    ]
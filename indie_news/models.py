@@ -29,7 +29,8 @@ class IndieNewsTask(BaseTask):
     # Multiple users can be assigned to a task
     assigned_users = models.ManyToManyField(User, related_name='assigned_indie_news_tasks', blank=True)
     
-    class Meta:
+    class Meta(BaseTask.Meta):
+        ordering = []
         verbose_name = "Indie News Task"
         verbose_name_plural = "Indie News Tasks"
 
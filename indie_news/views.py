@@ -15,6 +15,7 @@ from core.mixins import BreadcrumbMixin
 from .models import IndieNewsTask, IndieGame, IndieEvent, IndieTool
 from .forms import IndieNewsTaskForm, IndieGameForm, IndieEventForm, IndieToolForm
 from django.contrib.auth import get_user_model
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
 
 User = get_user_model()
 
@@ -192,40 +193,21 @@ class IndieNewsTaskBatchUpdateView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
-            task_ids = data.get('task_ids', [])
-            if not task_ids:
-                return JsonResponse({'status': 'error', 'message': 'No tasks selected'}, status=400)
-            
-            fields_to_update = {}
-            if data.get('status'):
-                fields_to_update['status'] = data['status']
-            if data.get('priority'):
-                fields_to_update['priority'] = data['priority']
-            if data.get('assigned_to'):
-                try:
-                    user = User.objects.get(id=data['assigned_to'])
-                    fields_to_update['assigned_to'] = user
-                except User.DoesNotExist:
-                    return JsonResponse({'status': 'error', 'message': 'User not found'}, status=400)
-            if data.get('due_date'):
-                fields_to_update['due_date'] = data['due_date']
-            if data.get('news_type'):
-                fields_to_update['news_type'] = data['news_type']
-                
-            if not fields_to_update:
-                return JsonResponse({'status': 'error', 'message': 'No fields to update'}, status=400)
-                
-            updated_count = IndieNewsTask.objects.filter(id__in=task_ids).update(**fields_to_update)
-            
-            return JsonResponse({
-                'status': 'success', 
-                'message': f'Successfully updated {updated_count} tasks',
-                'updated_count': updated_count
-            })
         except json.JSONDecodeError:
             return JsonResponse({'status': 'error', 'message': 'Invalid JSON'}, status=400)
-        except Exception as e:
-            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+        
+        try:
+            result = bulk_edit_from_request(
+                request, IndieNewsTask, data.get('task_ids', []), data, extra_fields=('news_type',)
+            )
+        except BulkEditError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Successfully updated {result.updated_count} tasks',
+            'updated_count': result.updated_count
+        })
 
 
 # Indie Game Views
@@ -14,6 +14,7 @@ from .task_models import EducationTask
 from .task_forms import EducationTaskForm
 from .game_models import GameTask  # Keep for backwards compatibility during transition
 from django.contrib.auth.models import User
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
 
 class EducationTaskDashboardView(LoginRequiredMixin, ListView):
     """
@@ -354,62 +355,25 @@ class EducationTaskBatchUpdateView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
-            task_ids = data.get('task_ids', [])
-            update_data = data.get('update_data', {})
-            
-            if not task_ids or not update_data:
-                return JsonResponse({'success': False, 'message': 'No tasks or update data provided'}, status=400)
-            
-            # Filter tasks by ID and ensure they are education tasks
-            tasks = GameTask.objects.filter(id__in=task_ids, company_section='education')
-            
-            if not tasks.exists():
-                return JsonResponse({'success': False, 'message': 'No valid education tasks found'}, status=404)
-            
-            # Process update data
-            update_fields = {}
-            
-            if 'status' in update_data and update_data['status']:
-                update_fields['status'] = update_data['status']
-                
-            if 'priority' in update_data and update_data['priority']:
-                update_fields['priority'] = update_data['priority']
-                
-            if 'assigned_to' in update_data:
-                if update_data['assigned_to'] == 'unassigned':
-                    update_fields['assigned_to'] = None
-                elif update_data['assigned_to']:
-                    try:
-                        user = User.objects.get(id=update_data['assigned_to'])
-                        update_fields['assigned_to'] = user
-                    except User.DoesNotExist:
-                        pass
-                        
-            if 'due_date' in update_data:
-                if update_data['due_date'] == 'no_date':
-                    update_fields['due_date'] = None
-                elif update_data['due_date']:
-                    update_fields['due_date'] = update_data['due_date']
-                    
-            if 'course_id' in update_data and update_data['course_id']:
-                update_fields['course_id'] = update_data['course_id']
-                
-            if 'target_audience' in update_data and update_data['target_audience']:
-                update_fields['target_audience'] = update_data['target_audience']
-            
-            # Apply updates
-            if update_fields:
-                tasks.update(**update_fields)
-                
-                return JsonResponse({
-                    'success': True,
-                    'message': f'Successfully updated {tasks.count()} tasks',
-                    'updated_count': tasks.count()
-                })
-            else:
-                return JsonResponse({'success': False, 'message': 'No valid update fields provided'}, status=400)
-                
         except json.JSONDecodeError:
             return JsonResponse({'success': False, 'message': 'Invalid JSON data'}, status=400)
-        except Exception as e:
-            return JsonResponse({'success': False, 'message': f'Error: {str(e)}'}, status=500)
+        
+        task_ids = data.get('task_ids', [])
+        update_data = data.get('update_data', {})
+        if not task_ids or not update_data:
+            return JsonResponse({'success': False, 'message': 'No tasks or update data provided'}, status=400)
+        
+        try:
+            result = bulk_edit_from_request(request, EducationTask, task_ids, update_data, extra_fields=('course_id', 'target_audience'))
+        except BulkEditError as e:
+            return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        
+        if not result.updated_count:
+            return JsonResponse({'success': False, 'message': 'No valid education tasks found'}, status=404)
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Successfully updated {result.updated_count} tasks',
+            'updated_count': result.updated_count
+        })
+
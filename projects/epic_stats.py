@@ -0,0 +1,95 @@
+"""
+Per-epic task roll-ups.
+
+Task, done and subtask counts for every epic are kept in EpicStats so the
+epic pages read them with the epic instead of scanning each task model.
+Counts for a set of epics come from one UNION ALL of grouped aggregates
+over all the task models; task saves and deletes refresh the epics they
+touch (see core.signals), and `manage.py rebuild_epic_stats` recomputes
+every epic.
+"""
+from django.db.models import Count, F, IntegerField, Q, Value
+
+
+def get_epic_task_models():
+    """The task models that can belong to an epic"""
+    from .task_models import (
+        GameDevelopmentTask, EducationTask, SocialMediaTask,
+        ArcadeTask, ThemeParkTask, R1D3Task
+    )
+    from indie_news.models import IndieNewsTask
+
+    return [GameDevelopmentTask, EducationTask, SocialMediaTask,
+            ArcadeTask, ThemeParkTask, R1D3Task, IndieNewsTask]
+
+
+def _count_branches(model, epic_ids):
+    """Grouped (epic, tasks, done, subtasks) rows for one task model"""
+    tasks = model.objects.order_by()
+    subtasks = model.objects.order_by()
+    if epic_ids is None:
+        tasks = tasks.filter(epic__isnull=False)
+        subtasks = subtasks.filter(parent_task__epic__isnull=False)
+    else:
+        tasks = tasks.filter(epic__in=epic_ids)
+        subtasks = subtasks.filter(parent_task__epic__in=epic_ids)
+
+    return [
+        tasks.values(epic_ref=F('epic')).annotate(
+            tasks=Count('pk'),
+            done=Count('pk', filter=Q(status='done')),
+            subtasks=Value(0, output_field=IntegerField()),
+        ).values_list('epic_ref', 'tasks', 'done', 'subtasks'),
+        subtasks.values(epic_ref=F('parent_task__epic')).annotate(
+            tasks=Value(0, output_field=IntegerField()),
+            done=Value(0, output_field=IntegerField()),
+            subtasks=Count('pk'),
+        ).values_list('epic_ref', 'tasks', 'done', 'subtasks'),
+    ]
+
+
+def compute_epic_stats(epic_ids=None):
+    """
+    {epic_id: (task_count, done_count, subtask_count)} for the given epics
+    (every epic with tasks when epic_ids is None), in a single query.
+    """
+    if epic_ids is not None:
+        epic_ids = list(epic_ids)
+        if not epic_ids:
+            return {}
+
+    branches = [branch for model in get_epic_task_models() for branch in _count_branches(model, epic_ids)]
+    query = branches[0].union(*branches[1:], all=True)
+
+    totals = {}
+    for epic_id, tasks, done, subtasks in query:
+        current = totals.get(epic_id, (0, 0, 0))
+        totals[epic_id] = (current[0] + tasks, current[1] + done, current[2] + subtasks)
+    return totals
+
+
+def refresh_epic_stats(epic_ids):
+    """Recompute and store the roll-ups of the given epics; returns {epic_id: EpicStats}"""
+    from .task_models import Epic, EpicStats
+
+    epic_ids = set(Epic.objects.filter(pk__in=[pk for pk in epic_ids if pk is not None]).values_list('pk', flat=True))
+    if not epic_ids:
+        return {}
+    totals = compute_epic_stats(epic_ids)
+    rows = [
+        EpicStats(epic_id=epic_id, task_count=tasks, done_count=done, subtask_count=subtasks)
+        for epic_id in epic_ids
+        for tasks, done, subtasks in [totals.get(epic_id, (0, 0, 0))]
+    ]
+    EpicStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['epic'],
+        update_fields=['task_count', 'done_count', 'subtask_count', 'updated_at'],
+    )
+    return {row.epic_id: row for row in rows}
+
+
+def rebuild_epic_stats():
+    """Recompute the roll-ups of every epic; returns the number of epics"""
+    from .task_models import Epic
+
+    return len(refresh_epic_stats(Epic.objects.values_list('pk', flat=True)))
@@ -9,6 +9,7 @@ from django.contrib import messages
 from django.db.models import Q, Count
 from .task_models import Epic
 from .epic_forms import EpicForm
+from core.task_utils import prefetch_task_subtasks
 
 
 class EpicListView(LoginRequiredMixin, ListView):
@@ -21,7 +22,8 @@ class EpicListView(LoginRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        queryset = Epic.objects.all()
+        # Roll-ups come with each epic so the cards need no per-epic queries
+        queryset = Epic.objects.select_related('stats')
         
         # Filter by company section
         section = self.request.GET.get('section')
@@ -53,9 +55,14 @@ class EpicListView(LoginRequiredMixin, ListView):
         context['search_query'] = self.request.GET.get('search', '')
         
         # Stats
-        context['total_epics'] = Epic.objects.count()
-        context['in_progress_count'] = Epic.objects.filter(status='in_progress').count()
-        context['completed_count'] = Epic.objects.filter(status='completed').count()
+        counts = Epic.objects.aggregate(
+            total=Count('pk'),
+            in_progress=Count('pk', filter=Q(status='in_progress')),
+            completed=Count('pk', filter=Q(status='completed')),
+        )
+        context['total_epics'] = counts['total']
+        context['in_progress_count'] = counts['in_progress']
+        context['completed_count'] = counts['completed']
         
         return context
 
@@ -112,6 +119,7 @@ class EpicDetailView(LoginRequiredMixin, DetailView):
     View epic details with all associated tasks
     """
     model = Epic
+    queryset = Epic.objects.select_related('stats')
     template_name = 'projects/epic_detail.html'
     context_object_name = 'epic'
     
@@ -119,8 +127,8 @@ class EpicDetailView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         epic = self.object
         
-        # Get all tasks for this epic
-        tasks = epic.get_all_tasks()
+        # Get all tasks for this epic, with their subtasks loaded in bulk
+        tasks = prefetch_task_subtasks(epic.get_all_tasks())
         
         # Organize tasks by status
         context['tasks_by_status'] = {
@@ -133,10 +141,11 @@ class EpicDetailView(LoginRequiredMixin, DetailView):
         }
         
         # Stats
-        context['total_tasks'] = len(tasks)
-        context['completed_tasks'] = len([t for t in tasks if t.status == 'done'])
-        context['progress_percentage'] = epic.get_progress()
-        context['subtask_count'] = epic.get_subtask_count()
+        stats = epic.get_stats()
+        context['total_tasks'] = stats.task_count
+        context['completed_tasks'] = stats.done_count
+        context['progress_percentage'] = stats.progress
+        context['subtask_count'] = stats.subtask_count
         
         return context
 
@@ -146,6 +155,7 @@ class EpicDeleteView(LoginRequiredMixin, DeleteView):
     Delete an epic
     """
     model = Epic
+    queryset = Epic.objects.select_related('stats')
     template_name = 'projects/epic_confirm_delete.html'
     success_url = reverse_lazy('projects:epic_list')
     
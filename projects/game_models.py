@@ -141,6 +141,7 @@ class GameDesignDocument(TimeStampedModel):
     # HTML Content
     html_content = models.TextField(blank=True, help_text="Full HTML content of the GDD")
     use_html_content = models.BooleanField(default=False, help_text="Use HTML content instead of structured fields")
+    features_hash = models.CharField(max_length=64, blank=True, help_text="Hash of the HTML content features were last extracted from")
     
     def __str__(self):
         return f"GDD for {self.game.title}"
@@ -0,0 +1,69 @@
+"""
+Cached statistics for a game project.
+
+Task, asset and bug counts for a game are computed with one conditional
+aggregate per table and cached under the game's updated_at watermark.
+Entries carry the 'game:<id>' tag, bumped when one of the game's assets
+or bugs changes (see core.signals), and the Game Development task tag,
+bumped by every task write including bulk updates.
+"""
+from django.db.models import Count, Q
+
+from core import cache_tags
+from .game_models import GameAsset
+from .task_models import GameDevelopmentTask
+
+GAME_STATS_KEY = 'game_stats:{pk}:{watermark}'
+GAME_STATS_TIMEOUT = 600
+
+OPEN_BUG_STATUSES = ('open', 'confirmed', 'in_progress')
+
+
+def game_stats_tag(game_id):
+    return f'game:{game_id}'
+
+
+def compute_game_stats(game):
+    """Count a game's tasks by status, assets by type and its bugs; three queries"""
+    statuses = [status for status, _ in GameDevelopmentTask.STATUS_CHOICES]
+    counts = GameDevelopmentTask.objects.filter(game=game).aggregate(**{
+        f'status_{status}': Count('pk', filter=Q(status=status)) for status in statuses
+    })
+    task_counts = {status: counts[f'status_{status}'] for status in statuses}
+
+    asset_types = [asset_type for asset_type, _ in GameAsset.ASSET_TYPE_CHOICES]
+    counts = game.assets.aggregate(**{
+        f'type_{asset_type}': Count('pk', filter=Q(asset_type=asset_type)) for asset_type in asset_types
+    })
+    assets_by_type = {asset_type: counts[f'type_{asset_type}'] for asset_type in asset_types}
+
+    bug_counts = game.bugs.aggregate(
+        total=Count('pk'),
+        open=Count('pk', filter=Q(status__in=OPEN_BUG_STATUSES)),
+    )
+
+    total_tasks = sum(task_counts.values())
+    return {
+        'task_counts': task_counts,
+        'total_tasks': total_tasks,
+        # Percentages for the progress bars
+        'tasks_by_status': {
+            status: int((count / total_tasks) * 100) if total_tasks else 0
+            for status, count in task_counts.items()
+        },
+        'assets_by_type': assets_by_type,
+        'total_bugs': bug_counts['total'],
+        'open_bugs': bug_counts['open'],
+    }
+
+
+def get_game_stats(game):
+    """Statistics for a game, from the cache when nothing has changed"""
+    watermark = game.updated_at.timestamp() if game.updated_at else 0
+    return cache_tags.get_or_set(
+        GAME_STATS_KEY.format(pk=game.pk, watermark=watermark),
+        lambda: compute_game_stats(game),
+        # The section tag from core.cache_tags.task_tags, without the all-sections one
+        tags=[game_stats_tag(game.pk), 'tasks:game_development'],
+        timeout=GAME_STATS_TIMEOUT,
+    )
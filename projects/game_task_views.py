@@ -10,6 +10,7 @@ from .task_forms import GameDevelopmentTaskForm
 from .game_models import GameTask, GameMilestone  # Keep for backwards compatibility during transition
 from .forms import GameTaskForm  # Keep for backwards compatibility during transition
 import json
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
 
 class GameTaskStatusUpdateView(LoginRequiredMixin, UpdateView):
     """
@@ -117,7 +118,10 @@ class GameTaskBatchUpdateView(LoginRequiredMixin, UpdateView):
         task_ids = json.loads(self.request.POST.get('task_ids'))
         status = self.request.POST.get('status')
         
-        GameDevelopmentTask.objects.filter(id__in=task_ids).update(status=status)
+        try:
+            bulk_edit_from_request(self.request, GameDevelopmentTask, task_ids, {'status': status})
+        except BulkEditError as e:
+            return JsonResponse({'status': 'error', 'errors': str(e)}, status=400)
         return self.get_success_url()
     
     def form_invalid(self, form):
@@ -16,6 +16,7 @@ from .game_models import (
     GameTask, GameBuild, PlaytestSession, PlaytestFeedback, GameBug
 )
 from .models import Team
+from .game_stats import get_game_stats
 from .game_forms import (GameProjectForm, GameDesignDocumentForm, GameAssetForm,
     GameTaskForm, GameMilestoneForm, GameBuildForm, PlaytestSessionForm,
     PlaytestFeedbackForm, GameBugForm
@@ -189,43 +190,18 @@ class GameProjectDetailView(LoginRequiredMixin, DetailView):
         tasks = GameDevelopmentTask.objects.filter(game=game).order_by('-priority', 'due_date')
         context['tasks'] = tasks
         
-        # Count tasks by status
-        task_counts = {
-            'backlog': GameDevelopmentTask.objects.filter(game=game, status='backlog').count(),
-            'to_do': GameDevelopmentTask.objects.filter(game=game, status='to_do').count(),
-            'in_progress': GameDevelopmentTask.objects.filter(game=game, status='in_progress').count(),
-            'in_review': GameDevelopmentTask.objects.filter(game=game, status='in_review').count(),
-            'done': GameDevelopmentTask.objects.filter(game=game, status='done').count(),
-            'blocked': GameDevelopmentTask.objects.filter(game=game, status='blocked').count(),
-        }
-        
-        # Calculate percentages for the progress bars
-        total_tasks = sum(task_counts.values())
-        if total_tasks > 0:
-            context['tasks_by_status'] = {
-                status: int((count / total_tasks) * 100) 
-                for status, count in task_counts.items()
-            }
-        else:
-            context['tasks_by_status'] = {status: 0 for status in task_counts}
-        
-        # Get game assets
+        # Task, asset and bug counts, cached until the game or its items change
+        stats = get_game_stats(game)
+        context['tasks_by_status'] = stats['tasks_by_status']
         context['assets'] = game.assets.all()
-        context['assets_by_type'] = {
-            '3d_model': game.assets.filter(asset_type='3d_model').count(),
-            '2d_image': game.assets.filter(asset_type='2d_image').count(),
-            'music': game.assets.filter(asset_type='music').count(),
-            'video': game.assets.filter(asset_type='video').count(),
-            'reference': game.assets.filter(asset_type='reference').count(),
-            'other': game.assets.filter(asset_type='other').count(),
-        }
+        context['assets_by_type'] = stats['assets_by_type']
         
         # Get game builds
         context['builds'] = game.builds.all().order_by('-build_date')
         
         # Get bugs
         context['bugs'] = game.bugs.all().order_by('-severity')
-        context['open_bugs'] = game.bugs.filter(status__in=['open', 'confirmed', 'in_progress']).count()
+        context['open_bugs'] = stats['open_bugs']
         
         # Add status choices for the status change dropdown
         context['status_choices'] = GameProject.STATUS_CHOICES
@@ -10,6 +10,9 @@ from django.db import transaction
 
 from .game_models import GameProject, GameDesignDocument, GDDSection, GDDFeature, GameTask
 from .gdd_utils import extract_features_from_html, create_sections_and_features, convert_feature_to_task, update_gdd_html_with_task_status
+from .jobs import CONVERT_GDD_FEATURES_JOB, EXTRACT_GDD_FEATURES_JOB
+from core.job_queue import enqueue
+from core.job_views import add_job_message
 
 class ExtractFeaturesView(LoginRequiredMixin, UserPassesTestMixin, View):
     """
@@ -29,11 +32,10 @@ class ExtractFeaturesView(LoginRequiredMixin, UserPassesTestMixin, View):
             messages.error(request, "This GDD doesn't have HTML content to extract features from.")
             return redirect('games:gdd_detail', pk=gdd.game.id)
         
-        # Extract features from HTML
-        with transaction.atomic():
-            sections, features = create_sections_and_features(gdd, gdd.html_content)
-        
-        messages.success(request, f"Successfully extracted {len(features)} features from {len(sections)} sections.")
+        # Parse the HTML in a background job; an explicit extraction also
+        # restores features deleted since the last one
+        job = enqueue(EXTRACT_GDD_FEATURES_JOB, user=request.user, unique=True, gdd_id=gdd.pk, force=True)
+        add_job_message(request, job, "Extracting features in the background. Refresh the page in a moment to see them.")
         return redirect('games:gdd_detail', pk=gdd.game.id)
 
 
@@ -95,17 +97,9 @@ class ConvertAllFeaturesToTasksView(LoginRequiredMixin, UserPassesTestMixin, Vie
     def post(self, request, *args, **kwargs):
         gdd_id = self.kwargs.get('pk')
         gdd = get_object_or_404(GameDesignDocument, id=gdd_id)
-        game = gdd.game
-        
-        features = GDDFeature.objects.filter(section__gdd=gdd, task__isnull=True)
-        tasks_created = 0
-        
-        with transaction.atomic():
-            for feature in features:
-                convert_feature_to_task(feature, game)
-                tasks_created += 1
         
-        messages.success(request, f"Successfully converted {tasks_created} features to tasks.")
+        job = enqueue(CONVERT_GDD_FEATURES_JOB, user=request.user, unique=True, gdd_id=gdd.pk)
+        add_job_message(request, job, "Converting features to tasks in the background. Refresh the page in a moment to see them.")
         return redirect('games:gdd_features', pk=gdd_id)
 
 
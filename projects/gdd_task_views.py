@@ -5,9 +5,9 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.utils.decorators import method_decorator
-from django.db import transaction
 
 from .game_models import GameTask, GDDFeature
+from core.task_status import bulk_update_task_status
 
 class GDDTaskStatusUpdateView(LoginRequiredMixin, View):
     """
@@ -68,29 +68,18 @@ class BatchTaskUpdateView(LoginRequiredMixin, View):
         if not task_ids or not new_status:
             return JsonResponse({'success': False, 'error': 'Missing task IDs or status'})
         
-        try:
-            with transaction.atomic():
-                updated_count = 0
-                for task_id in task_ids:
-                    try:
-                        task = GameTask.objects.get(pk=task_id)
-                        task.status = new_status
-                        task.save()
-                        
-                        # Update linked feature if exists
-                        if hasattr(task, 'gdd_feature') and task.gdd_feature:
-                            feature = task.gdd_feature
-                            feature.status = new_status
-                            feature.save()
-                        
-                        updated_count += 1
-                    except GameTask.DoesNotExist:
-                        continue
-                
-                return JsonResponse({
-                    'success': True,
-                    'updated_count': updated_count,
-                    'message': f"Updated {updated_count} tasks to {dict(GameTask.STATUS_CHOICES).get(new_status, new_status)}"
-                })
-        except Exception as e:
-            return JsonResponse({'success': False, 'error': str(e)})
+        # One grouped UPDATE for the tasks and their linked features
+        results = bulk_update_task_status([
+            {'task_type': 'game', 'task_id': task_id, 'status': new_status}
+            for task_id in task_ids
+        ])
+        errors = {result['error'] for result in results if not result['success'] and result['code'] != 404}
+        if errors:
+            return JsonResponse({'success': False, 'error': '; '.join(sorted(errors))})
+        
+        updated_count = sum(1 for result in results if result['success'])
+        return JsonResponse({
+            'success': True,
+            'updated_count': updated_count,
+            'message': f"Updated {updated_count} tasks to {dict(GameTask.STATUS_CHOICES).get(new_status, new_status)}"
+        })
@@ -8,6 +8,9 @@ from django.db import transaction
 from .game_models import GameProject, GameDesignDocument, GameTask
 from .gdd_utils import extract_features_from_html, create_sections_and_features, convert_feature_to_task
 from .gdd_upload_form import GDDUploadForm
+from .jobs import EXTRACT_GDD_FEATURES_JOB
+from core.job_queue import enqueue
+from core.job_views import add_job_message
 
 class GDDUploadView(LoginRequiredMixin, UserPassesTestMixin, View):
     """
@@ -76,20 +79,20 @@ class GDDUploadView(LoginRequiredMixin, UserPassesTestMixin, View):
                 )
                 messages.success(request, "GDD created successfully!")
             
-            # Extract features and create sections
-            with transaction.atomic():
-                sections, features = create_sections_and_features(gdd, html_content)
+            # Extract features and create sections in a background job
+            job = enqueue(EXTRACT_GDD_FEATURES_JOB, user=request.user, unique=True, gdd_id=gdd.pk)
+            add_job_message(request, job, "Extracting features in the background. Refresh the page in a moment to see them.")
+            
+            # Auto-task creation functionality has been removed as requested
+            if auto_create_tasks:
+                messages.info(request, "The automatic task creation feature has been disabled.")
+                
+                # Log that someone tried to use this feature
+                import logging
+                logger = logging.getLogger(__name__)
+                logger.info(f"User {request.user.username} attempted to use disabled auto-task-creation feature for game {game.id}")
                 
-                # Auto-task creation functionality has been removed as requested
-                if auto_create_tasks:
-                    messages.info(request, "The automatic task creation feature has been disabled.")
-                    
-                    # Log that someone tried to use this feature
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.info(f"User {request.user.username} attempted to use disabled auto-task-creation feature for game {game.id}")
-                    
-                    # Note: We're keeping the checkbox in the form but disabling the functionality
+                # Note: We're keeping the checkbox in the form but disabling the functionality
             
             return redirect('games:gdd_detail', pk=game.id)
         
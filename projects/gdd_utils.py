@@ -1,25 +1,47 @@
-from bs4 import BeautifulSoup
+import hashlib
 import re
+
+from bs4 import BeautifulSoup, SoupStrainer
 from django.forms import formset_factory
-from .game_models import GDDSection, GDDFeature, GameTask
+
+from core.change_log import record_changes
+from .game_models import GameDesignDocument, GDDSection, GDDFeature, GameTask
 from .gdd_structured_form import GDDFeatureFormSet, GDDSubsectionFormSet, STANDARD_GDD_SECTIONS
 
+try:
+    import lxml  # noqa: F401
+    GDD_PARSER = 'lxml'
+except ImportError:
+    GDD_PARSER = 'html.parser'
+
+# Feature extraction only needs the section headings and the tables
+FEATURE_TABLE_STRAINER = SoupStrainer(['h2', 'table'])
+
+
+def gdd_content_hash(html_content):
+    """SHA-256 of a GDD's HTML, used to skip re-extracting unchanged documents"""
+    return hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+
+
 def extract_features_from_html(html_content):
     """
     Extract features from HTML content of a GDD
     Returns a list of dictionaries with feature information
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, GDD_PARSER, parse_only=FEATURE_TABLE_STRAINER)
     features = []
     
-    # Find all feature tables
-    feature_tables = soup.find_all('table', class_='feature-table')
-    
-    for table in feature_tables:
-        # Get the section title from the closest h2
-        section_header = table.find_previous('h2')
-        section_title = section_header.text.strip() if section_header else "Unknown Section"
-        section_id = section_header.get('id') if section_header else None
+    # Walk headings and tables in document order, so each feature table
+    # belongs to the closest h2 before it
+    section_title, section_id = "Unknown Section", None
+    for element in soup.find_all(['h2', 'table']):
+        if element.name == 'h2':
+            section_title = element.text.strip()
+            section_id = element.get('id')
+            continue
+        if 'feature-table' not in element.get('class', []):
+            continue
+        table = element
         
         # Extract features from the table
         rows = table.find_all('tr')
@@ -61,48 +83,79 @@ def extract_features_from_html(html_content):
     
     return features
 
-def create_sections_and_features(gdd, html_content):
+def create_sections_and_features(gdd, html_content, force=False):
     """
-    Create or update GDD sections and features from HTML content
+    Create GDD sections and features from HTML content.
+    
+    Documents whose hash matches the last extraction are skipped unless
+    force is set. Existing sections and features are loaded with one query
+    each and the missing ones inserted with bulk_create.
+    
+    Returns a dict of the document's sections by section_id and the list
+    of features created; ({}, []) when the document was skipped.
     """
+    content_hash = gdd_content_hash(html_content)
+    if not force and gdd.features_hash == content_hash:
+        return {}, []
+    
     features_data = extract_features_from_html(html_content)
+    
+    # Sections, in order of first appearance
+    section_titles = {}
+    for feature_data in features_data:
+        section_id = feature_data['section_id'] or f"section-{len(section_titles) + 1}"
+        feature_data['section_id'] = section_id
+        section_titles.setdefault(section_id, feature_data['section_title'])
+    
     sections_created = {}
-    features_created = []
+    for section in GDDSection.objects.filter(gdd=gdd, section_id__in=list(section_titles)).order_by('pk'):
+        sections_created.setdefault(section.section_id, section)
+    new_sections = [
+        GDDSection(gdd=gdd, section_id=section_id, title=title, order=order)
+        for order, (section_id, title) in enumerate(section_titles.items(), start=1)
+        if section_id not in sections_created
+    ]
+    for section in GDDSection.objects.bulk_create(new_sections):
+        sections_created[section.section_id] = section
+    
+    # Existing feature names and the next free order per section (see GDDFeature.save)
+    existing_names = set()
+    next_order = {section.pk: 1 for section in sections_created.values()}
+    existing = GDDFeature.objects.filter(section__in=list(sections_created.values())).order_by().values_list(
+        'section_id', 'feature_name', 'subsection_id', 'order'
+    )
+    for section_pk, feature_name, subsection_id, order in existing:
+        existing_names.add((section_pk, feature_name))
+        if subsection_id is None:
+            next_order[section_pk] = max(next_order[section_pk], order + 1)
     
+    priorities = [choice[0] for choice in GDDFeature.PRIORITY_CHOICES]
+    new_features = []
     for feature_data in features_data:
-        section_title = feature_data['section_title']
-        section_id = feature_data['section_id'] or f"section-{len(sections_created) + 1}"
-        
-        # Create or get section
-        if section_id not in sections_created:
-            section, created = GDDSection.objects.get_or_create(
-                gdd=gdd,
-                section_id=section_id,
-                defaults={
-                    'title': section_title,
-                    'order': len(sections_created) + 1
-                }
-            )
-            sections_created[section_id] = section
-        else:
-            section = sections_created[section_id]
+        section = sections_created[feature_data['section_id']]
+        key = (section.pk, feature_data['feature_name'])
+        if key in existing_names:
+            continue
+        existing_names.add(key)
         
-        # Create feature
         priority = feature_data.get('priority', 'medium')
-        if priority not in [choice[0] for choice in GDDFeature.PRIORITY_CHOICES]:
+        if priority not in priorities:
             priority = 'medium'
-            
-        feature, created = GDDFeature.objects.get_or_create(
+        new_features.append(GDDFeature(
             section=section,
             feature_name=feature_data['feature_name'],
-            defaults={
-                'description': feature_data['description'],
-                'priority': priority
-            }
-        )
-        
-        if created:
-            features_created.append(feature)
+            description=feature_data['description'],
+            priority=priority,
+            order=next_order[section.pk],
+        ))
+        next_order[section.pk] += 1
+    features_created = GDDFeature.objects.bulk_create(new_features)
+    
+    GameDesignDocument.objects.filter(pk=gdd.pk).update(features_hash=content_hash)
+    gdd.features_hash = content_hash
+    
+    # bulk_create and update skip the signals that record changes for sync
+    record_changes(new_sections + features_created + [gdd])
     
     return sections_created, features_created
 
@@ -155,41 +208,62 @@ def convert_feature_to_task(feature, game):
     
     return task
 
+def index_feature_status_spans(soup):
+    """
+    Map each feature name in the GDD's feature tables to the status spans
+    of its rows (the first matching row of each table), in one pass.
+    """
+    status_class = re.compile('status')
+    index = {}
+    for table in soup.find_all('table', class_='feature-table'):
+        seen = set()
+        for row in table.find_all('tr')[1:]:  # Skip header row
+            cells = row.find_all('td')
+            if not cells:
+                continue
+            name = cells[0].text.strip()
+            if name in seen:
+                continue
+            seen.add(name)
+            for cell in cells:
+                status_span = cell.find('span', class_=status_class)
+                if status_span:
+                    index.setdefault(name, []).append(status_span)
+                    break
+    return index
+
+
 def update_gdd_html_with_task_status(gdd):
     """
-    Update the HTML content of the GDD with the current task statuses
+    Update the HTML content of the GDD with the current task statuses.
+    Only status spans that differ are rewritten, and the GDD is saved
+    (html_content and its timestamp only) when something changed.
     """
     if not gdd.html_content:
         return
     
+    features = GDDFeature.objects.filter(
+        section__gdd=gdd, task__isnull=False
+    ).values_list('feature_name', 'status', 'task__status')
+    if not features:
+        return gdd.html_content
+    
     soup = BeautifulSoup(gdd.html_content, 'html.parser')
-    features = GDDFeature.objects.filter(section__gdd=gdd).select_related('task', 'section')
+    spans_by_feature = index_feature_status_spans(soup)
     
-    for feature in features:
-        if not feature.task:
-            continue
-            
-        # Find the feature in the HTML
-        feature_tables = soup.find_all('table', class_='feature-table')
-        for table in feature_tables:
-            rows = table.find_all('tr')
-            for row in rows[1:]:  # Skip header row
-                cells = row.find_all('td')
-                if len(cells) >= 1 and cells[0].text.strip() == feature.feature_name:
-                    # Found the feature, update its status
-                    status_cells = [cell for cell in cells if cell.find('span', class_=re.compile('status'))]
-                    if status_cells:
-                        status_cell = status_cells[0]
-                        status_span = status_cell.find('span', class_=re.compile('status'))
-                        if status_span:
-                            status_span.string = feature.status
-                            status_class = f"status {feature.task.status}"
-                            status_span['class'] = status_class
-                    break
+    changed = False
+    for feature_name, status, task_status in features:
+        status_class = f"status {task_status}"
+        for status_span in spans_by_feature.get(feature_name, ()):
+            if status_span.string == status and ' '.join(status_span.get('class', [])) == status_class:
+                continue
+            status_span.string = status
+            status_span['class'] = status_class
+            changed = True
     
-    # Update the GDD HTML content
-    gdd.html_content = str(soup)
-    gdd.save()
+    if changed:
+        gdd.html_content = str(soup)
+        gdd.save(update_fields=['html_content', 'updated_at'])
     
     return gdd.html_content
 
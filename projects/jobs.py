@@ -0,0 +1,51 @@
+"""
+Background job handlers for game projects (see core.job_queue)
+"""
+from django.db import transaction
+
+from core.job_queue import JobFailed, register_job, set_progress
+from .game_models import GameDesignDocument, GDDFeature
+from .gdd_utils import create_sections_and_features, convert_feature_to_task
+
+EXTRACT_GDD_FEATURES_JOB = 'projects.extract_gdd_features'
+CONVERT_GDD_FEATURES_JOB = 'projects.convert_gdd_features'
+
+
+def _get_gdd(gdd_id):
+    gdd = GameDesignDocument.objects.select_related('game').filter(pk=gdd_id).first()
+    if gdd is None:
+        raise JobFailed('The design document no longer exists.')
+    return gdd
+
+
+@register_job(EXTRACT_GDD_FEATURES_JOB)
+def extract_gdd_features(job, gdd_id, force=False):
+    gdd = _get_gdd(gdd_id)
+    if not gdd.html_content:
+        raise JobFailed("This GDD doesn't have HTML content to extract features from.")
+
+    set_progress(job, 10, 'Parsing the design document...')
+    with transaction.atomic():
+        sections, features = create_sections_and_features(gdd, gdd.html_content, force=force)
+    return {
+        'sections': len(sections),
+        'features': len(features),
+        'message': f"Successfully extracted {len(features)} features from {len(sections)} sections.",
+    }
+
+
+@register_job(CONVERT_GDD_FEATURES_JOB)
+def convert_gdd_features(job, gdd_id):
+    gdd = _get_gdd(gdd_id)
+    features = list(GDDFeature.objects.filter(section__gdd=gdd, task__isnull=True).select_related('section__gdd__game'))
+
+    # One transaction per feature: a retry resumes with the features still unconverted
+    for index, feature in enumerate(features):
+        set_progress(job, index * 100 / len(features), f'Converting {feature.feature_name}...')
+        with transaction.atomic():
+            convert_feature_to_task(feature, gdd.game)
+
+    return {
+        'tasks_created': len(features),
+        'message': f"Successfully converted {len(features)} features to tasks.",
+    }
@@ -0,0 +1,183 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from core.model_utils import get_task_model_map
+from projects.task_models import Epic
+
+SCRATCH_ALIAS = 'task_index_benchmark'
+USER_COUNT = 50
+EPIC_COUNT = 200
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the BaseTask composite indexes: seed a scratch SQLite database '
+        'with one task table, then print EXPLAIN QUERY PLAN and timings for the '
+        'common list/dashboard queries without and with the indexes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000, help='Number of tasks to seed')
+        parser.add_argument('--section', default='arcade', help='Task section whose table is benchmarked')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query; the median is reported')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the generated data')
+
+    def handle(self, *args, **options):
+        model = get_task_model_map().get(options['section'])
+        if model is None:
+            raise CommandError(f"Unknown task section '{options['section']}'")
+
+        # The project database is never touched; everything runs on a temp file
+        fd, path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        settings_dict = dict(connections['default'].settings_dict)
+        settings_dict.update(ENGINE='django.db.backends.sqlite3', NAME=path, OPTIONS={}, CONN_MAX_AGE=0)
+        connections.settings[SCRATCH_ALIAS] = settings_dict
+        scratch = connections[SCRATCH_ALIAS]
+
+        try:
+            with scratch.schema_editor() as editor:
+                # The task table plus the tables its foreign keys point at
+                editor.create_model(User)
+                editor.create_model(Epic)
+                editor.create_model(model)
+            # Start from the table without the composite indexes
+            with scratch.schema_editor() as editor:
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+
+            self.stdout.write(f"Seeding {options['tasks']} {model._meta.verbose_name_plural}...")
+            self.seed(scratch, model, options['tasks'], random.Random(options['seed']))
+
+            queries = self.build_queries(model, scratch)
+            before = self.run_queries(scratch, queries, options['repeat'])
+
+            with scratch.schema_editor() as editor:
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+            with scratch.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            after = self.run_queries(scratch, queries, options['repeat'])
+
+            self.report(queries, before, after)
+        finally:
+            scratch.close()
+            del connections[SCRATCH_ALIAS]
+            del connections.settings[SCRATCH_ALIAS]
+            os.remove(path)
+
+    def seed(self, scratch, model, total, rng):
+        """Insert total rows with a realistic spread of the filtered columns"""
+        statuses = ['backlog', 'to_do', 'to_do', 'in_progress', 'in_review', 'done', 'done', 'done', 'blocked']
+        priorities = ['low', 'medium', 'medium', 'high', 'critical']
+        today = date.today()
+        now = timezone.now().isoformat()
+
+        def task_values(i):
+            is_subtask = i > 100 and rng.random() < 0.2
+            return {
+                'title': f'Task {i}',
+                'status': rng.choice(statuses),
+                'priority': rng.choice(priorities),
+                'due_date': (today + timedelta(days=rng.randint(-90, 180))).isoformat() if rng.random() < 0.8 else None,
+                'assigned_to_id': rng.randint(1, USER_COUNT) if rng.random() < 0.7 else None,
+                'epic_id': rng.randint(1, EPIC_COUNT) if not is_subtask and rng.random() < 0.5 else None,
+                'task_level': 'subtask' if is_subtask else 'task',
+                'parent_task_id': rng.randint(1, 100) if is_subtask else None,
+                'created_at': now,
+                'updated_at': now,
+            }
+
+        with transaction.atomic(using=SCRATCH_ALIAS):
+            self.insert_rows(scratch, User, USER_COUNT, lambda i: {
+                'username': f'user{i}', 'password': '', 'date_joined': now,
+            })
+            self.insert_rows(scratch, Epic, EPIC_COUNT, lambda i: {
+                'title': f'Epic {i}', 'company_section': 'arcade',
+                'created_at': now, 'updated_at': now,
+            })
+            self.insert_rows(scratch, model, total, task_values)
+
+    def insert_rows(self, scratch, model, total, make_values):
+        """Insert total rows of model, filling unspecified columns with their defaults"""
+        fields = [f for f in model._meta.local_concrete_fields if not f.primary_key]
+        columns = ', '.join(scratch.ops.quote_name(f.column) for f in fields)
+        placeholders = ', '.join(['%s'] * len(fields))
+        sql = f'INSERT INTO {scratch.ops.quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+        defaults = {f.attname: self.default_value(f, scratch) for f in fields}
+
+        with scratch.cursor() as cursor:
+            batch = []
+            for i in range(1, total + 1):
+                values = dict(defaults, **make_values(i))
+                batch.append([values[f.attname] for f in fields])
+                if len(batch) >= 5000:
+                    cursor.executemany(sql, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+
+    def default_value(self, field, scratch):
+        if field.has_default():
+            return field.get_db_prep_save(field.get_default(), scratch)
+        if field.null:
+            return None
+        return ''
+
+    def build_queries(self, model, scratch):
+        """The filters and sorts the department lists and dashboards run"""
+        today = date.today()
+        querysets = [
+            ('status + due date', model.objects.filter(status='in_progress').order_by('due_date')),
+            ('assignee + status', model.objects.filter(assigned_to_id=7, status='to_do')),
+            ('epic status counts', model.objects.filter(epic_id=42).values('status').annotate(total=Count('id'))),
+            ('subtasks of a task', model.objects.filter(task_level='subtask', parent_task_id=17)),
+            ('overdue open tasks', model.objects.filter(status__in=['to_do', 'in_progress'], due_date__lt=today)),
+            ('priority ordering, first page', model.objects.order_by('-priority', 'due_date', 'title')[:50]),
+        ]
+        return [
+            (label,) + queryset.query.get_compiler(connection=scratch).as_sql()
+            for label, queryset in querysets
+        ]
+
+    def run_queries(self, scratch, queries, repeat):
+        results = {}
+        with scratch.cursor() as cursor:
+            for label, sql, params in queries:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in cursor.fetchall()]
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                    timings.append((time.perf_counter() - start) * 1000)
+                results[label] = (plan, statistics.median(timings))
+        return results
+
+    def report(self, queries, before, after):
+        for label, sql, params in queries:
+            plan_before, ms_before = before[label]
+            plan_after, ms_after = after[label]
+            self.stdout.write('')
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write('  without indexes:')
+            for line in plan_before:
+                self.stdout.write(f'    {line}')
+            self.stdout.write('  with indexes:')
+            for line in plan_after:
+                self.stdout.write(f'    {line}')
+            speedup = ms_before / ms_after if ms_after else float('inf')
+            self.stdout.write(f'  {ms_before:.2f} ms -> {ms_after:.2f} ms ({speedup:.1f}x)')
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
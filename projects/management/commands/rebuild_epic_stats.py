@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from projects.epic_stats import rebuild_epic_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the task, done and subtask roll-ups of every epic'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding epic stats...')
+        count = rebuild_epic_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {count} epics'))
@@ -0,0 +1,159 @@
+# Generated by Django 5.2.3 on 2026-10-18 15:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0102_gameproject_is_archived'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='arcadetask',
+            options={'ordering': ['-priority', 'due_date', 'title'], 'verbose_name': 'Arcade Task', 'verbose_name_plural': 'Arcade Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='educationtask',
+            options={'ordering': ['-priority', 'due_date', 'title'], 'verbose_name': 'Education Task', 'verbose_name_plural': 'Education Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='gamedevelopmenttask',
+            options={'ordering': ['-priority', 'due_date', 'title'], 'verbose_name': 'Game Development Task', 'verbose_name_plural': 'Game Development Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='r1d3task',
+            options={'ordering': ['-priority', 'due_date', 'title'], 'verbose_name': 'R1D3 Task', 'verbose_name_plural': 'R1D3 Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='socialmediatask',
+            options={'ordering': ['-priority', 'due_date', 'title'], 'verbose_name': 'Social Media Task', 'verbose_name_plural': 'Social Media Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='themeparktask',
+            options={'ordering': ['-priority', 'due_date', 'title'], 'verbose_name': 'Theme Park Task', 'verbose_name_plural': 'Theme Park Tasks'},
+        ),
+        migrations.AddIndex(
+            model_name='arcadetask',
+            index=models.Index(fields=['status', 'due_date'], name='projects_ar_status_5d08b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='arcadetask',
+            index=models.Index(fields=['assigned_to', 'status'], name='projects_ar_assigne_27dd8a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='arcadetask',
+            index=models.Index(fields=['epic', 'status'], name='projects_ar_epic_id_0a81bd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='arcadetask',
+            index=models.Index(fields=['task_level', 'parent_task'], name='projects_ar_task_le_25c4af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='arcadetask',
+            index=models.Index(fields=['-priority', 'due_date', 'title'], name='projects_ar_priorit_8b73d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='educationtask',
+            index=models.Index(fields=['status', 'due_date'], name='projects_ed_status_844b08_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='educationtask',
+            index=models.Index(fields=['assigned_to', 'status'], name='projects_ed_assigne_36e9b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='educationtask',
+            index=models.Index(fields=['epic', 'status'], name='projects_ed_epic_id_0bb9db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='educationtask',
+            index=models.Index(fields=['task_level', 'parent_task'], name='projects_ed_task_le_3c9867_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='educationtask',
+            index=models.Index(fields=['-priority', 'due_date', 'title'], name='projects_ed_priorit_523fc9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamedevelopmenttask',
+            index=models.Index(fields=['status', 'due_date'], name='projects_ga_status_b1cca2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamedevelopmenttask',
+            index=models.Index(fields=['assigned_to', 'status'], name='projects_ga_assigne_d64bf3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamedevelopmenttask',
+            index=models.Index(fields=['epic', 'status'], name='projects_ga_epic_id_bbb402_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamedevelopmenttask',
+            index=models.Index(fields=['task_level', 'parent_task'], name='projects_ga_task_le_b2378a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamedevelopmenttask',
+            index=models.Index(fields=['-priority', 'due_date', 'title'], name='projects_ga_priorit_6ddca3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='r1d3task',
+            index=models.Index(fields=['status', 'due_date'], name='projects_r1_status_ee0089_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='r1d3task',
+            index=models.Index(fields=['assigned_to', 'status'], name='projects_r1_assigne_b8b310_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='r1d3task',
+            index=models.Index(fields=['epic', 'status'], name='projects_r1_epic_id_15b815_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='r1d3task',
+            index=models.Index(fields=['task_level', 'parent_task'], name='projects_r1_task_le_439e83_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='r1d3task',
+            index=models.Index(fields=['-priority', 'due_date', 'title'], name='projects_r1_priorit_80c451_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmediatask',
+            index=models.Index(fields=['status', 'due_date'], name='projects_so_status_e5ecac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmediatask',
+            index=models.Index(fields=['assigned_to', 'status'], name='projects_so_assigne_6fb4b5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmediatask',
+            index=models.Index(fields=['epic', 'status'], name='projects_so_epic_id_a25181_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmediatask',
+            index=models.Index(fields=['task_level', 'parent_task'], name='projects_so_task_le_91c4cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmediatask',
+            index=models.Index(fields=['-priority', 'due_date', 'title'], name='projects_so_priorit_f3d976_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='themeparktask',
+            index=models.Index(fields=['status', 'due_date'], name='projects_th_status_3461c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='themeparktask',
+            index=models.Index(fields=['assigned_to', 'status'], name='projects_th_assigne_04cc96_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='themeparktask',
+            index=models.Index(fields=['epic', 'status'], name='projects_th_epic_id_cbc099_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='themeparktask',
+            index=models.Index(fields=['task_level', 'parent_task'], name='projects_th_task_le_99e0fb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='themeparktask',
+            index=models.Index(fields=['-priority', 'due_date', 'title'], name='projects_th_priorit_749b49_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+EPIC_TASK_MODELS = [
+    ('projects', 'GameDevelopmentTask'),
+    ('projects', 'EducationTask'),
+    ('projects', 'SocialMediaTask'),
+    ('projects', 'ArcadeTask'),
+    ('projects', 'ThemeParkTask'),
+    ('projects', 'R1D3Task'),
+    ('indie_news', 'IndieNewsTask'),
+]
+
+
+def backfill_epic_stats(apps, schema_editor):
+    Epic = apps.get_model('projects', 'Epic')
+    EpicStats = apps.get_model('projects', 'EpicStats')
+
+    totals = {epic_id: [0, 0, 0] for epic_id in Epic.objects.values_list('pk', flat=True)}
+    for app_label, model_name in EPIC_TASK_MODELS:
+        model = apps.get_model(app_label, model_name)
+        for epic_id, status in model.objects.filter(epic__isnull=False).values_list('epic_id', 'status'):
+            totals[epic_id][0] += 1
+            totals[epic_id][1] += status == 'done'
+        for epic_id in model.objects.filter(parent_task__epic__isnull=False).values_list('parent_task__epic_id', flat=True):
+            totals[epic_id][2] += 1
+
+    EpicStats.objects.bulk_create([
+        EpicStats(epic_id=epic_id, task_count=tasks, done_count=done, subtask_count=subtasks)
+        for epic_id, (tasks, done, subtasks) in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0103_task_filter_indexes'),
+        ('indie_news', '0006_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EpicStats',
+            fields=[
+                ('epic', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='projects.epic')),
+                ('task_count', models.PositiveIntegerField(default=0)),
+                ('done_count', models.PositiveIntegerField(default=0)),
+                ('subtask_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Epic Stats',
+                'verbose_name_plural': 'Epic Stats',
+            },
+        ),
+        migrations.RunPython(backfill_epic_stats, migrations.RunPython.noop),
+    ]
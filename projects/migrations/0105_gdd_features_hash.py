@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0104_epic_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamedesigndocument',
+            name='features_hash',
+            field=models.CharField(blank=True, help_text='Hash of the HTML content features were last extracted from', max_length=64),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0105_gdd_features_hash'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='arcadetask',
+            options={'ordering': [], 'verbose_name': 'Arcade Task', 'verbose_name_plural': 'Arcade Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='educationtask',
+            options={'ordering': [], 'verbose_name': 'Education Task', 'verbose_name_plural': 'Education Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='gamedevelopmenttask',
+            options={'ordering': [], 'verbose_name': 'Game Development Task', 'verbose_name_plural': 'Game Development Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='r1d3task',
+            options={'ordering': [], 'verbose_name': 'R1D3 Task', 'verbose_name_plural': 'R1D3 Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='socialmediatask',
+            options={'ordering': [], 'verbose_name': 'Social Media Task', 'verbose_name_plural': 'Social Media Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='themeparktask',
+            options={'ordering': [], 'verbose_name': 'Theme Park Task', 'verbose_name_plural': 'Theme Park Tasks'},
+        ),
+    ]
@@ -18,6 +18,7 @@ from .task_models import R1D3Task
 from .task_forms import R1D3TaskForm
 from django.contrib.auth.models import User
 from .models import Team
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
 
 
 class R1D3TaskDashboardView(LoginRequiredMixin, ListView):
@@ -173,46 +174,18 @@ class R1D3TaskBatchUpdateView(LoginRequiredMixin, UpdateView):
         task_ids = data.get('task_ids', [])
         update_data = data.get('update_data', {})
         
-        # Remove empty fields
-        update_data = {k: v for k, v in update_data.items() if v}
-        
         if not task_ids or not update_data:
             return JsonResponse({'status': 'error', 'message': 'No tasks or update data provided'})
         
-        # Get tasks to update
-        tasks = R1D3Task.objects.filter(id__in=task_ids)
-        
-        # Handle special fields
-        if 'assigned_to' in update_data and update_data['assigned_to']:
-            try:
-                user = User.objects.get(id=update_data['assigned_to'])
-                update_data['assigned_to'] = user
-            except User.DoesNotExist:
-                del update_data['assigned_to']
-                
-        # Handle team field
-        if 'team' in update_data:
-            if update_data['team'] == 'no_team':
-                update_data['team'] = None
-            elif update_data['team']:
-                try:
-                    team = Team.objects.get(id=update_data['team'])
-                    update_data['team'] = team
-                except Team.DoesNotExist:
-                    del update_data['team']
-        
-        # Update tasks
-        updated_count = 0
-        for task in tasks:
-            for field, value in update_data.items():
-                setattr(task, field, value)
-            task.save()
-            updated_count += 1
+        try:
+            result = bulk_edit_from_request(request, R1D3Task, task_ids, update_data, extra_fields=('department', 'impact_level'))
+        except BulkEditError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)})
         
         return JsonResponse({
             'status': 'success',
-            'message': f'Updated {updated_count} tasks successfully',
-            'updated_count': updated_count
+            'message': f'Updated {result.updated_count} tasks successfully',
+            'updated_count': result.updated_count
         })
 
 
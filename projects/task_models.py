@@ -71,40 +71,59 @@ class Epic(models.Model):
     
     def get_all_tasks(self):
         """Get all tasks across all task types for this epic"""
-        from .task_models import (
-            GameDevelopmentTask, EducationTask, SocialMediaTask,
-            ArcadeTask, ThemeParkTask, R1D3Task
-        )
-        from indie_news.models import IndieNewsTask
+        from .epic_stats import get_epic_task_models
         
         tasks = []
-        for model in [GameDevelopmentTask, EducationTask, SocialMediaTask, 
-                      ArcadeTask, ThemeParkTask, R1D3Task, IndieNewsTask]:
+        for model in get_epic_task_models():
             tasks.extend(list(model.objects.filter(epic=self)))
         return tasks
     
+    def get_stats(self):
+        """Task roll-ups for this epic, computed on first use"""
+        try:
+            return self.stats
+        except EpicStats.DoesNotExist:
+            from .epic_stats import refresh_epic_stats
+            self.stats = refresh_epic_stats([self.pk])[self.pk]
+            return self.stats
+    
     def get_progress(self):
         """Calculate epic progress based on completed tasks"""
-        tasks = self.get_all_tasks()
-        if not tasks:
-            return 0
-        completed = sum(1 for t in tasks if t.status == 'done')
-        total = len(tasks)
-        return int((completed / total) * 100) if total > 0 else 0
+        return self.get_stats().progress
     
     def get_task_count(self):
         """Get total number of tasks in this epic"""
-        return len(self.get_all_tasks())
+        return self.get_stats().task_count
     
     def get_subtask_count(self):
         """Get total number of subtasks across all tasks"""
-        count = 0
-        for task in self.get_all_tasks():
-            # Use the dynamic related name
-            related_name = f"{task.__class__.__name__.lower()}_subtasks"
-            if hasattr(task, related_name):
-                count += getattr(task, related_name).count()
-        return count
+        return self.get_stats().subtask_count
+
+
+class EpicStats(models.Model):
+    """
+    Denormalised task counts for an epic, kept current by task signals.
+    See projects.epic_stats.
+    """
+    epic = models.OneToOneField(Epic, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    task_count = models.PositiveIntegerField(default=0)
+    done_count = models.PositiveIntegerField(default=0)
+    subtask_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Epic Stats'
+        verbose_name_plural = 'Epic Stats'
+    
+    def __str__(self):
+        return f"Stats for epic {self.epic_id}"
+    
+    @property
+    def progress(self):
+        """Percentage of the epic's tasks that are done"""
+        if not self.task_count:
+            return 0
+        return int((self.done_count / self.task_count) * 100)
 
 class BaseTask(models.Model):
     """
@@ -199,6 +218,17 @@ class BaseTask(models.Model):
     class Meta:
         abstract = True
         ordering = ['-priority', 'due_date', 'title']
+        # Composite indexes for the filters every department list and
+        # dashboard uses. Subclass Metas must extend BaseTask.Meta to get them,
+        # and set ordering = [] to keep the section task models unordered by
+        # default (priority values would sort alphabetically).
+        indexes = [
+            models.Index(fields=['status', 'due_date']),
+            models.Index(fields=['assigned_to', 'status']),
+            models.Index(fields=['epic', 'status']),
+            models.Index(fields=['task_level', 'parent_task']),
+            models.Index(fields=['-priority', 'due_date', 'title']),
+        ]
     
     def __str__(self):
         return self.title
@@ -220,23 +250,32 @@ class BaseTask(models.Model):
         }
         return status_percentages.get(self.status, 0)
     
+    def get_subtasks(self):
+        """Get this task's subtasks, from prefetch_task_subtasks when available"""
+        if hasattr(self, 'subtasks_cached'):
+            return self.subtasks_cached
+        from core.task_utils import get_task_subtasks
+        return list(get_task_subtasks(self))
+    
     def get_subtask_count(self):
         """Get number of subtasks"""
-        return self.subtasks.count() if hasattr(self, 'subtasks') else 0
+        return len(self.get_subtasks())
     
     def get_completed_subtask_count(self):
         """Get number of completed subtasks"""
-        if not hasattr(self, 'subtasks'):
-            return 0
-        return self.subtasks.filter(status='done').count()
+        if hasattr(self, 'completed_subtask_count'):
+            return self.completed_subtask_count
+        return sum(1 for subtask in self.get_subtasks() if subtask.is_completed)
     
     def get_subtask_progress(self):
         """Get subtask completion percentage"""
-        total = self.get_subtask_count()
-        if total == 0:
+        if hasattr(self, 'subtask_progress'):
+            return self.subtask_progress
+        subtasks = self.get_subtasks()
+        if not subtasks:
             return 100  # No subtasks means task itself determines progress
-        completed = self.get_completed_subtask_count()
-        return int((completed / total) * 100)
+        completed = sum(1 for subtask in subtasks if subtask.is_completed)
+        return int((completed / len(subtasks)) * 100)
     
     def is_task_level(self):
         """Check if this is a task (not epic or subtask)"""
@@ -291,7 +330,8 @@ class R1D3Task(BaseTask):
     impact_level = models.CharField(max_length=50, blank=True)
     strategic_goal = models.CharField(max_length=255, blank=True)
     
-    class Meta:
+    class Meta(BaseTask.Meta):
+        ordering = []
         verbose_name = "R1D3 Task"
         verbose_name_plural = "R1D3 Tasks"
 
@@ -319,7 +359,8 @@ class GameDevelopmentTask(BaseTask):
     platform = models.CharField(max_length=100, blank=True)
     build_version = models.CharField(max_length=50, blank=True)
     
-    class Meta:
+    class Meta(BaseTask.Meta):
+        ordering = []
         verbose_name = "Game Development Task"
         verbose_name_plural = "Game Development Tasks"
 
@@ -333,7 +374,8 @@ class EducationTask(BaseTask):
     target_audience = models.CharField(max_length=100, blank=True)
     educational_level = models.CharField(max_length=50, blank=True)
     
-    class Meta:
+    class Meta(BaseTask.Meta):
+        ordering = []
         verbose_name = "Education Task"
         verbose_name_plural = "Education Tasks"
 
@@ -348,7 +390,8 @@ class SocialMediaTask(BaseTask):
     target_metrics = models.TextField(blank=True)
     content_type = models.CharField(max_length=50, blank=True)
     
-    class Meta:
+    class Meta(BaseTask.Meta):
+        ordering = []
         verbose_name = "Social Media Task"
         verbose_name_plural = "Social Media Tasks"
 
@@ -362,7 +405,8 @@ class ArcadeTask(BaseTask):
     maintenance_type = models.CharField(max_length=100, blank=True)
     machine_model = models.CharField(max_length=100, blank=True)
     
-    class Meta:
+    class Meta(BaseTask.Meta):
+        ordering = []
         verbose_name = "Arcade Task"
         verbose_name_plural = "Arcade Tasks"
 
@@ -376,6 +420,7 @@ class ThemeParkTask(BaseTask):
     task_type = models.CharField(max_length=100, blank=True)
     safety_priority = models.CharField(max_length=50, blank=True)
     
-    class Meta:
+    class Meta(BaseTask.Meta):
+        ordering = []
         verbose_name = "Theme Park Task"
         verbose_name_plural = "Theme Park Tasks"
@@ -0,0 +1,152 @@
+"""
+Polymorphic queries over the section task tables.
+
+Every section keeps its tasks in its own table, but they all share the
+BaseTask columns. TaskUnionQuery selects those columns from each table
+and combines them with one UNION ALL, so filtering, ordering, counting
+and pagination all happen in the database instead of in Python.
+"""
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Case, CharField, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from core.model_utils import get_task_model_map
+from .task_models import BaseTask
+
+# BaseTask columns selected from every section table
+TASK_ROW_FIELDS = (
+    'id', 'title', 'status', 'priority', 'due_date', 'task_level',
+    'assigned_to_id', 'assigned_to_name', 'epic_id', 'created_at', 'updated_at',
+)
+
+# Lower rank sorts first (critical > high > medium > low)
+PRIORITY_RANKS = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+# Default ordering: by priority, then due date with undated tasks last
+PRIORITY_ORDERING = ('priority_rank', 'due_date_missing', 'due_date', 'title')
+
+
+def _priority_rank():
+    return Case(
+        *[When(priority=priority, then=Value(rank)) for priority, rank in PRIORITY_RANKS.items()],
+        default=Value(len(PRIORITY_RANKS)),
+        output_field=IntegerField(),
+    )
+
+
+def _due_date_missing():
+    return Case(
+        When(due_date__isnull=True, then=Value(1)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+class TaskRow:
+    """Lightweight, read-only view of one task row from a union query"""
+
+    _status_labels = dict(BaseTask.STATUS_CHOICES)
+    _priority_labels = dict(BaseTask.PRIORITY_CHOICES)
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+    @property
+    def task_type(self):
+        return self.section
+
+    def get_status_display(self):
+        return self._status_labels.get(self.status, self.status)
+
+    def get_priority_display(self):
+        return self._priority_labels.get(self.priority, self.priority)
+
+    def is_overdue(self):
+        if self.due_date and self.status not in ['done', 'blocked']:
+            return self.due_date < timezone.now().date()
+        return False
+
+    def __repr__(self):
+        return f"<TaskRow {self.section}:{self.id} {self.title!r}>"
+
+
+class TaskUnionQuery:
+    """
+    Builder for a UNION ALL query over the section task tables.
+
+    Filters are applied to every branch of the union; ordering is applied
+    to the combined result. Instances are immutable, so filter() and
+    order_by() return new builders.
+    """
+
+    def __init__(self, sections=None):
+        model_map = get_task_model_map()
+        if sections is not None:
+            model_map = {section: model_map[section] for section in sections if section in model_map}
+        if not model_map:
+            raise ValueError("TaskUnionQuery needs at least one task section")
+        self.models = model_map
+        self.filters = ()
+        self.ordering = PRIORITY_ORDERING
+
+    def _clone(self, **changes):
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__, **changes)
+        return clone
+
+    def filter(self, *args, **kwargs):
+        """Restrict every section table with the given lookups"""
+        return self._clone(filters=self.filters + (Q(*args, **kwargs),))
+
+    def order_by(self, *fields):
+        """Order the combined rows; fields must be selected columns"""
+        return self._clone(ordering=fields)
+
+    def _branch(self, section, model):
+        return (
+            model.objects.filter(*self.filters)
+            .order_by()
+            .annotate(
+                section=Value(section, output_field=CharField()),
+                priority_rank=_priority_rank(),
+                due_date_missing=_due_date_missing(),
+            )
+            .values(*TASK_ROW_FIELDS, 'section', 'priority_rank', 'due_date_missing')
+        )
+
+    def queryset(self):
+        """Return the ordered UNION ALL queryset of row dicts"""
+        branches = [self._branch(section, model) for section, model in self.models.items()]
+        first, *rest = branches
+        combined = first.union(*rest, all=True) if rest else first
+        return combined.order_by(*self.ordering)
+
+    def count(self):
+        return self.queryset().count()
+
+    def rows(self, queryset=None):
+        """Wrap row dicts from the union queryset in TaskRow objects"""
+        return [TaskRow(values) for values in (queryset if queryset is not None else self.queryset())]
+
+    def page(self, number, per_page=20):
+        """Return a Paginator page whose object_list holds TaskRow objects"""
+        page = Paginator(self.queryset(), per_page).get_page(number)
+        page.object_list = self.rows(page.object_list)
+        return page
+
+    def counts_by(self, field):
+        """
+        Return a dict of value -> number of rows for one selected column,
+        computed with a single GROUP BY over the union.
+        """
+        if field not in TASK_ROW_FIELDS + ('section',):
+            raise ValueError(f"Cannot group task rows by '{field}'")
+        sql, params = self.queryset().order_by().query.sql_with_params()
+        column = connection.ops.quote_name(field)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {column}, COUNT(*) FROM ({sql}) task_rows GROUP BY {column}",
+                params,
+            )
+            return dict(cursor.fetchall())
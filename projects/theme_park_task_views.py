@@ -17,6 +17,7 @@ from datetime import date, timedelta
 from .task_models import ThemeParkTask
 from .task_forms import ThemeParkTaskForm
 from django.contrib.auth.models import User
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
 
 
 class ThemeParkTaskDashboardView(LoginRequiredMixin, ListView):
@@ -162,35 +163,18 @@ class ThemeParkTaskBatchUpdateView(LoginRequiredMixin, UpdateView):
         task_ids = data.get('task_ids', [])
         update_data = data.get('update_data', {})
         
-        # Remove empty fields
-        update_data = {k: v for k, v in update_data.items() if v}
-        
         if not task_ids or not update_data:
             return JsonResponse({'status': 'error', 'message': 'No tasks or update data provided'})
         
-        # Get tasks to update
-        tasks = ThemeParkTask.objects.filter(id__in=task_ids)
-        
-        # Handle special fields
-        if 'assigned_to' in update_data and update_data['assigned_to']:
-            try:
-                user = User.objects.get(id=update_data['assigned_to'])
-                update_data['assigned_to'] = user
-            except User.DoesNotExist:
-                del update_data['assigned_to']
-        
-        # Update tasks
-        updated_count = 0
-        for task in tasks:
-            for field, value in update_data.items():
-                setattr(task, field, value)
-            task.save()
-            updated_count += 1
+        try:
+            result = bulk_edit_from_request(request, ThemeParkTask, task_ids, update_data, extra_fields=('zone',))
+        except BulkEditError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)})
         
         return JsonResponse({
             'status': 'success',
-            'message': f'Updated {updated_count} tasks successfully',
-            'updated_count': updated_count
+            'message': f'Updated {result.updated_count} tasks successfully',
+            'updated_count': result.updated_count
         })
 
 
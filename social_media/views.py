@@ -1,7 +1,6 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import TemplateView, ListView, View, DetailView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, Q
 from django.utils import timezone
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
@@ -15,7 +14,8 @@ from core.mixins import BreadcrumbMixin
 from projects.game_models import GameTask
 from projects.task_models import SocialMediaTask
 from projects.task_forms import SocialMediaTaskForm
-from django.contrib.auth.models import User
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
+from core.dashboard_stats import assignable_users, get_task_stats, group_choices, task_stats_context
 
 
 class SocialMediaDashboardView(LoginRequiredMixin, TemplateView):
@@ -263,65 +263,28 @@ class SocialMediaTaskBatchUpdateView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
-            task_ids = data.get('task_ids', [])
-            update_data = data.get('update_data', {})
-            
-            if not task_ids or not update_data:
-                return JsonResponse({'success': False, 'message': 'No tasks or update data provided'}, status=400)
-            
-            # Filter tasks by ID and ensure they are social media tasks
-            tasks = GameTask.objects.filter(id__in=task_ids, company_section='social_media')
-            
-            if not tasks.exists():
-                return JsonResponse({'success': False, 'message': 'No valid social media tasks found'}, status=404)
-            
-            # Process update data
-            update_fields = {}
-            
-            if 'status' in update_data and update_data['status']:
-                update_fields['status'] = update_data['status']
-                
-            if 'priority' in update_data and update_data['priority']:
-                update_fields['priority'] = update_data['priority']
-                
-            if 'assigned_to' in update_data:
-                if update_data['assigned_to'] == 'unassigned':
-                    update_fields['assigned_to'] = None
-                elif update_data['assigned_to']:
-                    try:
-                        user = User.objects.get(id=update_data['assigned_to'])
-                        update_fields['assigned_to'] = user
-                    except User.DoesNotExist:
-                        pass
-                        
-            if 'due_date' in update_data:
-                if update_data['due_date'] == 'no_date':
-                    update_fields['due_date'] = None
-                elif update_data['due_date']:
-                    update_fields['due_date'] = update_data['due_date']
-                    
-            if 'campaign_id' in update_data and update_data['campaign_id']:
-                update_fields['campaign_id'] = update_data['campaign_id']
-                
-            if 'channel' in update_data and update_data['channel']:
-                update_fields['channel'] = update_data['channel']
-            
-            # Apply updates
-            if update_fields:
-                tasks.update(**update_fields)
-                
-                return JsonResponse({
-                    'success': True,
-                    'message': f'Successfully updated {tasks.count()} tasks',
-                    'updated_count': tasks.count()
-                })
-            else:
-                return JsonResponse({'success': False, 'message': 'No valid update fields provided'}, status=400)
-                
         except json.JSONDecodeError:
             return JsonResponse({'success': False, 'message': 'Invalid JSON data'}, status=400)
-        except Exception as e:
-            return JsonResponse({'success': False, 'message': f'Error: {str(e)}'}, status=500)
+        
+        task_ids = data.get('task_ids', [])
+        update_data = data.get('update_data', {})
+        if not task_ids or not update_data:
+            return JsonResponse({'success': False, 'message': 'No tasks or update data provided'}, status=400)
+        
+        try:
+            result = bulk_edit_from_request(request, SocialMediaTask, task_ids, update_data, extra_fields=('campaign_id', 'channel'))
+        except BulkEditError as e:
+            return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        
+        if not result.updated_count:
+            return JsonResponse({'success': False, 'message': 'No valid social media tasks found'}, status=404)
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Successfully updated {result.updated_count} tasks',
+            'updated_count': result.updated_count
+        })
+
 
 class SocialMediaTasksView(BreadcrumbMixin, LoginRequiredMixin, ListView):
     """View for displaying social media-specific tasks in a dashboard format"""
@@ -395,78 +358,15 @@ class SocialMediaTasksView(BreadcrumbMixin, LoginRequiredMixin, ListView):
         context['active_department'] = 'social_media'
         context['section_name'] = "Social Media Tasks"
         
-        # Get all social media tasks for statistics
-        all_social_media_tasks = SocialMediaTask.objects.all()
-        
-        # Task statistics by status
-        total_count = all_social_media_tasks.count()
-        backlog_count = all_social_media_tasks.filter(status='backlog').count()
-        to_do_count = all_social_media_tasks.filter(status='to_do').count()
-        in_progress_count = all_social_media_tasks.filter(status='in_progress').count()
-        in_review_count = all_social_media_tasks.filter(status='in_review').count()
-        done_count = all_social_media_tasks.filter(status='done').count()
-        blocked_count = all_social_media_tasks.filter(status='blocked').count()
-        
-        # Calculate percentages (rounded to nearest 10 for CSS classes)
-        def calculate_percentage(count):
-            if total_count == 0:
-                return 0
-            percentage = (count / total_count) * 100
-            # Round to nearest 10 for CSS classes
-            return round(percentage / 10) * 10
-        
-        task_stats = {
-            'total': total_count,
-            'backlog': backlog_count,
-            'to_do': to_do_count,
-            'in_progress': in_progress_count,
-            'in_review': in_review_count,
-            'done': done_count,
-            'blocked': blocked_count,
-            # Add percentages rounded to nearest 10 for CSS classes
-            'backlog_percent': calculate_percentage(backlog_count),
-            'to_do_percent': calculate_percentage(to_do_count),
-            'in_progress_percent': calculate_percentage(in_progress_count),
-            'in_review_percent': calculate_percentage(in_review_count),
-            'done_percent': calculate_percentage(done_count),
-            'blocked_percent': calculate_percentage(blocked_count),
-        }
-        context['task_stats'] = task_stats
-        
-        # Get distinct campaigns from social media tasks
-        campaigns = SocialMediaTask.objects.values('campaign_id').annotate(
-            count=Count('id')
-        ).order_by('campaign_id')
-        
-        # Format campaigns for template
-        formatted_campaigns = []
-        for campaign in campaigns:
-            if campaign['campaign_id']:
-                formatted_campaigns.append({
-                    'id': campaign['campaign_id'],
-                    'title': campaign['campaign_id'],
-                    'count': campaign['count']
-                })
-        context['campaigns'] = formatted_campaigns
-        
-        # Get distinct channels from social media tasks
-        channels = SocialMediaTask.objects.values('channel').annotate(
-            count=Count('id')
-        ).order_by('channel')
-        
-        # Format channels for template
-        formatted_channels = []
-        for channel in channels:
-            if channel['channel']:
-                formatted_channels.append({
-                    'id': channel['channel'],
-                    'title': channel['channel'],
-                    'count': channel['count']
-                })
-        context['channels'] = formatted_channels
+        # Task statistics, campaign and channel counts in two cached queries
+        stats = get_task_stats(SocialMediaTask, group_fields=('campaign_id', 'channel'))
+        # Percentages rounded to nearest 10 for CSS classes
+        context['task_stats'] = task_stats_context(stats, percent_step=10)
+        context['campaigns'] = group_choices(stats, 'campaign_id')
+        context['channels'] = group_choices(stats, 'channel')
         
-        # Get all users for assignment filter
-        context['users'] = User.objects.filter(is_active=True).order_by('first_name', 'last_name')
+        # Get active users for assignment filter
+        context['users'] = assignable_users()
         
         # Add today's date for due date comparisons
         context['today'] = date.today()
@@ -0,0 +1,69 @@
+/**
+ * Background job polling (see core.job_queue)
+ *
+ * Views that hand slow work to a background job answer 202 with a
+ * status_url. fetchJobResult resolves with the view's JSON, or with the
+ * job's result once polling sees it finish. Error responses resolve with
+ * { success: false } and their message; pollJob rejects when the status
+ * URL answers with an error, instead of polling it forever.
+ */
+
+function errorMessage(response, data) {
+    return data.message || data.error || `Request failed (${response.status} ${response.statusText})`;
+}
+
+function readJson(response) {
+    // Error pages may not be JSON
+    return response.json().catch(() => ({}));
+}
+
+function pollJob(statusUrl, onProgress, interval = 1000) {
+    return new Promise((resolve, reject) => {
+        function poll() {
+            fetch(statusUrl, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+                .then(response => {
+                    if (!response.ok) {
+                        return readJson(response).then(data => {
+                            throw new Error(errorMessage(response, data));
+                        });
+                    }
+                    return response.json();
+                })
+                .then(job => {
+                    if (onProgress) {
+                        onProgress(job);
+                    }
+                    if (!job.finished) {
+                        setTimeout(poll, interval);
+                    } else if (job.success) {
+                        resolve(job.result);
+                    } else {
+                        resolve({ success: false, message: job.error, details: [] });
+                    }
+                })
+                .catch(reject);
+        }
+        poll();
+    });
+}
+
+function fetchJobResult(response, onProgress) {
+    if (!response.ok) {
+        return readJson(response).then(data => ({
+            ...data, success: false, message: errorMessage(response, data), details: data.details || []
+        }));
+    }
+    return response.json().then(data => {
+        if (response.status !== 202 || !data.status_url) {
+            return data;
+        }
+        return pollJob(data.status_url, onProgress);
+    });
+}
+
+function cancelJob(cancelUrl, csrfToken) {
+    return fetch(cancelUrl, {
+        method: 'POST',
+        headers: { 'X-CSRFToken': csrfToken, 'X-Requested-With': 'XMLHttpRequest' }
+    }).then(response => response.json());
+}
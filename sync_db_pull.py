@@ -2,6 +2,9 @@
 """
 Pull database changes from GitHub
 Usage: python sync_db_pull.py
+
+Changesets pushed by other machines are applied to the local database
+(see core/change_log.py); no restart is needed.
 """
 import subprocess
 import sys
@@ -10,9 +13,8 @@ def sync_db_pull():
     """Pull database changes from GitHub"""
     try:
         print("📥 Pulling latest changes from GitHub...")
-        subprocess.run(['git', 'pull'], check=True)
+        subprocess.run([sys.executable, 'manage.py', 'sync_changes', 'pull'], check=True)
         print("✅ Database updated successfully!")
-        print("\n⚠️  Important: Restart the Django server to use the updated database")
         
     except subprocess.CalledProcessError as e:
         print(f"❌ Error pulling database: {e}")
@@ -2,6 +2,9 @@
 """
 Push database changes to GitHub
 Usage: python sync_db_push.py
+
+Only the rows changed since the last push are sent, as a changeset file
+(see core/change_log.py), not the whole db.sqlite3.
 """
 import subprocess
 import sys
@@ -10,25 +13,12 @@ from datetime import datetime
 def sync_db_push():
     """Push database changes to GitHub"""
     try:
-        # Add the database file
-        print("📦 Adding database to git...")
-        subprocess.run(['git', 'add', 'db.sqlite3'], check=True)
-        
-        # Create commit with timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         commit_message = f"🔄 Database sync: {timestamp}"
         
-        print(f"💾 Committing changes: {commit_message}")
-        result = subprocess.run(['git', 'commit', '-m', commit_message], 
-                              capture_output=True, text=True)
-        
-        if result.returncode == 0 or "nothing to commit" in result.stdout:
-            # Push to remote
-            print("📤 Pushing to GitHub...")
-            subprocess.run(['git', 'push'], check=True)
-            print("✅ Database synced successfully!")
-        else:
-            print("ℹ️  No changes to sync")
+        print("📦 Exporting database changes and pushing to GitHub...")
+        subprocess.run([sys.executable, 'manage.py', 'sync_changes', 'push', '-m', commit_message], check=True)
+        print("✅ Database synced successfully!")
             
     except subprocess.CalledProcessError as e:
         print(f"❌ Error syncing database: {e}")
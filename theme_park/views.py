@@ -2,7 +2,6 @@ from django.shortcuts import render, redirect
 from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView, DetailView
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
 from django.urls import reverse_lazy, reverse
 from django.contrib import messages
 from django.http import JsonResponse
@@ -12,7 +11,8 @@ import json
 from core.mixins import BreadcrumbMixin
 
 from projects.task_models import ThemeParkTask
-from django.contrib.auth.models import User
+from core.bulk_edit import BulkEditError, bulk_edit_from_request
+from core.dashboard_stats import assignable_users, get_task_stats, group_choices, task_stats_context
 
 
 class ThemeParkDashboardView(LoginRequiredMixin, TemplateView):
@@ -126,91 +126,14 @@ class ThemeParkTasksView(BreadcrumbMixin, LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['active_department'] = 'theme_park'
         
-        # Get all theme park tasks for statistics
-        all_theme_park_tasks = ThemeParkTask.objects.all()
-        today = date.today()
-        
-        # Task statistics by status
-        total_count = all_theme_park_tasks.count()
-        backlog_count = all_theme_park_tasks.filter(status='backlog').count()
-        to_do_count = all_theme_park_tasks.filter(status='to_do').count()
-        in_progress_count = all_theme_park_tasks.filter(status='in_progress').count()
-        in_review_count = all_theme_park_tasks.filter(status='in_review').count()
-        done_count = all_theme_park_tasks.filter(status='done').count()
-        blocked_count = all_theme_park_tasks.filter(status='blocked').count()
-        
-        # Additional statistics for dashboard cards
-        overdue_count = all_theme_park_tasks.filter(due_date__lt=today).exclude(status='done').count()
-        completed_this_week = all_theme_park_tasks.filter(
-            status='done',
-            updated_at__gte=today - timedelta(days=today.weekday())
-        ).count()
-        
-        # Calculate percentages
-        def calculate_percentage(count):
-            if total_count == 0:
-                return 0
-            percentage = (count / total_count) * 100
-            # Round to nearest integer for better display
-            return round(percentage)
-        
-        task_stats = {
-            'total': total_count,
-            'backlog': backlog_count,
-            'to_do': to_do_count,
-            'in_progress': in_progress_count,
-            'in_review': in_review_count,
-            'done': done_count,
-            'blocked': blocked_count,
-            'overdue': overdue_count,
-            'completed_this_week': completed_this_week,
-            # Add percentages
-            'backlog_percent': calculate_percentage(backlog_count),
-            'to_do_percent': calculate_percentage(to_do_count),
-            'in_progress_percent': calculate_percentage(in_progress_count),
-            'in_review_percent': calculate_percentage(in_review_count),
-            'done_percent': calculate_percentage(done_count),
-            'blocked_percent': calculate_percentage(blocked_count),
-            'overdue_percent': calculate_percentage(overdue_count),
-            'completed_percent': calculate_percentage(completed_this_week),
-        }
-        
-        context['task_stats'] = task_stats
-        
-        # Get distinct attractions from theme park tasks
-        attractions = ThemeParkTask.objects.values('attraction_id').annotate(
-            count=Count('id')
-        ).order_by('attraction_id')
-        
-        # Format attractions for template
-        formatted_attractions = []
-        for attraction in attractions:
-            if attraction['attraction_id']:
-                formatted_attractions.append({
-                    'id': attraction['attraction_id'],
-                    'title': attraction['attraction_id'],
-                    'count': attraction['count']
-                })
-        context['attractions'] = formatted_attractions
-        
-        # Get distinct zones from theme park tasks
-        zones = ThemeParkTask.objects.values('zone').annotate(
-            count=Count('id')
-        ).order_by('zone')
-        
-        # Format zones for template
-        formatted_zones = []
-        for zone in zones:
-            if zone['zone']:
-                formatted_zones.append({
-                    'id': zone['zone'],
-                    'title': zone['zone'],
-                    'count': zone['count']
-                })
-        context['zones'] = formatted_zones
+        # Task statistics, zone and attraction counts in two cached queries
+        stats = get_task_stats(ThemeParkTask, group_fields=('attraction_id', 'zone'))
+        context['task_stats'] = task_stats_context(stats)
+        context['attractions'] = group_choices(stats, 'attraction_id')
+        context['zones'] = group_choices(stats, 'zone')
         
-        # Get all users for assignment filter
-        context['users'] = User.objects.filter(is_active=True).order_by('first_name', 'last_name')
+        # Get active users for assignment filter
+        context['users'] = assignable_users()
         
         # Add today's date for due date comparisons
         context['today'] = date.today()
@@ -362,36 +285,19 @@ class ThemeParkTaskBatchUpdateView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
         try:
             data = json.loads(request.body)
-            task_ids = data.get('task_ids', [])
-            
-            if not task_ids:
-                return JsonResponse({'status': 'error', 'message': 'No tasks selected'}, status=400)
-            
-            # Fields to update
-            fields_to_update = {}
-            if data.get('status'):
-                fields_to_update['status'] = data['status']
-            if data.get('priority'):
-                fields_to_update['priority'] = data['priority']
-            if data.get('zone'):
-                fields_to_update['zone'] = data['zone']
-            if data.get('assigned_to'):
-                fields_to_update['assigned_to_id'] = data['assigned_to']
-            if data.get('due_date'):
-                fields_to_update['due_date'] = data['due_date']
-            
-            if not fields_to_update:
-                return JsonResponse({'status': 'error', 'message': 'No fields selected for update'}, status=400)
-            
-            # Update tasks
-            updated_count = ThemeParkTask.objects.filter(id__in=task_ids).update(**fields_to_update)
-            
-            return JsonResponse({
-                'status': 'success',
-                'message': f'Successfully updated {updated_count} tasks',
-                'updated_count': updated_count
-            })
         except json.JSONDecodeError:
             return JsonResponse({'status': 'error', 'message': 'Invalid JSON data'}, status=400)
-        except Exception as e:
-            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+        
+        try:
+            result = bulk_edit_from_request(
+                request, ThemeParkTask, data.get('task_ids', []), data, extra_fields=('zone',)
+            )
+        except BulkEditError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Successfully updated {result.updated_count} tasks',
+            'updated_count': result.updated_count
+        })
+